@@ -9,27 +9,47 @@ and give estimates when which task will be done
 from .models import (
     ID_OF_ARTIFICIAL_ENDNODE,
     ID_OF_ARTIFICIAL_STARTNODE,
+    AddEdge,
     AddEdgeToGraphPreviewResponse,
     AddNodeToGraphPreviewResponse,
+    AddTask,
+    BatchScheduleResult,
     DelayImpact,
+    DurationDistribution,
+    EmpiricalDuration,
+    ForecastEntry,
+    GraphChange,
+    GraphDefinition,
     GraphDefinitionValidationFinding,
     GraphDefinitionValidationResult,
+    LognormalDuration,
     MermaidGanttConfig,
     Person,
     PersonId,
+    PertDuration,
+    RankedPath,
+    RemoveEdge,
     RemoveEdgeFromGraphPreviewResponse,
     RemoveNodeFromGraphPreviewResponse,
+    RemoveTask,
     RunGroupId,
     RunGroupPersonRelationId,
     RunId,
     ScheduleEntry,
     ScheduleReport,
+    StartNotification,
     TaskDependencyEdge,
     TaskDependencyId,
     TaskExecutionStatus,
     TaskId,
     TaskNode,
+    TaskStatusEvent,
+    TimeInterval,
+    TriangularDuration,
+    UpdateNodeInGraphPreviewResponse,
+    UpdateTask,
     ValidationCode,
+    WorkingCalendar,
     task_node_as_artificial_endnode,
     task_node_as_artificial_startnode,
 )
@@ -38,28 +58,48 @@ from .task_dependency_graph import TaskDependencyGraph
 __all__ = [
     "ID_OF_ARTIFICIAL_ENDNODE",
     "ID_OF_ARTIFICIAL_STARTNODE",
+    "AddEdge",
     "AddEdgeToGraphPreviewResponse",
     "AddNodeToGraphPreviewResponse",
+    "AddTask",
+    "BatchScheduleResult",
     "DelayImpact",
+    "DurationDistribution",
+    "EmpiricalDuration",
+    "ForecastEntry",
+    "GraphChange",
+    "GraphDefinition",
     "GraphDefinitionValidationFinding",
     "GraphDefinitionValidationResult",
+    "LognormalDuration",
     "MermaidGanttConfig",
     "Person",
     "PersonId",
+    "PertDuration",
+    "RankedPath",
+    "RemoveEdge",
     "RemoveEdgeFromGraphPreviewResponse",
     "RemoveNodeFromGraphPreviewResponse",
+    "RemoveTask",
     "RunGroupId",
     "RunGroupPersonRelationId",
     "RunId",
     "ScheduleEntry",
     "ScheduleReport",
+    "StartNotification",
     "TaskDependencyEdge",
     "TaskDependencyGraph",
     "TaskDependencyId",
     "TaskExecutionStatus",
     "TaskId",
     "TaskNode",
+    "TaskStatusEvent",
+    "TimeInterval",
+    "TriangularDuration",
+    "UpdateNodeInGraphPreviewResponse",
+    "UpdateTask",
     "ValidationCode",
+    "WorkingCalendar",
     "task_node_as_artificial_endnode",
     "task_node_as_artificial_startnode",
 ]
@@ -0,0 +1,264 @@
+"""
+Batch scheduling: the schedule reports of many graphs are computed in parallel by a pool of worker processes.
+The graphs are sent to the workers in a compact binary format instead of pickled networkx graphs or pydantic models.
+"""
+
+import json
+import os
+import struct
+import time
+import uuid
+from array import array
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import UTC, datetime, timedelta, timezone
+from itertools import islice
+
+from taskdependencygraph.compact_task_graph import (
+    NO_EARLIEST_START,
+    to_epoch_microseconds,
+    to_microseconds,
+)
+from taskdependencygraph.models.batch_schedule_result import BatchScheduleResult
+from taskdependencygraph.models.graph_definition import GraphDefinition
+from taskdependencygraph.models.ids import TaskDependencyId, TaskId
+from taskdependencygraph.models.schedule_report import ScheduleReport
+from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_HEADER = struct.Struct("<qiII")
+"""
+the start of the run (microseconds since the epoch), its UTC offset (seconds), the number of tasks and of dependencies
+"""
+_UUID_SIZE = 16
+
+_EncodedChunk = list[tuple[int, bytes]]
+_ScheduledChunk = list[tuple[int, str, float]]
+
+
+def encode_graph_definition(definition: GraphDefinition) -> bytes:
+    """
+    Encodes everything the schedule report of a graph depends on into a compact binary format:
+    a fixed size header, followed by the task ids (16 bytes each), the planned durations and earliest starts (int64
+    microseconds), the milestone flags (1 byte), the dependency ids (16 bytes each), the dependencies as pairs of int32
+    task positions and finally the textual fields of the tasks (external_id, name, phase, tags) as UTF-8 JSON.
+    Fields that don't affect the plan (e.g. the assignee or the execution status) are not encoded.
+    Raises a ValueError if a dependency refers to a task that is not part of the definition.
+    """
+    tasks = definition.task_list
+    position = {task.id: index for index, task in enumerate(tasks)}
+    endpoints = array("i")
+    for dependency in definition.dependency_list:
+        if dependency.task_predecessor not in position or dependency.task_successor not in position:
+            raise ValueError(f"The dependency {dependency.id} refers to a task that is not part of the definition")
+        endpoints.append(position[dependency.task_predecessor])
+        endpoints.append(position[dependency.task_successor])
+    utc_offset = definition.starting_time_of_run.utcoffset() or timedelta(0)
+    texts = [[task.external_id, task.name, task.phase, task.tags] for task in tasks]
+    return b"".join(
+        (
+            _HEADER.pack(
+                to_epoch_microseconds(definition.starting_time_of_run),
+                int(utc_offset.total_seconds()),
+                len(tasks),
+                len(definition.dependency_list),
+            ),
+            b"".join(task.id.bytes for task in tasks),
+            array("q", (to_microseconds(task.planned_duration) for task in tasks)).tobytes(),
+            array(
+                "q",
+                (
+                    NO_EARLIEST_START
+                    if task.earliest_starttime is None
+                    else to_epoch_microseconds(task.earliest_starttime)
+                    for task in tasks
+                ),
+            ).tobytes(),
+            bytes(task.is_milestone for task in tasks),
+            b"".join(dependency.id.bytes for dependency in definition.dependency_list),
+            endpoints.tobytes(),
+            json.dumps(texts, separators=(",", ":")).encode(),
+        )
+    )
+
+
+def decode_graph_definition(data: bytes) -> GraphDefinition:
+    """
+    Decodes the output of encode_graph_definition. The tasks and dependencies are not validated again (they have been
+    valid when they were encoded); all datetimes are UTC except for the start of the run, which keeps its UTC offset.
+    """
+    run_start, utc_offset_seconds, number_of_tasks, number_of_dependencies = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+
+    def _take(size: int) -> bytes:
+        nonlocal offset
+        chunk = data[offset : offset + size]
+        offset += size
+        return chunk
+
+    task_ids = _take(_UUID_SIZE * number_of_tasks)
+    duration = array("q")
+    duration.frombytes(_take(8 * number_of_tasks))
+    earliest_start = array("q")
+    earliest_start.frombytes(_take(8 * number_of_tasks))
+    is_milestone = _take(number_of_tasks)
+    dependency_ids = _take(_UUID_SIZE * number_of_dependencies)
+    endpoints = array("i")
+    endpoints.frombytes(_take(8 * number_of_dependencies))
+    texts = json.loads(data[offset:])
+    tasks = [
+        TaskNode.model_construct(
+            id=TaskId(uuid.UUID(bytes=task_ids[_UUID_SIZE * index : _UUID_SIZE * (index + 1)])),
+            external_id=external_id,
+            name=name,
+            phase=phase,
+            tags=tags,
+            planned_duration=timedelta(microseconds=duration[index]),
+            is_milestone=bool(is_milestone[index]),
+            earliest_starttime=(
+                None
+                if earliest_start[index] == NO_EARLIEST_START
+                else _EPOCH + timedelta(microseconds=earliest_start[index])
+            ),
+        )
+        for index, (external_id, name, phase, tags) in enumerate(texts)
+    ]
+    dependencies = [
+        TaskDependencyEdge.model_construct(
+            id=TaskDependencyId(uuid.UUID(bytes=dependency_ids[_UUID_SIZE * index : _UUID_SIZE * (index + 1)])),
+            task_predecessor=tasks[endpoints[2 * index]].id,
+            task_successor=tasks[endpoints[2 * index + 1]].id,
+        )
+        for index in range(number_of_dependencies)
+    ]
+    starting_time_of_run = (_EPOCH + timedelta(microseconds=run_start)).astimezone(
+        timezone(timedelta(seconds=utc_offset_seconds))
+    )
+    return GraphDefinition.model_construct(
+        task_list=tasks, dependency_list=dependencies, starting_time_of_run=starting_time_of_run
+    )
+
+
+def _schedule_chunk(chunk: _EncodedChunk, include_artificial_nodes: bool) -> _ScheduledChunk:
+    """
+    Creates the schedule reports of a chunk of encoded graphs; returns the index of each graph, its report as JSON and
+    the seconds it took. This is a module level function, so that it can be run in a worker process.
+    """
+    result: _ScheduledChunk = []
+    for index, data in chunk:
+        started_at = time.perf_counter()
+        definition = decode_graph_definition(data)
+        graph = TaskDependencyGraph(
+            task_list=definition.task_list,
+            dependency_list=definition.dependency_list,
+            starting_time_of_run=definition.starting_time_of_run,
+        )
+        report = graph.create_schedule_report(include_artificial_nodes=include_artificial_nodes)
+        result.append((index, report.model_dump_json(), time.perf_counter() - started_at))
+    return result
+
+
+def _get_definition(graph: TaskDependencyGraph | GraphDefinition) -> GraphDefinition:
+    """
+    Returns the definition the worker rebuilds the graph from. The graph constructor connects the tasks without
+    successors to the artificial end node in task order, and this order decides which of several tied critical paths
+    is reported. After modifications, the end node of a TaskDependencyGraph may have its predecessors in another order,
+    so these tasks are reordered among themselves accordingly; the order of the tasks doesn't matter otherwise, as the
+    entries of the report are sorted.
+    """
+    if isinstance(graph, GraphDefinition):
+        return graph
+    definition = graph.to_graph_definition()
+    end_predecessors = graph.get_digraph_view().pred[ID_OF_ARTIFICIAL_ENDNODE]
+    task_by_id = {task.id: task for task in definition.task_list if task.id in end_predecessors}
+    reordered_tasks = iter([task_by_id[task_id] for task_id in end_predecessors if task_id in task_by_id])
+    return definition.model_copy(
+        update={
+            "task_list": [next(reordered_tasks) if task.id in task_by_id else task for task in definition.task_list]
+        }
+    )
+
+
+def _encode_chunks(graphs: Iterable[TaskDependencyGraph | GraphDefinition], chunk_size: int) -> Iterator[_EncodedChunk]:
+    """
+    Encodes the graphs lazily, chunk by chunk.
+    """
+    encoded = ((index, encode_graph_definition(_get_definition(graph))) for index, graph in enumerate(graphs))
+    while chunk := list(islice(encoded, chunk_size)):
+        yield chunk
+
+
+def _to_results(scheduled_chunk: _ScheduledChunk) -> Iterator[BatchScheduleResult]:
+    for index, report_json, seconds in scheduled_chunk:
+        yield BatchScheduleResult(
+            index=index,
+            report=ScheduleReport.model_validate_json(report_json),
+            computation_time=timedelta(seconds=seconds),
+        )
+
+
+def create_schedule_reports(
+    graphs: Iterable[TaskDependencyGraph | GraphDefinition],
+    *,
+    processes: int | None = None,
+    chunk_size: int = 4,
+    include_artificial_nodes: bool = False,
+) -> Generator[BatchScheduleResult, None, None]:
+    """
+    Computes the schedule report (see TaskDependencyGraph.create_schedule_report) of each graph in a pool of worker
+    processes and yields the results in the order in which they're completed (use BatchScheduleResult.index to map
+    them back to the graphs).
+
+    The graphs are encoded in a compact binary format (see encode_graph_definition) and sent to the workers in chunks
+    of chunk_size graphs; the reports are sent back as JSON. The graphs are encoded lazily and at most two chunks per
+    process are in flight at a time, so the memory consumption doesn't grow with the number of graphs.
+    processes defaults to the number of CPUs; with processes=1, the reports are computed in this process.
+    Each result contains the time the worker spent on the graph. Close the returned generator to stop early; the
+    chunks that haven't been started yet are cancelled then.
+    Raises a ValueError (right away, not on the first result) if chunk_size or processes is less than 1.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"The chunk_size must be at least 1, but was {chunk_size}")
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 1:
+        raise ValueError(f"The number of processes must be at least 1, but was {processes}")
+    return _create_schedule_reports(_encode_chunks(graphs, chunk_size), processes, include_artificial_nodes)
+
+
+def _create_schedule_reports(
+    chunks: Iterator[_EncodedChunk], processes: int, include_artificial_nodes: bool
+) -> Generator[BatchScheduleResult, None, None]:
+    """
+    The generator behind create_schedule_reports (which validates its arguments before the first result is requested).
+    """
+    if processes == 1:
+        for chunk in chunks:
+            yield from _to_results(_schedule_chunk(chunk, include_artificial_nodes))
+        return
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        in_flight: set[Future[_ScheduledChunk]] = set()
+
+        def _submit_next_chunk() -> None:
+            chunk = next(chunks, None)
+            if chunk is not None:
+                in_flight.add(executor.submit(_schedule_chunk, chunk, include_artificial_nodes))
+
+        try:
+            for _ in range(2 * processes):
+                _submit_next_chunk()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.remove(future)
+                    _submit_next_chunk()
+                    yield from _to_results(future.result())
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+__all__ = ["create_schedule_reports", "decode_graph_definition", "encode_graph_definition"]
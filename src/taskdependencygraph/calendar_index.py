@@ -0,0 +1,225 @@
+"""
+Calendar-aware scheduling: the tasks are only worked on inside the working intervals of a WorkingCalendar.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta
+
+from networkx import DiGraph  # type: ignore[import-untyped]
+
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.models.task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE
+from taskdependencygraph.models.working_calendar import TimeInterval, WorkingCalendar
+
+
+def _merge(intervals: Sequence[TimeInterval]) -> list[tuple[datetime, datetime]]:
+    """
+    returns the union of the intervals as sorted list of disjoint, non-adjacent (start, end) pairs
+    """
+    result: list[tuple[datetime, datetime]] = []
+    for interval in sorted(intervals, key=lambda i: i.start):
+        if result and interval.start <= result[-1][1]:
+            result[-1] = (result[-1][0], max(result[-1][1], interval.end))
+        else:
+            result.append((interval.start, interval.end))
+    return result
+
+
+class CalendarIndex:
+    """
+    A WorkingCalendar compiled into a sorted list of disjoint working intervals together with the cumulative working
+    time before each interval (prefix sums). All queries are a bisect on these lists, i.e. O(log n) for n intervals,
+    no matter how far apart the moments are.
+    """
+
+    def __init__(self, starts: list[datetime], ends: list[datetime]):
+        self._starts = starts
+        self._ends = ends
+        self._working_time_before: list[timedelta] = []
+        """
+        the working time in all intervals before the i-th interval
+        """
+        self._working_time_until_end: list[timedelta] = []
+        """
+        the working time in all intervals up to (and including) the i-th interval
+        """
+        cumulative = timedelta(0)
+        for start, end in zip(starts, ends, strict=True):
+            self._working_time_before.append(cumulative)
+            cumulative += end - start
+            self._working_time_until_end.append(cumulative)
+
+    @classmethod
+    def from_calendar(cls, calendar: WorkingCalendar) -> "CalendarIndex":
+        """
+        Merges the working intervals and cuts out the blackout periods; O(n log n).
+        """
+        starts: list[datetime] = []
+        ends: list[datetime] = []
+        blackouts = _merge(calendar.blackout_periods)
+        blackout_index = 0
+        for interval_start, end in _merge(calendar.working_intervals):
+            start = interval_start
+            while blackout_index < len(blackouts) and blackouts[blackout_index][1] <= start:
+                blackout_index += 1
+            # the blackouts are disjoint and sorted, so each one is skipped for good once it ends before the interval
+            index = blackout_index
+            while index < len(blackouts) and blackouts[index][0] < end:
+                blackout_start, blackout_end = blackouts[index]
+                if start < blackout_start:
+                    starts.append(start)
+                    ends.append(blackout_start)
+                start = max(start, blackout_end)
+                index += 1
+            if start < end:
+                starts.append(start)
+                ends.append(end)
+        return cls(starts, ends)
+
+    def working_time_until(self, moment: datetime) -> timedelta:
+        """
+        Returns the working time between the start of the calendar and the given moment.
+        """
+        index = bisect_right(self._starts, moment) - 1
+        if index < 0:
+            return timedelta(0)
+        return self._working_time_before[index] + min(moment, self._ends[index]) - self._starts[index]
+
+    def next_working_moment(self, moment: datetime) -> datetime:
+        """
+        Returns the given moment if it's working time, otherwise the start of the next working interval.
+        """
+        index = bisect_right(self._ends, moment)
+        if index == len(self._ends):
+            raise ValueError(f"The working calendar doesn't contain enough working time after {moment}")
+        return max(moment, self._starts[index])
+
+    def add_working_time(self, moment: datetime, duration: timedelta) -> datetime:
+        """
+        Returns the (earliest) moment at which the given amount of working time after the given moment has passed,
+        e.g. the finish of a task that starts at the moment.
+        """
+        if duration == timedelta(0):
+            return moment
+        target = self.working_time_until(moment) + duration
+        index = bisect_left(self._working_time_until_end, target)
+        if index == len(self._working_time_until_end):
+            raise ValueError(f"The working calendar doesn't contain enough working time after {moment}")
+        return self._ends[index] - (self._working_time_until_end[index] - target)
+
+    def subtract_working_time(self, moment: datetime, duration: timedelta) -> datetime:
+        """
+        Returns the latest moment at which a task with the given (working time) duration has to start, so that it
+        finishes at the given moment; this is the inverse of add_working_time.
+        """
+        if duration == timedelta(0):
+            return moment
+        target = self.working_time_until(moment) - duration
+        if target < timedelta(0):
+            raise ValueError(f"The working calendar doesn't contain enough working time before {moment}")
+        index = bisect_right(self._working_time_before, target) - 1
+        return self._starts[index] + (target - self._working_time_before[index])
+
+
+class CalendarAwareSchedule:  # pylint:disable=too-few-public-methods
+    """
+    The start and finish of every task if work only happens inside the working intervals of the calendar of the task:
+    each task (with a calendar) starts at a working moment and its planned_duration is working time, i.e. the work
+    pauses outside of the working intervals. Tasks without a calendar are worked on around the clock.
+    Both passes run in O((V+E) + V log n) for calendars with n intervals.
+    """
+
+    def __init__(self) -> None:
+        self.start: dict[TaskId, timedelta] = {}
+        """
+        the start of every node as offset from the start of the run
+        """
+        self.finish: dict[TaskId, timedelta] = {}
+        """
+        the finish of every node as offset from the start of the run
+        """
+        self.latest_start: dict[TaskId, timedelta] = {}
+        """
+        the latest start of every node (offset from the start of the run) that doesn't delay the finish of the graph
+        """
+        self.latest_finish: dict[TaskId, timedelta] = {}
+        """
+        the latest finish of every node (offset from the start of the run) that doesn't delay the finish of the graph
+        """
+        self.critical_path: list[TaskId] = []
+        """
+        the ordered ids of the tasks (including the artificial start and end node) that determine the finish of the
+        graph (see _compute_critical_path)
+        """
+        self.waits_for_calendar: set[TaskId] = set()
+        """
+        the tasks whose start is delayed by their calendar, i.e. that are ready (all predecessors are finished and the
+        earliest_starttime has passed) outside of their working intervals
+        """
+
+    @classmethod
+    def compute(
+        cls,
+        graph: DiGraph,
+        ordered_node_ids: Sequence[TaskId],
+        starting_time_of_run: datetime,
+        calendar_of: Callable[[TaskNode], CalendarIndex | None],
+    ) -> "CalendarAwareSchedule":
+        """
+        Runs the calendar-aware forward and backward pass; calendar_of returns the (compiled) calendar of a task.
+        Raises a ValueError if a calendar doesn't contain enough working time for the tasks.
+        """
+        result = cls()
+        for node_id in ordered_node_ids:
+            task: TaskNode = graph.nodes[node_id]["domain_model"]
+            ready = max((result.finish[p] for p in graph.predecessors(node_id)), default=timedelta(0))
+            if task.earliest_starttime is not None:
+                ready = max(ready, task.earliest_starttime - starting_time_of_run)
+            calendar = calendar_of(task)
+            if calendar is None:
+                result.start[node_id] = ready
+                result.finish[node_id] = ready + task.planned_duration
+            else:
+                start = calendar.next_working_moment(starting_time_of_run + ready)
+                if start > starting_time_of_run + ready:
+                    result.waits_for_calendar.add(node_id)
+                result.start[node_id] = start - starting_time_of_run
+                result.finish[node_id] = calendar.add_working_time(start, task.planned_duration) - starting_time_of_run
+        graph_finish = result.start[ID_OF_ARTIFICIAL_ENDNODE]
+        for node_id in reversed(ordered_node_ids):
+            task = graph.nodes[node_id]["domain_model"]
+            latest_finish = min((result.latest_start[s] for s in graph.successors(node_id)), default=graph_finish)
+            result.latest_finish[node_id] = latest_finish
+            calendar = calendar_of(task)
+            if calendar is None:
+                result.latest_start[node_id] = latest_finish - task.planned_duration
+            else:
+                result.latest_start[node_id] = (
+                    calendar.subtract_working_time(starting_time_of_run + latest_finish, task.planned_duration)
+                    - starting_time_of_run
+                )
+        result._compute_critical_path(graph)  # pylint:disable=protected-access
+        return result
+
+    def _compute_critical_path(self, graph: DiGraph) -> None:
+        """
+        Walks back from the artificial end node, always to the (first) predecessor that finishes last. A task that
+        waits for its calendar (see waits_for_calendar) doesn't wait for any of its predecessors, so all of them have
+        slack: the chain ends there and continues with the artificial start node.
+        """
+        path: list[TaskId] = [ID_OF_ARTIFICIAL_ENDNODE]
+        node_id = ID_OF_ARTIFICIAL_ENDNODE
+        while node_id != ID_OF_ARTIFICIAL_STARTNODE:
+            if node_id in self.waits_for_calendar:
+                node_id = ID_OF_ARTIFICIAL_STARTNODE
+            else:
+                node_id = max(graph.predecessors(node_id), key=self.finish.__getitem__)
+            path.append(node_id)
+        path.reverse()
+        self.critical_path = path
+
+
+__all__ = ["CalendarAwareSchedule", "CalendarIndex"]
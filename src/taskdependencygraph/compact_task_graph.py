@@ -0,0 +1,281 @@
+"""
+The CompactTaskGraph is an array backed representation of the scheduling relevant parts of a task dependency graph.
+"""
+
+import copy
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Literal
+
+from networkx import DiGraph  # type: ignore[import-untyped]
+
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
+from taskdependencygraph.models.task_node import TaskNode
+
+if TYPE_CHECKING:
+    from taskdependencygraph.vectorized_passes import TopologicalLevels
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+NO_EARLIEST_START = -(2**63)
+"""
+marks tasks without an earliest_starttime in CompactTaskGraph.earliest_start
+"""
+
+ScheduleBackend = Literal["auto", "python", "numpy"]
+"""
+how the passes of a CompactTaskGraph are computed:
+'python' sweeps over the tasks one by one in topological order,
+'numpy' groups the tasks by topological level and schedules each level at once with vectorised segmented reductions
+(requires the optional dependency numpy),
+'auto' uses numpy (if it's installed) for large graphs whose levels are wide enough to benefit from it.
+"""
+_NUMPY_MIN_NUMBER_OF_TASKS = 2_000
+_NUMPY_MIN_AVERAGE_LEVEL_WIDTH = 16
+
+
+def to_microseconds(duration: timedelta) -> int:
+    """
+    converts a timedelta into an integer number of microseconds (without any rounding errors)
+    """
+    return duration // _ONE_MICROSECOND
+
+
+def to_epoch_microseconds(point_in_time: datetime) -> int:
+    """
+    converts an aware datetime into the integer number of microseconds since 1970-01-01T00:00:00Z
+    """
+    return (point_in_time - _EPOCH) // _ONE_MICROSECOND
+
+
+class CompactTaskGraph:
+    """
+    A read-only, memory efficient representation of the nodes and edges of a task dependency graph that contains
+    everything the scheduling passes need and nothing else.
+
+    The task ids are interned to dense integer indices; the index of a task is its position in a topological order,
+    so the forward pass is a single sweep over the indices from low to high and the backward pass one from high to low.
+    Planned durations and earliest starts are stored as int64 microseconds in flat arrays, the edges in compressed
+    sparse row (CSR) format: the successors of the task with index i are
+    successor_indices[successor_offsets[i]:successor_offsets[i + 1]] (and likewise for the predecessors).
+    Compared to a networkx DiGraph (dict of dicts plus one attribute dict per node and edge) this needs about an order
+    of magnitude less memory per task, and the passes run over contiguous memory.
+    """
+
+    __slots__ = (
+        "_levels",
+        "duration",
+        "earliest_start",
+        "index_of",
+        "predecessor_indices",
+        "predecessor_offsets",
+        "successor_indices",
+        "successor_offsets",
+        "task_ids",
+    )
+
+    def __init__(
+        self,
+        task_ids: Sequence[TaskId],
+        duration: array,  # type:ignore[type-arg]
+        earliest_start: array,  # type:ignore[type-arg]
+        successor_offsets: array,  # type:ignore[type-arg]
+        successor_indices: array,  # type:ignore[type-arg]
+    ):
+        """
+        The tasks have to be passed in topological order; prefer the from_graph or from_tasks factory methods.
+        """
+        self.task_ids: tuple[TaskId, ...] = tuple(task_ids)
+        """
+        maps the dense index of each task to its id
+        """
+        self.index_of: dict[TaskId, int] = {task_id: index for index, task_id in enumerate(self.task_ids)}
+        """
+        maps the id of each task to its dense index
+        """
+        self.duration = duration
+        """
+        the planned duration of each task in microseconds
+        """
+        self.earliest_start = earliest_start
+        """
+        the earliest_starttime of each task in microseconds since the epoch (or NO_EARLIEST_START)
+        """
+        self.successor_offsets = successor_offsets
+        self.successor_indices = successor_indices
+        self.predecessor_offsets, self.predecessor_indices = self._transpose(successor_offsets, successor_indices)
+        self._levels: dict[ScheduleBackend, TopologicalLevels | None] = {}
+
+    @staticmethod
+    def _transpose(
+        offsets: array,  # type:ignore[type-arg]
+        indices: array,  # type:ignore[type-arg]
+    ) -> tuple[array, array]:  # type:ignore[type-arg]
+        """
+        Derives the CSR representation of the predecessors from the CSR representation of the successors.
+        Because the tasks are topologically sorted, the predecessors of each task end up sorted, too.
+        """
+        number_of_tasks = len(offsets) - 1
+        transposed_offsets = array("q", bytes(8 * (number_of_tasks + 1)))
+        for successor_index in indices:
+            transposed_offsets[successor_index + 1] += 1
+        for index in range(number_of_tasks):
+            transposed_offsets[index + 1] += transposed_offsets[index]
+        transposed_indices = array("i", bytes(4 * len(indices)))
+        fill = array("q", transposed_offsets[:-1])
+        for predecessor_index in range(number_of_tasks):
+            for position in range(offsets[predecessor_index], offsets[predecessor_index + 1]):
+                successor_index = indices[position]
+                transposed_indices[fill[successor_index]] = predecessor_index
+                fill[successor_index] += 1
+        return transposed_offsets, transposed_indices
+
+    @classmethod
+    def _from_sorted_tasks(
+        cls, sorted_tasks: Sequence[TaskNode], successor_ids_of: Callable[[TaskId], Iterable[TaskId]]
+    ) -> "CompactTaskGraph":
+        index_of = {task.id: index for index, task in enumerate(sorted_tasks)}
+        successor_offsets = array("q", [0])
+        successor_indices = array("i")
+        for task in sorted_tasks:
+            successor_indices.extend(index_of[successor_id] for successor_id in successor_ids_of(task.id))
+            successor_offsets.append(len(successor_indices))
+        return cls(
+            task_ids=[task.id for task in sorted_tasks],
+            duration=array("q", (to_microseconds(task.planned_duration) for task in sorted_tasks)),
+            earliest_start=array(
+                "q",
+                (
+                    NO_EARLIEST_START
+                    if task.earliest_starttime is None
+                    else to_epoch_microseconds(task.earliest_starttime)
+                    for task in sorted_tasks
+                ),
+            ),
+            successor_offsets=successor_offsets,
+            successor_indices=successor_indices,
+        )
+
+    @classmethod
+    def from_graph(cls, graph: DiGraph, ordered_node_ids: Sequence[TaskId]) -> "CompactTaskGraph":
+        """
+        Creates the compact representation of a networkx DiGraph (as used inside the TaskDependencyGraph), whose nodes
+        have already been sorted topologically (ordered_node_ids).
+        """
+        return cls._from_sorted_tasks(
+            [graph.nodes[node_id]["domain_model"] for node_id in ordered_node_ids], graph.successors
+        )
+
+    @classmethod
+    def from_tasks(cls, tasks: Sequence[TaskNode], dependencies: Iterable[TaskDependencyEdge]) -> "CompactTaskGraph":
+        """
+        Creates the compact representation directly from tasks and dependencies (without a networkx DiGraph in
+        between). The tasks are sorted topologically using Kahn's algorithm.
+        Raises a ValueError if a dependency refers to an unknown task or if the dependencies contain a cycle.
+        """
+        position = {task.id: index for index, task in enumerate(tasks)}
+        successors: list[list[int]] = [[] for _ in tasks]
+        in_degree = [0] * len(tasks)
+        for dependency in dependencies:
+            if dependency.task_predecessor not in position or dependency.task_successor not in position:
+                raise ValueError(f"The dependency {dependency.id} refers to a task that is not part of the tasks")
+            successors[position[dependency.task_predecessor]].append(position[dependency.task_successor])
+            in_degree[position[dependency.task_successor]] += 1
+        order = [index for index, degree in enumerate(in_degree) if degree == 0]
+        for index in order:  # the list grows while we iterate over it
+            for successor in successors[index]:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    order.append(successor)
+        if len(order) != len(tasks):
+            raise ValueError("The dependencies contain a cycle")
+        return cls._from_sorted_tasks(
+            [tasks[index] for index in order],
+            lambda task_id: (tasks[successor].id for successor in successors[position[task_id]]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+    def with_earliest_starts(self, earliest_start: array) -> "CompactTaskGraph":  # type:ignore[type-arg]
+        """
+        Returns a CompactTaskGraph with other earliest starts (in the same format as earliest_start), which shares
+        everything else (the topology, the durations and the topological levels) with this one; O(1).
+        """
+        if len(earliest_start) != len(self):
+            raise ValueError(f"Expected {len(self)} earliest starts, but got {len(earliest_start)}")
+        result = copy.copy(self)
+        result.earliest_start = earliest_start
+        return result
+
+    def _get_levels(self, backend: ScheduleBackend) -> "TopologicalLevels | None":
+        """
+        Returns the topological levels for the vectorised passes or None, if the python passes shall be used.
+        The levels are computed at most once per backend.
+        """
+        if backend == "python" or (backend == "auto" and len(self) < _NUMPY_MIN_NUMBER_OF_TASKS):
+            return None
+        try:
+            from taskdependencygraph.vectorized_passes import TopologicalLevels  # noqa: PLC0415
+        except ImportError as import_error:
+            if backend == "numpy":
+                raise ImportError(
+                    "The numpy backend requires numpy; install it with: pip install taskdependencygraph[numpy]"
+                ) from import_error
+            return None
+        if backend not in self._levels:
+            max_number_of_levels = len(self) + 1 if backend == "numpy" else len(self) // _NUMPY_MIN_AVERAGE_LEVEL_WIDTH
+            self._levels[backend] = TopologicalLevels.compute(self, max_number_of_levels)
+        return self._levels[backend]
+
+    def compute_earliest_starts(self, starting_time_of_run: datetime, backend: ScheduleBackend = "auto") -> array:  # type:ignore[type-arg]
+        """
+        Forward pass: returns the earliest start of each task in microseconds after the start of the run.
+        A task starts as soon as all of its predecessors are finished, but not before its earliest_starttime.
+        """
+        run_start = to_epoch_microseconds(starting_time_of_run)
+        levels = self._get_levels(backend)
+        if levels is not None:
+            return array("q", levels.compute_earliest_starts(self, run_start, NO_EARLIEST_START).tobytes())
+        duration = self.duration
+        earliest_start = self.earliest_start
+        offsets = self.predecessor_offsets
+        indices = self.predecessor_indices
+        result = array("q", bytes(8 * len(duration)))
+        for index in range(len(duration)):
+            start = 0
+            for position in range(offsets[index], offsets[index + 1]):
+                predecessor = indices[position]
+                finish = result[predecessor] + duration[predecessor]
+                start = max(start, finish)
+            release = earliest_start[index]
+            if release != NO_EARLIEST_START and release - run_start > start:
+                start = release - run_start
+            result[index] = start
+        return result
+
+    def compute_remaining_durations(self, backend: ScheduleBackend = "auto") -> array:  # type:ignore[type-arg]
+        """
+        Backward pass: returns the remaining duration of each task in microseconds, i.e. its own planned duration plus
+        the longest remaining duration of its successors.
+        (The latest start of a task is the finish of the graph minus its remaining duration.)
+        """
+        levels = self._get_levels(backend)
+        if levels is not None:
+            return array("q", levels.compute_remaining_durations(self).tobytes())
+        duration = self.duration
+        offsets = self.successor_offsets
+        indices = self.successor_indices
+        result = array("q", bytes(8 * len(duration)))
+        for index in reversed(range(len(duration))):
+            longest = 0
+            for position in range(offsets[index], offsets[index + 1]):
+                remaining = result[indices[position]]
+                longest = max(longest, remaining)
+            result[index] = duration[index] + longest
+        return result
+
+
+__all__ = ["NO_EARLIEST_START", "CompactTaskGraph", "ScheduleBackend", "to_epoch_microseconds", "to_microseconds"]
@@ -0,0 +1,168 @@
+"""
+The ForecastState bundles the forecast of a TaskDependencyGraph at a status date, i.e. the schedule based on the actual
+start and finish times that have been recorded so far.
+"""
+
+import heapq
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from networkx import DiGraph  # type: ignore[import-untyped]
+
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.models.task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE
+from taskdependencygraph.topological_order import TopologicalOrder
+
+
+def _compute_forecast_of_node(
+    graph: DiGraph, node: TaskId, finish: dict[TaskId, timedelta], starting_time_of_run: datetime, status: timedelta
+) -> tuple[timedelta, timedelta]:
+    """
+    Returns the forecast start and finish of a node (as offsets from the start of the run):
+    * a completed task (with actual_finishtime) is fixed to its actual start and finish
+    * a running task (with actual_starttime only) keeps its actual start; it finishes after its planned duration, but
+      not before the status date (its remaining duration is what's left of the planned duration)
+    * all other tasks can't start before the status date, their earliest_starttime and the (forecast) finish of all
+      of their direct predecessors
+    The artificial end node finishes with the last task, even if that has been in the past.
+    All predecessors of the node have to be up to date in finish.
+    """
+    task: TaskNode = graph.nodes[node]["domain_model"]
+    if task.actual_starttime is not None:
+        start = task.actual_starttime - starting_time_of_run
+        if task.actual_finishtime is not None:
+            return start, task.actual_finishtime - starting_time_of_run
+        return start, max(start + task.planned_duration, status)
+    start = max((finish[predecessor_id] for predecessor_id in graph.predecessors(node)), default=timedelta(0))
+    if node not in (ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE):
+        start = max(start, status)
+    if task.earliest_starttime is not None:
+        start = max(start, task.earliest_starttime - starting_time_of_run)
+    return start, start + task.planned_duration
+
+
+class ForecastState:
+    """
+    The forecast start and finish of every node at one status date (see _compute_forecast_of_node).
+
+    Like the ScheduleState, the forecast belongs to one version of the graph and is brought up to date lazily: the
+    TaskDependencyGraph marks the nodes that are affected by a modification (including the recording of actual start
+    and finish times) as dirty, and the next forecast query only re-evaluates the downstream cone of these nodes, as
+    far as the forecast finish actually changes.
+    This is an internal helper of the TaskDependencyGraph; it's not meant to be used on its own.
+    """
+
+    def __init__(self, version: int, status_date: datetime, topological_order: TopologicalOrder):
+        self.version = version
+        """
+        the version of the graph this forecast has been computed for
+        """
+        self.status_date = status_date
+        """
+        the moment the forecast is made at; nothing that hasn't started yet can start before it
+        """
+        self.topological_order = topological_order
+        """
+        the topological order of the graph; it's owned (and kept up to date) by the TaskDependencyGraph
+        """
+        self.start: dict[TaskId, timedelta] = {}
+        """
+        the forecast start of every node as offset from the start of the run
+        """
+        self.finish: dict[TaskId, timedelta] = {}
+        """
+        the forecast finish of every node as offset from the start of the run
+        """
+        self.changed_nodes: set[TaskId] = set()
+        """
+        the nodes whose forecast start or finish changed since they have been collected the last time (see
+        TaskDependencyGraph.update_forecast)
+        """
+        self.is_outdated = False
+        """
+        set if so many nodes are affected by modifications that a full pass (see compute) is cheaper than propagating
+        the changes
+        """
+        self._dirty: set[TaskId] = set()
+
+    @classmethod
+    def compute(
+        cls,
+        graph: DiGraph,
+        starting_time_of_run: datetime,
+        status_date: datetime,
+        version: int,
+        topological_order: TopologicalOrder,
+        previous: "ForecastState | None" = None,
+    ) -> "ForecastState":
+        """
+        Computes the forecast of all nodes in one O(V+E) pass in topological order.
+        If the previous forecast (e.g. the one at an earlier status date) is given, only the nodes whose forecast start
+        or finish differs from it (and the changes it hasn't handed out yet) count as changed; otherwise all nodes do.
+        """
+        result = cls(version, status_date, topological_order)
+        status = status_date - starting_time_of_run
+        for node in topological_order.ordered_node_ids:
+            result.start[node], result.finish[node] = _compute_forecast_of_node(
+                graph, node, result.finish, starting_time_of_run, status
+            )
+        if previous is None:
+            result.changed_nodes = set(result.start)
+        else:
+            result.changed_nodes = {
+                node
+                for node, start in result.start.items()
+                if node in previous.changed_nodes
+                or start != previous.start.get(node)
+                or result.finish[node] != previous.finish.get(node)
+            }
+        return result
+
+    def remove_node(self, task_id: TaskId) -> None:
+        """
+        Forgets everything about a node that has been removed from the graph.
+        """
+        self.start.pop(task_id, None)
+        self.finish.pop(task_id, None)
+        self._dirty.discard(task_id)
+        self.changed_nodes.discard(task_id)
+
+    def mark_dirty(self, nodes: Iterable[TaskId]) -> None:
+        """
+        Marks the forecast of nodes as outdated, e.g. because one of their direct predecessors changed.
+        """
+        self._dirty.update(nodes)
+
+    def update(self, graph: DiGraph, starting_time_of_run: datetime, version: int) -> set[TaskId]:
+        """
+        Re-evaluates the dirty nodes and their descendants in topological order, but only as far as the forecast
+        finish actually changes. Returns the ids of all nodes that have been re-evaluated.
+        """
+        status = self.status_date - starting_time_of_run
+        rank = self.topological_order.rank
+        heap = [(rank[node], node) for node in self._dirty]
+        heapq.heapify(heap)
+        queued: set[TaskId] = set(self._dirty)
+        self._dirty = set()
+        while heap:
+            _, node = heapq.heappop(heap)
+            previous_start, previous_finish = self.start.get(node), self.finish.get(node)
+            self.start[node], self.finish[node] = _compute_forecast_of_node(
+                graph, node, self.finish, starting_time_of_run, status
+            )
+            if self.start[node] != previous_start:
+                self.changed_nodes.add(node)
+            if self.finish[node] == previous_finish:
+                continue
+            self.changed_nodes.add(node)
+            for successor_id in graph.successors(node):
+                if successor_id not in queued:
+                    queued.add(successor_id)
+                    heapq.heappush(heap, (rank[successor_id], successor_id))
+        self.version = version
+        return queued
+
+
+__all__ = ["ForecastState"]
@@ -0,0 +1,141 @@
+"""
+Enumeration of the longest paths through a directed acyclic graph in order of decreasing length.
+"""
+
+import heapq
+import itertools
+from collections.abc import Iterator, Mapping, Sequence
+from datetime import timedelta
+from typing import NamedTuple
+
+from networkx import DiGraph  # type: ignore[import-untyped]
+
+from taskdependencygraph.models.ids import TaskId
+
+_NO_SUCCESSOR = -1
+
+
+class _Sidetrack(NamedTuple):
+    """
+    A node of a persistent leftist heap of sidetracks. A sidetrack is an edge that leaves the longest path from its
+    tail to the end; the loss is how much shorter the path becomes by taking the sidetrack instead.
+    The heaps are never modified in place, so a merged heap shares all untouched nodes with its inputs.
+    """
+
+    loss: timedelta
+    tail: int
+    head: int
+    """the (positions in the topological order of the) nodes the sidetrack connects"""
+    left: "_Sidetrack | None"
+    right: "_Sidetrack | None"
+    rank: int
+    """the length of the right spine (the heap is leftist: the right spine is never longer than the left one)"""
+
+
+def _rank(heap: _Sidetrack | None) -> int:
+    return 0 if heap is None else heap.rank
+
+
+def _merge(heap: _Sidetrack | None, other: _Sidetrack | None) -> _Sidetrack | None:
+    """
+    Merges two persistent leftist heaps in O(log n); only the nodes along the right spines are copied.
+    """
+    if heap is None:
+        return other
+    if other is None:
+        return heap
+    if other.loss < heap.loss:
+        heap, other = other, heap
+    left, right = heap.left, _merge(heap.right, other)
+    if _rank(left) < _rank(right):
+        left, right = right, left
+    return heap._replace(left=left, right=right, rank=_rank(right) + 1)
+
+
+class _PathPrefix(NamedTuple):
+    """
+    the sidetracks taken by a path so far, as a linked list (last sidetrack first), so that paths share their prefixes
+    """
+
+    sidetrack: _Sidetrack
+    previous: "_PathPrefix | None"
+
+
+def iter_longest_paths(
+    graph: DiGraph,
+    source: TaskId,
+    ordered_node_ids: Sequence[TaskId],
+    remaining_duration: Mapping[TaskId, timedelta],
+) -> Iterator[tuple[timedelta, list[TaskId]]]:
+    """
+    Lazily yields all paths from the source to a sink in order of decreasing length (the sum of the planned durations
+    of the tasks on the path), together with their length.
+    ordered_node_ids have to be sorted topologically and remaining_duration has to hold the length of the longest path
+    from each node to a sink (the backward pass).
+
+    This is Eppstein's algorithm for the k shortest paths, applied to the longest paths of a DAG:
+    Each node follows its best successor (the one with the longest remaining duration) unless a path takes a sidetrack.
+    Every path is uniquely described by its sequence of sidetracks and is shorter than the longest path by the sum of
+    their losses. The sidetracks that are available from a node (at the node itself or further down its longest path)
+    are kept in a persistent heap per node that shares its structure with the heap of the best successor; building
+    all heaps costs O(E log V). The paths are then explored best first with a priority queue: each yielded path has
+    at most three successors (swap its last sidetrack for one of the two children in the heap, or append the best
+    sidetrack after it), so the k-th path costs O(log k) plus the length of the path to write it down.
+    Internally, the nodes are identified by their position in ordered_node_ids (comparing and hashing ints is a lot
+    cheaper than comparing and hashing UUIDs when writing down long paths).
+    """
+    index_of = {node_id: index for index, node_id in enumerate(ordered_node_ids)}
+    best_successor: list[int] = [_NO_SUCCESSOR] * len(ordered_node_ids)
+    sidetracks_of: list[_Sidetrack | None] = [None] * len(ordered_node_ids)
+    for index in reversed(range(len(ordered_node_ids))):
+        successors = list(graph.successors(ordered_node_ids[index]))
+        if not successors:
+            continue
+        best = max(successors, key=remaining_duration.__getitem__)  # the first one in insertion order wins a tie
+        best_index = index_of[best]
+        best_successor[index] = best_index
+        heap = sidetracks_of[best_index]
+        for successor in successors:
+            if successor != best:
+                loss = remaining_duration[best] - remaining_duration[successor]
+                heap = _merge(heap, _Sidetrack(loss, index, index_of[successor], None, None, 1))
+        sidetracks_of[index] = heap
+
+    source_index = index_of[source]
+    longest = remaining_duration[source]
+
+    def _get_path(prefix: _PathPrefix | None) -> list[TaskId]:
+        sidetracks: list[_Sidetrack] = []
+        while prefix is not None:
+            sidetracks.append(prefix.sidetrack)
+            prefix = prefix.previous
+        node = source_index
+        path: list[int] = []
+        for sidetrack in reversed(sidetracks):
+            while node != sidetrack.tail:  # the tail of the sidetrack is on the longest path from node
+                path.append(node)
+                node = best_successor[node]
+            path.append(node)
+            node = sidetrack.head
+        while node != _NO_SUCCESSOR:
+            path.append(node)
+            node = best_successor[node]
+        return [ordered_node_ids[index] for index in path]
+
+    yield longest, _get_path(None)
+    counter = itertools.count()  # breaks ties between equally long paths (the heap nodes can't be compared)
+    queue: list[tuple[timedelta, int, _Sidetrack, _PathPrefix | None]] = []
+    if (root := sidetracks_of[source_index]) is not None:
+        queue.append((root.loss, next(counter), root, None))
+    while queue:
+        loss, _, sidetrack, prefix = heapq.heappop(queue)
+        path_prefix = _PathPrefix(sidetrack, prefix)
+        yield longest - loss, _get_path(path_prefix)
+        for child in (sidetrack.left, sidetrack.right):
+            if child is not None:
+                heapq.heappush(queue, (loss - sidetrack.loss + child.loss, next(counter), child, prefix))
+        if (next_sidetracks := sidetracks_of[sidetrack.head]) is not None:
+            heapq.heappush(queue, (loss + next_sidetracks.loss, next(counter), next_sidetracks, path_prefix))
+
+
+__all__ = ["iter_longest_paths"]
@@ -1,6 +1,17 @@
 """models are python objects which we use to model tasks, dependencies and the graph they form"""
 
+from .batch_schedule_result import BatchScheduleResult
 from .delay_impact import DelayImpact
+from .duration_distribution import (
+    DurationDistribution,
+    EmpiricalDuration,
+    LognormalDuration,
+    PertDuration,
+    TriangularDuration,
+)
+from .forecast_entry import ForecastEntry
+from .graph_change import AddEdge, AddTask, GraphChange, RemoveEdge, RemoveTask, UpdateTask
+from .graph_definition import GraphDefinition
 from .graph_definition_validation import (
     GraphDefinitionValidationFinding,
     GraphDefinitionValidationResult,
@@ -9,43 +20,68 @@ from .graph_definition_validation import (
 from .ids import PersonId, RunGroupId, RunGroupPersonRelationId, RunId, TaskDependencyId, TaskId
 from .mermaid_gantt_config import MermaidGanttConfig
 from .person import Person
+from .ranked_path import RankedPath
 from .schedule_report import ScheduleEntry, ScheduleReport
+from .start_notification import StartNotification
 from .task_dependency_edge import TaskDependencyEdge
 from .task_dependency_update import (
     AddEdgeToGraphPreviewResponse,
     AddNodeToGraphPreviewResponse,
     RemoveEdgeFromGraphPreviewResponse,
     RemoveNodeFromGraphPreviewResponse,
+    UpdateNodeInGraphPreviewResponse,
 )
 from .task_execution_status import TaskExecutionStatus
 from .task_node import TaskNode
 from .task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE, task_node_as_artificial_endnode
 from .task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE, task_node_as_artificial_startnode
+from .task_status_event import TaskStatusEvent
+from .working_calendar import TimeInterval, WorkingCalendar
 
 __all__ = [
     "ID_OF_ARTIFICIAL_ENDNODE",
     "ID_OF_ARTIFICIAL_STARTNODE",
+    "AddEdge",
     "AddEdgeToGraphPreviewResponse",
     "AddNodeToGraphPreviewResponse",
+    "AddTask",
+    "BatchScheduleResult",
     "DelayImpact",
+    "DurationDistribution",
+    "EmpiricalDuration",
+    "ForecastEntry",
+    "GraphChange",
+    "GraphDefinition",
     "GraphDefinitionValidationFinding",
     "GraphDefinitionValidationResult",
+    "LognormalDuration",
     "MermaidGanttConfig",
     "Person",
     "PersonId",
+    "PertDuration",
+    "RankedPath",
+    "RemoveEdge",
     "RemoveEdgeFromGraphPreviewResponse",
     "RemoveNodeFromGraphPreviewResponse",
+    "RemoveTask",
     "RunGroupId",
     "RunGroupPersonRelationId",
     "RunId",
     "ScheduleEntry",
     "ScheduleReport",
+    "StartNotification",
     "TaskDependencyEdge",
     "TaskDependencyId",
     "TaskExecutionStatus",
     "TaskId",
     "TaskNode",
+    "TaskStatusEvent",
+    "TimeInterval",
+    "TriangularDuration",
+    "UpdateNodeInGraphPreviewResponse",
+    "UpdateTask",
     "ValidationCode",
+    "WorkingCalendar",
     "task_node_as_artificial_endnode",
     "task_node_as_artificial_startnode",
 ]
@@ -0,0 +1,24 @@
+"""
+BatchScheduleResult: the schedule report of one graph of a batch (see batch_scheduling.create_schedule_reports).
+"""
+
+from datetime import timedelta
+
+from pydantic import BaseModel, ConfigDict
+
+from taskdependencygraph.models.schedule_report import ScheduleReport
+
+
+class BatchScheduleResult(BaseModel):
+    """The schedule report of one graph of a batch and how long it took to compute it."""
+
+    model_config = ConfigDict(frozen=True)
+
+    index: int
+    """the position of the graph in the batch"""
+    report: ScheduleReport
+    computation_time: timedelta
+    """the time the worker spent on the graph (decoding, building the graph and creating the report)"""
+
+
+__all__ = ["BatchScheduleResult"]
@@ -0,0 +1,129 @@
+"""
+Duration distributions describe the uncertainty of the duration of a task.
+They are used by the Monte Carlo schedule simulation (see TaskDependencyGraph.simulate_schedule) instead of the single
+planned_duration of the task.
+"""
+
+from datetime import timedelta
+from typing import Annotated, Literal, Self
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+_NonNegativeDuration = Annotated[timedelta, Field(ge=timedelta(0))]
+
+
+class TriangularDuration(BaseModel):
+    """
+    a triangular distribution between minimum and maximum that peaks at most_likely (three point estimate)
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal["triangular"] = "triangular"
+    minimum: _NonNegativeDuration
+    """
+    the optimistic estimate; the duration is never shorter than this
+    """
+    most_likely: _NonNegativeDuration
+    """
+    the mode of the distribution
+    """
+    maximum: _NonNegativeDuration
+    """
+    the pessimistic estimate; the duration is never longer than this
+    """
+
+    @model_validator(mode="after")
+    def validate_minimum_most_likely_maximum_are_ordered(self) -> Self:
+        """
+        Ensure that minimum <= most_likely <= maximum
+        """
+        if self.minimum <= self.most_likely <= self.maximum:
+            return self
+        raise ValueError("The estimates have to fulfill minimum <= most_likely <= maximum")
+
+
+class PertDuration(BaseModel):
+    """
+    a PERT-beta distribution between minimum and maximum with the mode most_likely (three point estimate).
+    Compared to the triangular distribution, it puts less weight on the tails.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal["pert"] = "pert"
+    minimum: _NonNegativeDuration
+    """
+    the optimistic estimate; the duration is never shorter than this
+    """
+    most_likely: _NonNegativeDuration
+    """
+    the mode of the distribution
+    """
+    maximum: _NonNegativeDuration
+    """
+    the pessimistic estimate; the duration is never longer than this
+    """
+    shape: Annotated[float, Field(gt=0)] = 4.0
+    """
+    the weight of the mode; the classic PERT distribution uses 4
+    """
+
+    @model_validator(mode="after")
+    def validate_minimum_most_likely_maximum_are_ordered(self) -> Self:
+        """
+        Ensure that minimum <= most_likely <= maximum
+        """
+        if self.minimum <= self.most_likely <= self.maximum:
+            return self
+        raise ValueError("The estimates have to fulfill minimum <= most_likely <= maximum")
+
+
+class LognormalDuration(BaseModel):
+    """
+    a log-normal distribution; durations are often skewed to the right: they may take much longer than expected but
+    hardly ever much shorter
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal["lognormal"] = "lognormal"
+    median: Annotated[timedelta, Field(gt=timedelta(0))]
+    """
+    half of the durations are shorter, half of them are longer than this
+    """
+    sigma: Annotated[float, Field(ge=0)]
+    """
+    the standard deviation of the logarithm of the duration; e.g. 0.5 means that about 16% of the durations are more
+    than exp(0.5)≈1.65 times the median
+    """
+
+
+class EmpiricalDuration(BaseModel):
+    """
+    an empirical distribution: each of the observed durations (e.g. from previous runs) is equally likely
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal["empirical"] = "empirical"
+    observed_durations: Annotated[list[_NonNegativeDuration], Field(min_length=1)]
+    """
+    the durations observed in the past
+    """
+
+
+DurationDistribution = Annotated[
+    TriangularDuration | PertDuration | LognormalDuration | EmpiricalDuration, Field(discriminator="kind")
+]
+"""
+any distribution of the duration of a task; the 'kind' discriminates the type (e.g. when parsing JSON)
+"""
+
+__all__ = [
+    "DurationDistribution",
+    "EmpiricalDuration",
+    "LognormalDuration",
+    "PertDuration",
+    "TriangularDuration",
+]
@@ -0,0 +1,20 @@
+"""
+ForecastEntry: the forecast of a single task (see TaskDependencyGraph.update_forecast).
+"""
+
+from pydantic import AwareDatetime, BaseModel, ConfigDict
+
+from taskdependencygraph.models.ids import TaskId
+
+
+class ForecastEntry(BaseModel):
+    """The forecast start and finish of a single task at a status date."""
+
+    model_config = ConfigDict(frozen=True)
+
+    task_id: TaskId
+    forecast_start: AwareDatetime
+    forecast_finish: AwareDatetime
+
+
+__all__ = ["ForecastEntry"]
@@ -0,0 +1,94 @@
+"""
+Graph changes describe single modifications of a TaskDependencyGraph.
+A list of them can be applied to a graph at once (and atomically) using TaskDependencyGraph.apply_changes.
+"""
+
+from typing import Annotated, Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from taskdependencygraph.models.ids import TaskDependencyId, TaskId
+from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
+from taskdependencygraph.models.task_node import TaskNode
+
+
+class AddTask(BaseModel):
+    """
+    adds a task to the graph (see TaskDependencyGraph.add_task)
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal["add_task"] = "add_task"
+    task: TaskNode
+    """
+    the task to be added
+    """
+
+
+class AddEdge(BaseModel):
+    """
+    adds an edge to the graph (see TaskDependencyGraph.add_edge)
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal["add_edge"] = "add_edge"
+    edge: TaskDependencyEdge
+    """
+    the edge to be added
+    """
+
+
+class RemoveTask(BaseModel):
+    """
+    removes a task and all its edges from the graph (see TaskDependencyGraph.remove_task)
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal["remove_task"] = "remove_task"
+    task_id: TaskId
+    """
+    the id of the task to be removed
+    """
+
+
+class RemoveEdge(BaseModel):
+    """
+    removes an edge from the graph (see TaskDependencyGraph.remove_edge)
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal["remove_edge"] = "remove_edge"
+    edge_id: TaskDependencyId
+    """
+    the id of the edge to be removed
+    """
+
+
+class UpdateTask(BaseModel):
+    """
+    updates fields of a task in the graph (see TaskDependencyGraph.update_task)
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal["update_task"] = "update_task"
+    task_id: TaskId
+    """
+    the id of the task to be updated
+    """
+    changes: dict[str, Any]
+    """
+    the new values by field name of the TaskNode, e.g. {"planned_duration": timedelta(minutes=5)}
+    """
+
+
+GraphChange = Annotated[AddTask | AddEdge | RemoveTask | RemoveEdge | UpdateTask, Field(discriminator="kind")]
+"""
+any single modification of a TaskDependencyGraph; the 'kind' discriminates the type (e.g. when parsing JSON)
+"""
+
+__all__ = ["AddEdge", "AddTask", "GraphChange", "RemoveEdge", "RemoveTask", "UpdateTask"]
@@ -0,0 +1,24 @@
+"""
+GraphDefinition: everything a TaskDependencyGraph is constructed from.
+"""
+
+from pydantic import AwareDatetime, BaseModel, ConfigDict
+
+from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
+from taskdependencygraph.models.task_node import TaskNode
+
+
+class GraphDefinition(BaseModel):
+    """
+    The tasks, dependencies and start of a run, i.e. the arguments of the TaskDependencyGraph constructor
+    (see TaskDependencyGraph.to_graph_definition for the reverse direction).
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    task_list: list[TaskNode]
+    dependency_list: list[TaskDependencyEdge]
+    starting_time_of_run: AwareDatetime
+
+
+__all__ = ["GraphDefinition"]
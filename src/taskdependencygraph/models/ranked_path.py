@@ -0,0 +1,31 @@
+"""
+RankedPath: one of the longest paths through a TaskDependencyGraph (see TaskDependencyGraph.get_top_k_paths).
+"""
+
+from datetime import timedelta
+
+from pydantic import BaseModel, ConfigDict
+
+from taskdependencygraph.models.ids import TaskId
+
+
+class RankedPath(BaseModel):
+    """A chain of dependent tasks from the start to the finish of the graph together with its total duration."""
+
+    model_config = ConfigDict(frozen=True)
+
+    rank: int
+    """1 for the longest path, 2 for the second longest and so on."""
+    task_ids: list[TaskId]
+    """Ordered list of the task IDs on the path, from graph start to graph finish."""
+    total_duration: timedelta
+    """Sum of the planned durations of the tasks on the path."""
+    slack: timedelta
+    """
+    How much longer the tasks on the path could take in total without pushing out the graph finish time, i.e. the
+    total duration of the graph minus the total duration of the path. Waiting times caused by an earliest_starttime
+    are not part of any path, so they show up as slack, too.
+    """
+
+
+__all__ = ["RankedPath"]
@@ -0,0 +1,34 @@
+"""
+StartNotification: the reminder that a task is about to start (see StartNotifier).
+"""
+
+from datetime import timedelta
+
+from pydantic import AwareDatetime, BaseModel, ConfigDict
+
+from taskdependencygraph.models.task_node import TaskNode
+
+
+class StartNotification(BaseModel):
+    """
+    A task starts in lead_time (at planned_start); the assignee of the task (if any) is to be notified, e.g. via
+    task.assignee.slack_id or task.assignee.email.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    task: TaskNode
+    """
+    the task as it was in the graph when the notification has been fired
+    """
+    planned_start: AwareDatetime
+    """
+    the (forecast) start of the task the notification refers to
+    """
+    lead_time: timedelta
+    """
+    the configured lead time that triggered the notification; the task may start earlier if the notification is late
+    """
+
+
+__all__ = ["StartNotification"]
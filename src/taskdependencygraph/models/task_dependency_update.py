@@ -111,9 +111,35 @@ class RemoveEdgeFromGraphPreviewResponse(BaseModel):
         raise ValueError("If the edge can not be removed, an error message must be provided")
 
 
+class UpdateNodeInGraphPreviewResponse(BaseModel):
+    """
+    Response to the frontends' request to potentially update (some fields of) a node in the TDG.
+    It's named 'preview' because the node is not actually updated yet.
+    """
+
+    can_be_updated: bool
+    """
+    true iff the node can be updated
+    """
+    error_message: str | None = None
+    """
+    error message if the node cannot be updated
+    """
+
+    @model_validator(mode="after")
+    def validate_there_is_an_error_message_if_necessary(self) -> Self:
+        """
+        Ensure that an error message is provided if the node cannot be updated
+        """
+        if self.can_be_updated is True or (self.can_be_updated is False and self.error_message):
+            return self
+        raise ValueError("If the task can not be updated, an error message must be provided")
+
+
 __all__ = [
     "AddEdgeToGraphPreviewResponse",
     "AddNodeToGraphPreviewResponse",
     "RemoveEdgeFromGraphPreviewResponse",
     "RemoveNodeFromGraphPreviewResponse",
+    "UpdateNodeInGraphPreviewResponse",
 ]
@@ -3,9 +3,9 @@ task domain model object
 """
 
 from datetime import datetime, timedelta
-from typing import Annotated, Any, Literal
+from typing import Annotated, Any, Literal, Self
 
-from pydantic import AwareDatetime, BaseModel, ConfigDict, Field
+from pydantic import AwareDatetime, BaseModel, ConfigDict, Field, model_validator
 
 from taskdependencygraph.models.ids import TaskId
 from taskdependencygraph.models.person import Person
@@ -91,6 +91,18 @@ class TaskNode(BaseModel):
     The task may only start at this datetime or later, even if predecessors finish earlier.
     """
 
+    actual_starttime: AwareDatetime | None = None
+    """
+    The time when the execution of the task actually started (if it has started).
+    Does not affect the plan, only the forecast (see TaskDependencyGraph.calculate_forecast_starting_time_of_task).
+    """
+
+    actual_finishtime: AwareDatetime | None = None
+    """
+    The time when the execution of the task actually finished (if it has finished).
+    A task can only have an actual_finishtime if it has an actual_starttime, too.
+    """
+
     planned_duration_of_predecessor_tasks: Annotated[timedelta, Field(ge=timedelta(0))] | None = None
     """
     The planned_duration_of_predecessor_tasks is the sum of the duration of the predecessor tasks.
@@ -113,6 +125,22 @@ class TaskNode(BaseModel):
     The assignee of the task.
     """
 
+    @model_validator(mode="after")
+    def validate_actual_finishtime_is_after_actual_starttime(self) -> Self:
+        """
+        Ensure that a finished task has been started and didn't finish before it started
+        """
+        if self.actual_finishtime is None:
+            return self
+        if self.actual_starttime is None:
+            raise ValueError("A task with an actual_finishtime must have an actual_starttime, too")
+        if self.actual_finishtime < self.actual_starttime:
+            raise ValueError(
+                f"The actual_finishtime ({self.actual_finishtime}) must not be before the actual_starttime "
+                f"({self.actual_starttime})"
+            )
+        return self
+
     def to_dot(self, attributes: dict[Literal["label", "color"], Any]) -> str:
         """
         returns a dot representation of this task/node
@@ -0,0 +1,39 @@
+"""
+Status events report the progress of a task during a run (see StatusEventIngestor).
+"""
+
+from typing import Any
+
+from pydantic import AwareDatetime, BaseModel, ConfigDict
+
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_execution_status import TaskExecutionStatus
+
+
+class TaskStatusEvent(BaseModel):
+    """
+    A change of the execution status and/or the actual start/finish time of a task.
+    Only the fields that are set explicitly are applied to the task, e.g. TaskStatusEvent(task_id=..,
+    execution_status=TaskExecutionStatus.STARTED) leaves the actual times untouched, whereas actual_starttime=None
+    removes a recorded actual start time.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    task_id: TaskId
+    """
+    the id of the task the event refers to
+    """
+    execution_status: TaskExecutionStatus | None = None
+    actual_starttime: AwareDatetime | None = None
+    actual_finishtime: AwareDatetime | None = None
+
+    @property
+    def changes(self) -> dict[str, Any]:
+        """
+        the fields of the TaskNode that are changed by this event (see TaskDependencyGraph.update_task)
+        """
+        return {field: getattr(self, field) for field in self.model_fields_set if field != "task_id"}
+
+
+__all__ = ["TaskStatusEvent"]
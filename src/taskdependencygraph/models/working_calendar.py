@@ -0,0 +1,50 @@
+"""
+Working calendars describe when tasks can be worked on, e.g. the maintenance windows or shifts of a cutover.
+They are used by the calendar-aware schedule (see TaskDependencyGraph.create_calendar_aware_schedule_report).
+"""
+
+from typing import Self
+
+from pydantic import AwareDatetime, BaseModel, ConfigDict, model_validator
+
+
+class TimeInterval(BaseModel):
+    """
+    the half-open interval [start, end)
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    start: AwareDatetime
+    end: AwareDatetime
+
+    @model_validator(mode="after")
+    def validate_start_is_before_end(self) -> Self:
+        """
+        Ensure that the interval is not empty
+        """
+        if self.start < self.end:
+            return self
+        raise ValueError(f"The start ({self.start}) of the interval has to be before its end ({self.end})")
+
+
+class WorkingCalendar(BaseModel):
+    """
+    The times in which tasks are worked on: all working intervals minus all blackout periods.
+    Outside of these times, the work on a task pauses, i.e. the planned_duration of a task is working time.
+    Intervals may overlap; they are merged.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    working_intervals: list[TimeInterval]
+    """
+    e.g. the shifts or maintenance windows
+    """
+    blackout_periods: list[TimeInterval] = []
+    """
+    times in which no work happens although they are part of a working interval, e.g. a change freeze
+    """
+
+
+__all__ = ["TimeInterval", "WorkingCalendar"]
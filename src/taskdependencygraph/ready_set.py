@@ -0,0 +1,187 @@
+"""
+The ReadySet keeps track of the tasks that are ready to be requested: all their predecessors are finished, but they
+haven't been requested themselves yet.
+"""
+
+import heapq
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from networkx import DiGraph  # type: ignore[import-untyped]
+
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_execution_status import TaskExecutionStatus
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.models.task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE
+
+_ARTIFICIAL_NODE_IDS = frozenset({ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE})
+
+_FINISHED_STATUSES = frozenset({TaskExecutionStatus.COMPLETED, TaskExecutionStatus.OBSOLETE})
+
+
+def _is_finished(task: TaskNode) -> bool:
+    return task.execution_status in _FINISHED_STATUSES
+
+
+def _is_waiting(task: TaskNode) -> bool:
+    """
+    tasks without an execution_status are treated like NOT_YET_REQUESTED ones
+    """
+    return task.execution_status in (None, TaskExecutionStatus.NOT_YET_REQUESTED)
+
+
+class _ReadyHeap:  # pylint:disable=too-few-public-methods
+    """
+    A heap of ready tasks whose keys belong to one version of the graph. Entries of tasks that are no longer ready
+    are not removed eagerly but skipped when they reach the top of the heap.
+    """
+
+    def __init__(self, version: int, entries: list[tuple[Any, TaskId]]):
+        self.version = version
+        """
+        the version of the graph the keys have been computed for
+        """
+        heapq.heapify(entries)
+        self.entries = entries
+        self.task_ids = {task_id for _, task_id in entries}
+        """
+        the ids of the tasks that have an entry in the heap
+        """
+        self.newly_ready: list[TaskId] = []
+        """
+        the tasks that became ready since the heap has been used the last time; they're pushed on the next use
+        """
+
+
+class ReadySet:
+    """
+    For every task, the number of its direct (real) predecessors that are not finished (COMPLETED or OBSOLETE) yet.
+    A task is ready if this number is zero and the task is still NOT_YET_REQUESTED (or has no execution_status).
+    The TaskDependencyGraph reports every modification to the ReadySet, which updates the counters in O(out-degree)
+    of the modified task. The ready tasks are provided ordered by an arbitrary key through a heap per key.
+    This is an internal helper of the TaskDependencyGraph; it's not meant to be used on its own.
+    """
+
+    def __init__(self) -> None:
+        self.unfinished_predecessors: dict[TaskId, int] = {}
+        """
+        the number of direct predecessors of each real task that are not finished yet
+        """
+        self.ready: set[TaskId] = set()
+        """
+        the ids of all ready tasks
+        """
+        self._heaps: dict[Hashable, _ReadyHeap] = {}
+
+    @classmethod
+    def from_graph(cls, graph: DiGraph) -> "ReadySet":
+        """
+        Counts the unfinished predecessors of all tasks; O(V+E).
+        """
+        result = cls()
+        for node in graph.nodes:
+            if node not in _ARTIFICIAL_NODE_IDS:
+                result.unfinished_predecessors[node] = 0
+        for predecessor_id, successor_id in graph.edges:
+            if predecessor_id not in _ARTIFICIAL_NODE_IDS and successor_id not in _ARTIFICIAL_NODE_IDS:
+                if not _is_finished(graph.nodes[predecessor_id]["domain_model"]):
+                    result.unfinished_predecessors[successor_id] += 1
+        for node in result.unfinished_predecessors:
+            result._refresh(graph, node)
+        return result
+
+    def _refresh(self, graph: DiGraph, task_id: TaskId) -> None:
+        if self.unfinished_predecessors[task_id] == 0 and _is_waiting(graph.nodes[task_id]["domain_model"]):
+            if task_id not in self.ready:
+                self.ready.add(task_id)
+                for heap in self._heaps.values():
+                    heap.newly_ready.append(task_id)
+        else:
+            self.ready.discard(task_id)
+
+    def add_task(self, graph: DiGraph, task_id: TaskId) -> None:
+        """
+        to be called after a task (without edges) has been added to the graph
+        """
+        self.unfinished_predecessors[task_id] = 0
+        self._refresh(graph, task_id)
+
+    def remove_task(self, graph: DiGraph, task_id: TaskId) -> None:
+        """
+        to be called right before a task is removed from the graph (while its edges still exist)
+        """
+        if not _is_finished(graph.nodes[task_id]["domain_model"]):
+            for successor_id in graph.successors(task_id):
+                if successor_id not in _ARTIFICIAL_NODE_IDS:
+                    self.unfinished_predecessors[successor_id] -= 1
+                    self._refresh(graph, successor_id)
+        del self.unfinished_predecessors[task_id]
+        self.ready.discard(task_id)
+
+    def add_edge(self, graph: DiGraph, predecessor_id: TaskId, successor_id: TaskId) -> None:
+        """
+        to be called after an edge has been added to the graph; edges from/to the artificial nodes are ignored
+        """
+        if predecessor_id in _ARTIFICIAL_NODE_IDS or successor_id in _ARTIFICIAL_NODE_IDS:
+            return
+        if not _is_finished(graph.nodes[predecessor_id]["domain_model"]):
+            self.unfinished_predecessors[successor_id] += 1
+            self._refresh(graph, successor_id)
+
+    def remove_edge(self, graph: DiGraph, predecessor_id: TaskId, successor_id: TaskId) -> None:
+        """
+        to be called after an edge has been removed from the graph; edges from/to the artificial nodes are ignored
+        """
+        if predecessor_id in _ARTIFICIAL_NODE_IDS or successor_id in _ARTIFICIAL_NODE_IDS:
+            return
+        if not _is_finished(graph.nodes[predecessor_id]["domain_model"]):
+            self.unfinished_predecessors[successor_id] -= 1
+            self._refresh(graph, successor_id)
+
+    def update_task(self, graph: DiGraph, previous_task: TaskNode, task: TaskNode) -> None:
+        """
+        to be called after the domain model of a task has been replaced (e.g. because its execution_status changed)
+        """
+        was_finished, is_finished = _is_finished(previous_task), _is_finished(task)
+        if was_finished != is_finished:
+            difference = -1 if is_finished else 1
+            for successor_id in graph.successors(task.id):
+                if successor_id not in _ARTIFICIAL_NODE_IDS:
+                    self.unfinished_predecessors[successor_id] += difference
+                    self._refresh(graph, successor_id)
+        self._refresh(graph, task.id)
+
+    def get_ready_task_ids(
+        self, order_by: Hashable, key_of: Callable[[TaskId], Any], version: int, limit: int | None = None
+    ) -> list[TaskId]:
+        """
+        Returns the ids of the ready tasks, ordered by the key returned by key_of (at most limit of them).
+        order_by names the ordering: the tasks are kept in one heap per ordering, whose keys are valid as long as the
+        graph doesn't change (version); otherwise the heap is rebuilt from the ready tasks in O(R) for R ready tasks.
+        Taking the first k tasks costs O(k log R) (plus skipping the tasks that are no longer ready).
+        """
+        heap = self._heaps.get(order_by)
+        if heap is None or heap.version != version:
+            heap = _ReadyHeap(version, [(key_of(task_id), task_id) for task_id in self.ready])
+            self._heaps[order_by] = heap
+        for task_id in heap.newly_ready:
+            if task_id in self.ready and task_id not in heap.task_ids:
+                heapq.heappush(heap.entries, (key_of(task_id), task_id))
+                heap.task_ids.add(task_id)
+        heap.newly_ready = []
+        result: list[TaskId] = []
+        taken: list[tuple[Any, TaskId]] = []
+        while heap.entries and (limit is None or len(result) < limit):
+            entry = heapq.heappop(heap.entries)
+            if entry[1] in self.ready:
+                result.append(entry[1])
+                taken.append(entry)
+            else:
+                heap.task_ids.discard(entry[1])
+        for entry in taken:
+            heapq.heappush(heap.entries, entry)
+        return result
+
+
+__all__ = ["ReadySet"]
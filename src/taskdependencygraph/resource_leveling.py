@@ -0,0 +1,190 @@
+"""
+Resource leveling: a schedule in which no person works on more than one task at a time.
+"""
+
+import heapq
+import itertools
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from networkx import DiGraph  # type: ignore[import-untyped]
+
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.models.task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE
+
+
+class ResourceLeveledSchedule:  # pylint:disable=too-few-public-methods
+    """
+    The start of every task in a schedule that respects the dependencies, the earliest_starttimes and the capacity of
+    the assignees: each person (identified by the id of the assignee of a task) works on at most one task at a time.
+    Tasks without an assignee are not constrained by any resource.
+
+    The schedule is created by a parallel list scheduler: whenever a person is idle and some of their tasks are ready
+    (all predecessors finished and the earliest_starttime reached), the person starts the ready task with the least
+    total slack in the unconstrained schedule (ties: earlier earliest start first, then graph insertion order).
+    Tasks are never delayed deliberately, i.e. the schedule is non-delay. Every task enters and leaves the event queue
+    and the ready queue of its assignee once, so this runs in O((V+E) + V log V).
+    """
+
+    def __init__(
+        self,
+        start: dict[TaskId, timedelta],
+        resource_predecessor: dict[TaskId, TaskId],
+        latest_start: dict[TaskId, timedelta],
+        critical_path: list[TaskId],
+    ):
+        self.start = start
+        """
+        the leveled start of every node as offset from the start of the run
+        """
+        self.resource_predecessor = resource_predecessor
+        """
+        maps each task to the task its assignee works on right before it (if any)
+        """
+        self.resource_successor: dict[TaskId, TaskId] = {
+            predecessor_id: task_id for task_id, predecessor_id in resource_predecessor.items()
+        }
+        """
+        maps each task to the task its assignee works on right after it (if any)
+        """
+        self.latest_start = latest_start
+        """
+        the latest start of every node (offset from the start of the run) that neither delays the (leveled) finish of
+        the graph nor changes the order in which the assignees work on their tasks
+        """
+        self.critical_path = critical_path
+        """
+        the ordered ids of the tasks (including the artificial start and end node) that determine the leveled finish
+        of the graph; consecutive tasks are either dependent or done one after another by the same person
+        """
+
+    @property
+    def graph_finish(self) -> timedelta:
+        """
+        the offset of the leveled finish of the entire graph
+        """
+        return self.start[ID_OF_ARTIFICIAL_ENDNODE]
+
+    @classmethod
+    def compute(  # pylint:disable=too-many-locals
+        cls,
+        graph: DiGraph,
+        ordered_node_ids: Sequence[TaskId],
+        starting_time_of_run: datetime,
+        total_slack: Mapping[TaskId, timedelta],
+        earliest_start: Mapping[TaskId, timedelta],
+    ) -> "ResourceLeveledSchedule":
+        """
+        Schedules the graph; total_slack and earliest_start are the results of the unconstrained passes, they are only
+        used to prioritise the tasks.
+        """
+        position = {node_id: index for index, node_id in enumerate(ordered_node_ids)}
+        unfinished_predecessors = {node_id: graph.in_degree(node_id) for node_id in ordered_node_ids}
+        ready_time = dict.fromkeys(ordered_node_ids, timedelta(0))
+        start: dict[TaskId, timedelta] = {}
+        started: list[TaskId] = []  # in the order in which the tasks are started
+        resource_predecessor: dict[TaskId, TaskId] = {}
+        last_task_of: dict[UUID, TaskId] = {}
+        busy_until: dict[UUID, timedelta] = {}
+        ready_tasks_of: dict[UUID, list[tuple[timedelta, timedelta, int, TaskId]]] = {}
+        # events: (time, sequence, task id, is finish event); the sequence keeps the heap stable
+        events: list[tuple[timedelta, int, TaskId, bool]] = []
+        sequence = itertools.count()
+
+        def _release_time(node_id: TaskId) -> timedelta:
+            task: TaskNode = graph.nodes[node_id]["domain_model"]
+            if task.earliest_starttime is None:
+                return timedelta(0)
+            return max(task.earliest_starttime - starting_time_of_run, timedelta(0))
+
+        def _start(node_id: TaskId, time: timedelta) -> None:
+            start[node_id] = time
+            started.append(node_id)
+            finish = time + graph.nodes[node_id]["domain_model"].planned_duration
+            heapq.heappush(events, (finish, next(sequence), node_id, True))
+
+        def _dispatch(person_id: UUID, time: timedelta) -> None:
+            ready_tasks = ready_tasks_of.get(person_id)
+            if ready_tasks and busy_until.get(person_id, timedelta(0)) <= time:
+                node_id = heapq.heappop(ready_tasks)[-1]
+                if person_id in last_task_of:
+                    resource_predecessor[node_id] = last_task_of[person_id]
+                last_task_of[person_id] = node_id
+                busy_until[person_id] = time + graph.nodes[node_id]["domain_model"].planned_duration
+                _start(node_id, time)
+
+        heapq.heappush(
+            events, (_release_time(ID_OF_ARTIFICIAL_STARTNODE), next(sequence), ID_OF_ARTIFICIAL_STARTNODE, False)
+        )
+        while events:
+            time = events[0][0]
+            persons_to_dispatch: set[UUID] = set()
+            while events and events[0][0] == time:
+                _, _, node_id, is_finish = heapq.heappop(events)
+                task: TaskNode = graph.nodes[node_id]["domain_model"]
+                if is_finish:
+                    if task.assignee is not None:
+                        persons_to_dispatch.add(task.assignee.id)
+                    for successor_id in graph.successors(node_id):
+                        ready_time[successor_id] = max(ready_time[successor_id], time)
+                        unfinished_predecessors[successor_id] -= 1
+                        if unfinished_predecessors[successor_id] == 0:
+                            release = max(ready_time[successor_id], _release_time(successor_id))
+                            heapq.heappush(events, (release, next(sequence), successor_id, False))
+                elif task.assignee is None:
+                    _start(node_id, time)
+                else:
+                    priority = (total_slack[node_id], earliest_start[node_id], position[node_id], node_id)
+                    heapq.heappush(ready_tasks_of.setdefault(task.assignee.id, []), priority)
+                    persons_to_dispatch.add(task.assignee.id)
+            for person_id in persons_to_dispatch:
+                _dispatch(person_id, time)
+        result = cls(start, resource_predecessor, {}, [])
+        result._compute_latest_starts(graph, started)  # pylint:disable=protected-access
+        result._compute_critical_path(graph)  # pylint:disable=protected-access
+        return result
+
+    def _compute_latest_starts(self, graph: DiGraph, started: list[TaskId]) -> None:
+        """
+        Backward pass over the leveled schedule: the next task of the same person counts as an additional successor.
+        The tasks are processed in reversed start order, in which every (graph or resource) successor of a task comes
+        before the task.
+        """
+        for node_id in reversed(started):
+            latest_finish = min(
+                (self.latest_start[successor_id] for successor_id in graph.successors(node_id)),
+                default=self.graph_finish,
+            )
+            if node_id in self.resource_successor:
+                latest_finish = min(latest_finish, self.latest_start[self.resource_successor[node_id]])
+            self.latest_start[node_id] = latest_finish - graph.nodes[node_id]["domain_model"].planned_duration
+
+    def _compute_critical_path(self, graph: DiGraph) -> None:
+        """
+        Walks back from the artificial end node: each task started because a predecessor or the previous task of the
+        same person finished (that one is followed, dependencies first) or because its earliest_starttime was reached
+        (then the predecessor that finished last is followed).
+        """
+        path: list[TaskId] = [ID_OF_ARTIFICIAL_ENDNODE]
+        node_id = ID_OF_ARTIFICIAL_ENDNODE
+        while node_id != ID_OF_ARTIFICIAL_STARTNODE:
+            candidates = list(graph.predecessors(node_id))
+            if node_id in self.resource_predecessor:
+                candidates.append(self.resource_predecessor[node_id])
+            finish = {
+                candidate: self.start[candidate] + graph.nodes[candidate]["domain_model"].planned_duration
+                for candidate in candidates
+            }
+            node_id = next(
+                (candidate for candidate in candidates if finish[candidate] == self.start[node_id]),
+                max(candidates, key=finish.__getitem__),
+            )
+            path.append(node_id)
+        path.reverse()
+        self.critical_path = path
+
+
+__all__ = ["ResourceLeveledSchedule"]
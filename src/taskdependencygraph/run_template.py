@@ -0,0 +1,244 @@
+"""
+Run templates: the same plan is executed in many runs (rehearsals, one run per tenant, ...). A RunTemplate holds
+everything the runs share (the tasks, the topology, the topological order and the durations) exactly once, and each
+RunInstance only stores what differs from run to run.
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+
+from taskdependencygraph.compact_task_graph import NO_EARLIEST_START, CompactTaskGraph, to_epoch_microseconds
+from taskdependencygraph.models.ids import RunGroupId, RunId, TaskId
+from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
+from taskdependencygraph.models.task_execution_status import TaskExecutionStatus
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+_STATUSES: tuple[TaskExecutionStatus | None, ...] = (None, *TaskExecutionStatus)
+_STATUS_CODE = {status: code for code, status in enumerate(_STATUSES)}
+
+
+class RunTemplate:
+    """
+    The immutable part of a plan that is shared by all of its runs: the tasks (which are never copied), the
+    CompactTaskGraph (topology in topological order, durations and the earliest starts of the plan) and the remaining
+    duration of each task (backward pass), which doesn't depend on the start of a run.
+    Build the template once and create one RunInstance per run (see create_run).
+    """
+
+    __slots__ = ("compact_graph", "dependencies", "execution_status", "plan_order", "remaining_duration", "tasks")
+
+    def __init__(self, tasks: Sequence[TaskNode], dependencies: Sequence[TaskDependencyEdge]):
+        """
+        Raises a ValueError if the tasks and dependencies don't define a valid graph (see
+        TaskDependencyGraph.validate_definition).
+        """
+        validation_result = TaskDependencyGraph.validate_definition(list(tasks), list(dependencies))
+        if not validation_result.is_valid:
+            raise ValueError(
+                "Invalid graph definition: " + "; ".join(finding.message for finding in validation_result.findings)
+            )
+        self.compact_graph = CompactTaskGraph.from_tasks(tasks, dependencies)
+        """
+        the topology, durations and earliest starts of the plan; the dense index of a task is its topological position
+        """
+        task_by_id = {task.id: task for task in tasks}
+        self.tasks: tuple[TaskNode, ...] = tuple(task_by_id[task_id] for task_id in self.compact_graph.task_ids)
+        """
+        the tasks of the plan, ordered by their dense index
+        """
+        self.plan_order = array("i", (self.compact_graph.index_of[task.id] for task in tasks))
+        """
+        the dense indices of the tasks in the order in which they have been passed; the graphs materialised from the
+        runs keep this order (it decides e.g. which of several tied critical paths is reported and the export order)
+        """
+        self.dependencies: tuple[TaskDependencyEdge, ...] = tuple(dependencies)
+        self.execution_status = array("b", (_STATUS_CODE[task.execution_status] for task in self.tasks))
+        """
+        the execution status of each task in the plan, encoded as position in _STATUSES
+        """
+        self.remaining_duration = self.compact_graph.compute_remaining_durations()
+        """
+        the remaining duration of each task in microseconds (see CompactTaskGraph.compute_remaining_durations)
+        """
+
+    @classmethod
+    def from_task_dependency_graph(cls, graph: TaskDependencyGraph) -> "RunTemplate":
+        """
+        Creates a template from the current tasks and dependencies of a TaskDependencyGraph.
+        """
+        definition = graph.to_graph_definition()
+        return cls(definition.task_list, definition.dependency_list)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def create_run(
+        self,
+        run_id: RunId,
+        starting_time_of_run: datetime,
+        *,
+        run_group_id: RunGroupId | None = None,
+        earliest_starttime_overrides: Mapping[TaskId, datetime | None] | None = None,
+    ) -> "RunInstance":
+        """
+        Creates a new run of the plan; this only allocates one status byte per task (and the overrides).
+        """
+        run = RunInstance(self, run_id, starting_time_of_run, run_group_id)
+        for task_id, earliest_starttime in (earliest_starttime_overrides or {}).items():
+            run.set_earliest_starttime(task_id, earliest_starttime)
+        return run
+
+
+class RunInstance:
+    """
+    One run of a RunTemplate. It stores only what is specific to the run: its start, the earliest starts that differ
+    from the plan and the execution status of each task (one byte per task); everything else is shared with the
+    template. The planned starts of the run are computed lazily by one forward pass over the arrays of the template
+    (O(V+E)) and cached until the earliest starts of the run change.
+    Use to_task_dependency_graph for everything that needs a full TaskDependencyGraph.
+    """
+
+    __slots__ = (
+        "_earliest_start",
+        "_execution_status",
+        "_graph_finish",
+        "earliest_starttime_overrides",
+        "run_group_id",
+        "run_id",
+        "starting_time_of_run",
+        "template",
+    )
+
+    def __init__(
+        self, template: RunTemplate, run_id: RunId, starting_time_of_run: datetime, run_group_id: RunGroupId | None
+    ):
+        self.template = template
+        self.run_id = run_id
+        self.run_group_id = run_group_id
+        self.starting_time_of_run = starting_time_of_run
+        self.earliest_starttime_overrides: dict[int, datetime | None] = {}
+        """
+        maps the dense index of a task to its earliest_starttime in this run, if it differs from the plan
+        """
+        self._execution_status = array("b", template.execution_status)
+        self._earliest_start: array | None = None  # type:ignore[type-arg] # the result of the forward pass (cached)
+        self._graph_finish = 0  # the finish of the last task in microseconds; valid along with _earliest_start
+
+    def _get_index(self, task_id: TaskId) -> int:
+        index = self.template.compact_graph.index_of.get(task_id)
+        if index is None:
+            raise ValueError(f"Task with id {task_id!r} is not part of the run template")
+        return index
+
+    def get_execution_status(self, task_id: TaskId) -> TaskExecutionStatus | None:
+        """
+        Returns the execution status of a task in this run.
+        """
+        return _STATUSES[self._execution_status[self._get_index(task_id)]]
+
+    def set_execution_status(self, task_id: TaskId, execution_status: TaskExecutionStatus | None) -> None:
+        """
+        Sets the execution status of a task in this run; the schedule is not affected.
+        """
+        self._execution_status[self._get_index(task_id)] = _STATUS_CODE[execution_status]
+
+    def get_earliest_starttime(self, task_id: TaskId) -> datetime | None:
+        """
+        Returns the earliest_starttime of a task in this run (the override, if there is one, otherwise the plan's).
+        """
+        index = self._get_index(task_id)
+        if index in self.earliest_starttime_overrides:
+            return self.earliest_starttime_overrides[index]
+        return self.template.tasks[index].earliest_starttime
+
+    def set_earliest_starttime(self, task_id: TaskId, earliest_starttime: datetime | None) -> None:
+        """
+        Overrides the earliest_starttime of a task in this run (None removes the earliest start of the plan).
+        """
+        index = self._get_index(task_id)
+        if earliest_starttime == self.template.tasks[index].earliest_starttime:
+            self.earliest_starttime_overrides.pop(index, None)
+        else:
+            self.earliest_starttime_overrides[index] = earliest_starttime
+        self._earliest_start = None
+
+    def _get_earliest_starts(self) -> array:  # type:ignore[type-arg]
+        if self._earliest_start is None:
+            compact_graph = self.template.compact_graph
+            if self.earliest_starttime_overrides:
+                earliest_start = array("q", compact_graph.earliest_start)
+                for index, earliest_starttime in self.earliest_starttime_overrides.items():
+                    earliest_start[index] = (
+                        NO_EARLIEST_START if earliest_starttime is None else to_epoch_microseconds(earliest_starttime)
+                    )
+                compact_graph = compact_graph.with_earliest_starts(earliest_start)
+            earliest_starts = compact_graph.compute_earliest_starts(self.starting_time_of_run)
+            duration = compact_graph.duration
+            self._graph_finish = max(
+                (earliest_starts[index] + duration[index] for index in range(len(duration))), default=0
+            )
+            self._earliest_start = earliest_starts
+        return self._earliest_start
+
+    def calculate_planned_starting_time_of_task(self, task_id: TaskId) -> datetime:
+        """
+        Returns the planned start of a task in this run; it only depends on the start and the earliest starts of the
+        run.
+        """
+        return self.starting_time_of_run + timedelta(microseconds=self._get_earliest_starts()[self._get_index(task_id)])
+
+    def calculate_planned_finish_time_of_task(self, task_id: TaskId) -> datetime:
+        """
+        Returns the planned finish of a task in this run.
+        """
+        index = self._get_index(task_id)
+        finish = self._get_earliest_starts()[index] + self.template.compact_graph.duration[index]
+        return self.starting_time_of_run + timedelta(microseconds=finish)
+
+    def _get_graph_finish(self) -> int:
+        self._get_earliest_starts()
+        return self._graph_finish
+
+    def calculate_planned_finish_time_of_graph(self) -> datetime:
+        """
+        Returns the planned finish of the whole run, i.e. the moment its last task is finished.
+        """
+        return self.starting_time_of_run + timedelta(microseconds=self._get_graph_finish())
+
+    def calculate_total_slack_of_task(self, task_id: TaskId) -> timedelta:
+        """
+        Returns the total slack of a task in this run (see TaskDependencyGraph.calculate_total_slack_of_task).
+        """
+        index = self._get_index(task_id)
+        latest_start = self._get_graph_finish() - self.template.remaining_duration[index]
+        return timedelta(microseconds=latest_start - self._get_earliest_starts()[index])
+
+    def to_task_dependency_graph(self) -> TaskDependencyGraph:
+        """
+        Materialises this run as a full TaskDependencyGraph: the tasks are copied with the execution status and the
+        earliest_starttime of this run; tasks and dependencies keep the order of the plan. This costs as much as
+        building the graph from scratch.
+        """
+        template_tasks = self.template.tasks
+        tasks = [
+            template_tasks[index].model_copy(
+                update={
+                    "execution_status": _STATUSES[self._execution_status[index]],
+                    "earliest_starttime": self.get_earliest_starttime(template_tasks[index].id),
+                }
+            )
+            if self._execution_status[index] != self.template.execution_status[index]
+            or index in self.earliest_starttime_overrides
+            else template_tasks[index]
+            for index in self.template.plan_order
+        ]
+        return TaskDependencyGraph(
+            task_list=tasks,
+            dependency_list=list(self.template.dependencies),
+            starting_time_of_run=self.starting_time_of_run,
+        )
+
+
+__all__ = ["RunInstance", "RunTemplate"]
@@ -0,0 +1,248 @@
+"""
+Monte Carlo simulation of the schedule of a task dependency graph whose task durations are uncertain.
+This module requires the optional dependency numpy (pip install taskdependencygraph[numpy]); don't import it directly
+but use TaskDependencyGraph.simulate_schedule.
+"""
+
+# pylint:disable=protected-access
+import itertools
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import AwareDatetime
+
+from taskdependencygraph.compact_task_graph import (
+    NO_EARLIEST_START,
+    CompactTaskGraph,
+    to_epoch_microseconds,
+    to_microseconds,
+)
+from taskdependencygraph.models.duration_distribution import (
+    DurationDistribution,
+    LognormalDuration,
+    PertDuration,
+    TriangularDuration,
+)
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.models.task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE
+
+_Int64Array = npt.NDArray[np.int64]
+_Float64Array = npt.NDArray[np.float64]
+
+_ELEMENTS_PER_CHUNK = 2**22
+"""
+the default number of samples per chunk is chosen such that one tasks × samples matrix of a chunk has about this many
+entries (32MB); this bounds the memory consumption independent of the number of samples
+"""
+_MAX_DURATION = to_microseconds(timedelta.max) // 1_000
+"""
+sampled durations are capped, so that the sums along the paths can't overflow (relevant for lognormal tails only)
+"""
+
+
+class _DurationSampler:
+    """
+    Draws the durations of all tasks of a CompactTaskGraph for many samples at once.
+    The tasks are grouped by the kind of their distribution, such that each group is sampled with one vectorised call;
+    tasks without a distribution keep their planned duration in all samples.
+    """
+
+    def __init__(self, graph: CompactTaskGraph, distributions: Mapping[TaskId, DurationDistribution]):
+        self.planned_duration: _Int64Array = np.frombuffer(graph.duration, dtype=np.int64).copy()
+        triangular: list[tuple[int, TriangularDuration]] = []
+        pert: list[tuple[int, PertDuration]] = []
+        lognormal: list[tuple[int, LognormalDuration]] = []
+        self.empirical: list[tuple[int, _Int64Array]] = []
+        for task_id, distribution in distributions.items():
+            index = graph.index_of[task_id]
+            if isinstance(distribution, TriangularDuration):
+                triangular.append((index, distribution))
+            elif isinstance(distribution, PertDuration):
+                pert.append((index, distribution))
+            elif isinstance(distribution, LognormalDuration):
+                lognormal.append((index, distribution))
+            else:
+                observed = np.array([to_microseconds(duration) for duration in distribution.observed_durations])
+                self.empirical.append((index, observed))
+        self.triangular_indices = np.array([index for index, _ in triangular], dtype=np.int64)
+        self.triangular_parameters = self._three_point_estimates([distribution for _, distribution in triangular])
+        self.pert_indices = np.array([index for index, _ in pert], dtype=np.int64)
+        self.pert_parameters = self._three_point_estimates([distribution for _, distribution in pert])
+        self.pert_shape = np.array([distribution.shape for _, distribution in pert], dtype=np.float64)
+        self.lognormal_indices = np.array([index for index, _ in lognormal], dtype=np.int64)
+        self.lognormal_log_median = np.log([to_microseconds(distribution.median) for _, distribution in lognormal])
+        self.lognormal_sigma = np.array([distribution.sigma for _, distribution in lognormal], dtype=np.float64)
+
+    @staticmethod
+    def _three_point_estimates(distributions: Sequence[TriangularDuration | PertDuration]) -> _Float64Array:
+        """
+        returns the minimum, most likely and maximum duration (in microseconds) of each distribution; the shape is
+        distributions × 3 × 1, so that the estimates broadcast against the samples
+        """
+        return np.array(
+            [
+                [to_microseconds(d.minimum), to_microseconds(d.most_likely), to_microseconds(d.maximum)]
+                for d in distributions
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 3, 1)
+
+    def sample(self, rng: np.random.Generator, number_of_samples: int) -> _Int64Array:
+        """
+        Returns the sampled durations in microseconds as tasks × samples matrix.
+        """
+        result = np.repeat(self.planned_duration[:, np.newaxis], number_of_samples, axis=1)
+        if len(self.triangular_indices):
+            # inverse transform sampling; unlike Generator.triangular this also works for minimum == maximum
+            minimum, most_likely, maximum = np.moveaxis(self.triangular_parameters, 1, 0)
+            width = maximum - minimum
+            split = np.divide(most_likely - minimum, width, out=np.zeros_like(width), where=width > 0)
+            uniform = rng.random((len(self.triangular_indices), number_of_samples))
+            sampled = np.where(
+                uniform < split,
+                minimum + np.sqrt(uniform * width * (most_likely - minimum)),
+                maximum - np.sqrt((1 - uniform) * width * (maximum - most_likely)),
+            )
+            result[self.triangular_indices] = np.rint(sampled)
+        if len(self.pert_indices):
+            minimum, most_likely, maximum = np.moveaxis(self.pert_parameters, 1, 0)
+            width = maximum - minimum
+            shape = self.pert_shape[:, np.newaxis]
+            alpha = 1 + shape * np.divide(most_likely - minimum, width, out=np.zeros_like(width), where=width > 0)
+            beta = 1 + shape * np.divide(maximum - most_likely, width, out=np.zeros_like(width), where=width > 0)
+            sampled = minimum + width * rng.beta(alpha, beta, (len(self.pert_indices), number_of_samples))
+            result[self.pert_indices] = np.rint(sampled)
+        if len(self.lognormal_indices):
+            normal = rng.standard_normal((len(self.lognormal_indices), number_of_samples))
+            sampled = np.exp(self.lognormal_log_median[:, np.newaxis] + self.lognormal_sigma[:, np.newaxis] * normal)
+            result[self.lognormal_indices] = np.rint(np.minimum(sampled, _MAX_DURATION))
+        for index, observed_durations in self.empirical:
+            result[index] = observed_durations[rng.integers(len(observed_durations), size=number_of_samples)]
+        return result
+
+
+def _simulate_chunk(
+    graph: CompactTaskGraph,
+    sampler: _DurationSampler,
+    release_offset: _Int64Array,
+    seed: np.random.SeedSequence,
+    number_of_samples: int,
+) -> tuple[_Int64Array, _Int64Array]:
+    """
+    Simulates one chunk of samples. Returns the finish of the graph (relative to the start of the run) in each sample
+    and, per task, the number of samples in which the task is on a critical path.
+    This is a module level function, so that it can be run in a worker process.
+    """
+    levels = graph._get_levels("numpy")
+    if levels is None:  # pragma: no cover
+        raise RuntimeError("The numpy backend always returns levels — this is a bug")
+    durations = sampler.sample(np.random.default_rng(seed), number_of_samples)
+    earliest_starts = levels.compute_earliest_starts_of_samples(durations, release_offset)
+    critical = levels.compute_critical_samples(durations, earliest_starts, release_offset)
+    graph_finish = (earliest_starts + durations).max(axis=0, initial=0)
+    return graph_finish, critical.sum(axis=1)
+
+
+class ScheduleSimulationResult:
+    """
+    The outcome of a Monte Carlo simulation of the schedule (see TaskDependencyGraph.simulate_schedule).
+    """
+
+    def __init__(
+        self, starting_time_of_run: datetime, graph_finish: _Int64Array, criticality_index: dict[TaskId, float]
+    ):
+        self.starting_time_of_run = starting_time_of_run
+        self.graph_finish = graph_finish
+        """
+        the sampled durations of the whole run in microseconds, i.e. the distribution of
+        calculate_planned_finish_time_of_graph - starting_time_of_run (one entry per sample)
+        """
+        self.criticality_index = criticality_index
+        """
+        the fraction of samples in which each (real) task is on a critical path; tasks with a criticality index close
+        to 1 are the ones whose durations deserve the most attention
+        """
+
+    @property
+    def number_of_samples(self) -> int:
+        """
+        the number of simulated samples
+        """
+        return len(self.graph_finish)
+
+    def get_finish_time_quantile(self, quantile: float) -> AwareDatetime:
+        """
+        Returns the finish time of the graph that is not exceeded in the given fraction of the samples, e.g. 0.8 for
+        the P80 finish date.
+        """
+        if not 0 <= quantile <= 1:
+            raise ValueError(f"The quantile has to be between 0 and 1 but was {quantile}")
+        offset = int(np.quantile(self.graph_finish, quantile, method="inverted_cdf"))
+        return self.starting_time_of_run + timedelta(microseconds=offset)
+
+    def get_finish_time_quantiles(self, quantiles: Iterable[float] = (0.5, 0.8, 0.95)) -> dict[float, AwareDatetime]:
+        """
+        Returns the finish time of the graph for each of the given quantiles (by default P50, P80 and P95).
+        """
+        return {quantile: self.get_finish_time_quantile(quantile) for quantile in quantiles}
+
+    def get_finish_times(self) -> list[AwareDatetime]:
+        """
+        Returns the finish time of the graph in each sample.
+        """
+        return [self.starting_time_of_run + timedelta(microseconds=int(offset)) for offset in self.graph_finish]
+
+
+def simulate(  # pylint:disable=too-many-arguments
+    graph: CompactTaskGraph,
+    starting_time_of_run: datetime,
+    distributions: Mapping[TaskId, DurationDistribution],
+    number_of_samples: int,
+    *,
+    seed: int | None = None,
+    processes: int = 1,
+    chunk_size: int | None = None,
+) -> ScheduleSimulationResult:
+    """
+    Runs the Monte Carlo simulation on a CompactTaskGraph.
+    The samples are split into chunks (to bound the memory consumption); each chunk draws its durations from its own
+    random stream derived from the seed, so the result only depends on the seed and the chunk size but not on the
+    number of processes the chunks are distributed to.
+    """
+    if chunk_size is None:
+        chunk_size = max(1, _ELEMENTS_PER_CHUNK // max(1, len(graph)))
+    chunk_sizes = [min(chunk_size, number_of_samples - start) for start in range(0, number_of_samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    graph._get_levels("numpy")  # computed once here instead of once per chunk (the graph is sent along with the levels)
+    sampler = _DurationSampler(graph, distributions)
+    release = np.frombuffer(graph.earliest_start, dtype=np.int64)
+    run_start = to_epoch_microseconds(starting_time_of_run)
+    release_offset = np.maximum(np.where(release == NO_EARLIEST_START, run_start, release) - run_start, 0)
+    arguments = (
+        itertools.repeat(graph),
+        itertools.repeat(sampler),
+        itertools.repeat(release_offset),
+        seeds,
+        chunk_sizes,
+    )
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            chunks = list(executor.map(_simulate_chunk, *arguments))
+    else:
+        chunks = list(map(_simulate_chunk, *arguments))
+    critical_counts = np.sum([critical_count for _, critical_count in chunks], axis=0)
+    criticality_index = {
+        task_id: float(critical_counts[index]) / number_of_samples
+        for index, task_id in enumerate(graph.task_ids)
+        if task_id not in (ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE)
+    }
+    return ScheduleSimulationResult(
+        starting_time_of_run, np.concatenate([graph_finish for graph_finish, _ in chunks]), criticality_index
+    )
+
+
+__all__ = ["ScheduleSimulationResult", "simulate"]
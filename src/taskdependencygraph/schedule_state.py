@@ -0,0 +1,303 @@
+"""
+The ScheduleState bundles the results of the scheduling passes through a TaskDependencyGraph.
+"""
+
+import heapq
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+
+from networkx import DiGraph  # type: ignore[import-untyped]
+
+from taskdependencygraph.compact_task_graph import CompactTaskGraph
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.models.task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE
+from taskdependencygraph.topological_order import TopologicalOrder
+
+
+def _compute_earliest_start_of_node(
+    graph: DiGraph, node: TaskId, earliest_start: dict[TaskId, timedelta], starting_time_of_run: datetime
+) -> timedelta:
+    """
+    The earliest start of a node is the latest earliest finish of its direct predecessors; if the task has an
+    earliest_starttime, it may not start before that, either.
+    All predecessors of the node have to be up to date in earliest_start.
+    """
+    task: TaskNode = graph.nodes[node]["domain_model"]
+    result = max(
+        (
+            earliest_start[predecessor_id] + graph.nodes[predecessor_id]["domain_model"].planned_duration
+            for predecessor_id in graph.predecessors(node)
+        ),
+        default=timedelta(0),
+    )
+    if task.earliest_starttime is not None:
+        result = max(result, task.earliest_starttime - starting_time_of_run)
+    return result
+
+
+def _compute_remaining_duration_of_node(
+    graph: DiGraph, node: TaskId, remaining_duration: dict[TaskId, timedelta]
+) -> timedelta:
+    """
+    The remaining duration of a node is its own planned duration plus the longest remaining duration of its direct
+    successors, i.e. the minimal time between the start of the node and the finish of the graph.
+    All successors of the node have to be up to date in remaining_duration.
+    """
+    planned_duration: timedelta = graph.nodes[node]["domain_model"].planned_duration
+    return planned_duration + max(
+        (remaining_duration[successor_id] for successor_id in graph.successors(node)), default=timedelta(0)
+    )
+
+
+class ScheduleState:
+    """
+    Everything the read queries of a TaskDependencyGraph need to know about its schedule: the results of the forward
+    pass (earliest starts) and the backward pass (latest starts) and the critical path.
+
+    The state belongs to one version of the graph. The TaskDependencyGraph bumps its version whenever the graph is
+    modified and tells the state which nodes are affected by the modification (see mark_dirty). On the next read
+    query the state is brought up to date (see update): changes are only propagated through the downstream cone
+    (earliest starts) and the upstream cone (latest starts) of the affected nodes, and the propagation stops wherever
+    a value stays the same.
+    This is an internal helper of the TaskDependencyGraph; it's not meant to be used on its own.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        topological_order: TopologicalOrder,
+        earliest_start: dict[TaskId, timedelta],
+        remaining_duration: dict[TaskId, timedelta],
+    ):
+        self.version = version
+        """
+        the version of the graph this state has been computed for
+        """
+        self.topological_order = topological_order
+        """
+        the topological order of the graph; it's owned (and kept up to date) by the TaskDependencyGraph
+        """
+        self.earliest_start = earliest_start
+        """
+        the earliest start of every node as offset from the start of the run (forward pass)
+        """
+        self.remaining_duration = remaining_duration
+        """
+        the duration between the (latest) start of every node and the finish of the graph (backward pass).
+        We store the remaining duration instead of the latest start, because it doesn't depend on the graph finish;
+        a later graph finish would otherwise shift the latest start of every single node.
+        """
+        self.critical_path: list[TaskId] = []
+        """
+        the ordered task ids on the critical path, including the artificial start and end node
+        """
+        self.critical_path_set: frozenset[TaskId] = frozenset()
+        """
+        the same ids as in critical_path, but for O(1) membership checks
+        """
+        self._number_of_critical_paths: int | None = None
+        self._earliest_start_dirty: set[TaskId] = set()
+        self._remaining_duration_dirty: set[TaskId] = set()
+
+    @classmethod
+    def compute(
+        cls, graph: DiGraph, starting_time_of_run: datetime, version: int, topological_order: TopologicalOrder
+    ) -> "ScheduleState":
+        """
+        Runs a full forward and backward pass (both O(V+E)) through the graph and determines its critical path.
+        The passes run on a CompactTaskGraph, i.e. on integer microseconds in flat arrays instead of timedeltas in the
+        attribute dicts of the networkx graph.
+        """
+        ordered_node_ids = topological_order.ordered_node_ids
+        compact_graph = CompactTaskGraph.from_graph(graph, ordered_node_ids)
+        earliest_start: dict[TaskId, timedelta] = {
+            node: timedelta(microseconds=offset)
+            for node, offset in zip(
+                ordered_node_ids, compact_graph.compute_earliest_starts(starting_time_of_run), strict=True
+            )
+        }
+        remaining_duration: dict[TaskId, timedelta] = {
+            node: timedelta(microseconds=duration)
+            for node, duration in zip(ordered_node_ids, compact_graph.compute_remaining_durations(), strict=True)
+        }
+        result = cls(
+            version=version,
+            topological_order=topological_order,
+            earliest_start=earliest_start,
+            remaining_duration=remaining_duration,
+        )
+        result._update_critical_path(graph, starting_time_of_run)  # pylint:disable=protected-access
+        return result
+
+    @property
+    def graph_finish(self) -> timedelta:
+        """
+        the offset of the finish of the entire graph (which is the earliest start of the artificial end node)
+        """
+        return self.earliest_start[ID_OF_ARTIFICIAL_ENDNODE]
+
+    def latest_start_of(self, task_id: TaskId) -> timedelta:
+        """
+        the latest start of the given node as offset from the start of the run
+        """
+        return self.graph_finish - self.remaining_duration[task_id]
+
+    def remove_node(self, task_id: TaskId) -> None:
+        """
+        Forgets everything about a node that has been removed from the graph.
+        """
+        self.earliest_start.pop(task_id, None)
+        self.remaining_duration.pop(task_id, None)
+        self._earliest_start_dirty.discard(task_id)
+        self._remaining_duration_dirty.discard(task_id)
+
+    def mark_dirty(self, earliest_start_of: Iterable[TaskId], remaining_duration_of: Iterable[TaskId]) -> None:
+        """
+        Marks the earliest start and/or the remaining duration of nodes as outdated, e.g. because one of their direct
+        predecessors/successors changed.
+        """
+        self._earliest_start_dirty.update(earliest_start_of)
+        self._remaining_duration_dirty.update(remaining_duration_of)
+
+    def update(self, graph: DiGraph, starting_time_of_run: datetime, version: int) -> set[TaskId]:
+        """
+        Brings the state up to date with the given version of the graph by propagating the changes of the dirty nodes.
+        Returns the ids of all nodes whose earliest start has been re-evaluated.
+        """
+        evaluated = self._propagate_earliest_start(graph, starting_time_of_run)
+        self._propagate_remaining_duration(graph)
+        self._update_critical_path(graph, starting_time_of_run)
+        self._number_of_critical_paths = None
+        self.version = version
+        return evaluated
+
+    def _propagate_earliest_start(self, graph: DiGraph, starting_time_of_run: datetime) -> set[TaskId]:
+        """
+        Re-evaluates the dirty nodes and their descendants in topological order, but only as far as the earliest
+        start actually changes. Every node is evaluated at most once, because all of its predecessors have a lower
+        rank and are hence final when the node is popped from the heap.
+        """
+        rank = self.topological_order.rank
+        heap = [(rank[node], node) for node in self._earliest_start_dirty]
+        heapq.heapify(heap)
+        queued: set[TaskId] = set(self._earliest_start_dirty)
+        self._earliest_start_dirty = set()
+        while heap:
+            _, node = heapq.heappop(heap)
+            new_earliest_start = _compute_earliest_start_of_node(graph, node, self.earliest_start, starting_time_of_run)
+            if self.earliest_start.get(node) == new_earliest_start:
+                continue
+            self.earliest_start[node] = new_earliest_start
+            for successor_id in graph.successors(node):
+                if successor_id not in queued:
+                    queued.add(successor_id)
+                    heapq.heappush(heap, (rank[successor_id], successor_id))
+        return queued
+
+    def _propagate_remaining_duration(self, graph: DiGraph) -> None:
+        """
+        Re-evaluates the dirty nodes and their ancestors in reverse topological order, but only as far as the
+        remaining duration actually changes.
+        """
+        rank = self.topological_order.rank
+        heap = [(-rank[node], node) for node in self._remaining_duration_dirty]
+        heapq.heapify(heap)
+        queued: set[TaskId] = set(self._remaining_duration_dirty)
+        self._remaining_duration_dirty = set()
+        while heap:
+            _, node = heapq.heappop(heap)
+            new_remaining_duration = _compute_remaining_duration_of_node(graph, node, self.remaining_duration)
+            if self.remaining_duration.get(node) == new_remaining_duration:
+                continue
+            self.remaining_duration[node] = new_remaining_duration
+            for predecessor_id in graph.predecessors(node):
+                if predecessor_id not in queued:
+                    queued.add(predecessor_id)
+                    heapq.heappush(heap, (-rank[predecessor_id], predecessor_id))
+
+    def critical_predecessors_of(
+        self, graph: DiGraph, starting_time_of_run: datetime, node: TaskId
+    ) -> Iterator[TaskId]:
+        """
+        Yields the direct predecessors (in graph insertion order) that determine the earliest start of the node, i.e.
+        those that finish exactly when the node starts. If the earliest start of the node is determined by its own
+        earliest_starttime, all predecessors that finish before it are yielded, too: then the path continues through
+        the predecessors although they have slack.
+        """
+        task: TaskNode = graph.nodes[node]["domain_model"]
+        release: timedelta | None = (
+            task.earliest_starttime - starting_time_of_run if task.earliest_starttime is not None else None
+        )
+        for predecessor_id in graph.predecessors(node):
+            predecessor_finish = (
+                self.earliest_start[predecessor_id] + graph.nodes[predecessor_id]["domain_model"].planned_duration
+            )
+            if release is not None:
+                predecessor_finish = max(predecessor_finish, release)
+            if predecessor_finish == self.earliest_start[node]:
+                yield predecessor_id
+
+    def _update_critical_path(self, graph: DiGraph, starting_time_of_run: datetime) -> None:
+        """
+        Walks back from the artificial end node to the artificial start node. At each node it follows the first
+        (in graph insertion order) of its critical predecessors (see critical_predecessors_of).
+        This costs O(sum of the in-degrees along the path).
+        """
+        path: list[TaskId] = [ID_OF_ARTIFICIAL_ENDNODE]
+        node = ID_OF_ARTIFICIAL_ENDNODE
+        while node != ID_OF_ARTIFICIAL_STARTNODE:
+            predecessor_id = next(self.critical_predecessors_of(graph, starting_time_of_run, node), None)
+            if predecessor_id is None:  # pragma: no cover
+                raise RuntimeError(f"No predecessor of {node} determines its earliest start — this is a bug")
+            node = predecessor_id
+            path.append(node)
+        path.reverse()
+        self.critical_path = path
+        self.critical_path_set = frozenset(path)
+
+    def iter_critical_paths(self, graph: DiGraph, starting_time_of_run: datetime) -> Iterator[list[TaskId]]:
+        """
+        Lazily yields all critical paths (from the artificial start node to the artificial end node).
+        The paths are enumerated by a depth-first search backwards from the end node over the critical predecessors;
+        as every node but the start node has at least one critical predecessor, each branch of the search ends in a
+        path, so yielding the next path costs O(sum of the in-degrees along the path), no matter how many paths there
+        are. The first path is the critical_path.
+        """
+        reversed_path: list[TaskId] = [ID_OF_ARTIFICIAL_ENDNODE]
+        stack: list[Iterator[TaskId]] = [
+            self.critical_predecessors_of(graph, starting_time_of_run, ID_OF_ARTIFICIAL_ENDNODE)
+        ]
+        while stack:
+            predecessor_id = next(stack[-1], None)
+            if predecessor_id is None:
+                stack.pop()
+                reversed_path.pop()
+            elif predecessor_id == ID_OF_ARTIFICIAL_STARTNODE:
+                yield [predecessor_id, *reversed(reversed_path)]
+            else:
+                reversed_path.append(predecessor_id)
+                stack.append(self.critical_predecessors_of(graph, starting_time_of_run, predecessor_id))
+
+    def count_critical_paths(self, graph: DiGraph, starting_time_of_run: datetime) -> int:
+        """
+        Returns the number of critical paths without enumerating them: one pass in topological order sums up the
+        number of critical paths from the start node to each node over its critical predecessors, O(V+E).
+        The result is cached until the next update.
+        """
+        if self._number_of_critical_paths is None:
+            number_of_paths: dict[TaskId, int] = {}
+            for node in self.topological_order.ordered_node_ids:
+                if node == ID_OF_ARTIFICIAL_STARTNODE:
+                    number_of_paths[node] = 1
+                else:
+                    number_of_paths[node] = sum(
+                        number_of_paths[predecessor_id]
+                        for predecessor_id in self.critical_predecessors_of(graph, starting_time_of_run, node)
+                    )
+            self._number_of_critical_paths = number_of_paths[ID_OF_ARTIFICIAL_ENDNODE]
+        return self._number_of_critical_paths
+
+
+__all__ = ["ScheduleState"]
@@ -0,0 +1,222 @@
+"""
+Notifications shortly before the planned start of tasks: the timers of all tasks are kept in one heap, so that only
+the timers of tasks whose start moves have to be touched.
+"""
+
+import asyncio
+import heapq
+from collections.abc import Callable, Iterable, Sequence
+from datetime import UTC, datetime, timedelta
+
+from taskdependencygraph.models.forecast_entry import ForecastEntry
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.start_notification import StartNotification
+from taskdependencygraph.models.task_execution_status import TaskExecutionStatus
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.models.task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+_NOT_STARTED_STATUSES = (None, TaskExecutionStatus.NOT_YET_REQUESTED, TaskExecutionStatus.REQUESTED)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _is_started(task: TaskNode) -> bool:
+    return task.actual_starttime is not None or task.execution_status not in _NOT_STARTED_STATUSES
+
+
+class StartNotifier:  # pylint:disable=too-many-instance-attributes
+    """
+    Calls notify with a StartNotification whenever a task is due to start within one of the lead_times, e.g. 60 and
+    15 minutes before its planned start; notify is where the assignee is pinged (slack_id, email, ...).
+
+    Every task has one timer per lead time. All timers are kept in one heap ordered by the moment they fire, so
+    (re)scheduling a task costs O(L log n) for L lead times and n pending timers. The timers of a task whose start
+    moves are not searched for in the heap, but outdated: they're skipped when they reach the top of the heap (and
+    dropped for good once they make up the majority of the heap).
+
+    * schedule_planned_starts arms the timers of all tasks from the plan of the graph
+    * reschedule moves the timers of the tasks whose forecast changed; it can be passed as publish callback to the
+      StatusEventIngestor, so that only the affected timers are touched
+    * fire_due fires all timers that are due at a given moment; run does so in an asyncio loop, based on clock
+
+    If several timers of a task are already overdue when the task is (re)scheduled, only the one with the shortest
+    lead time fires (at once); timers that already fired don't fire again unless the start moves behind them.
+    Tasks that started (or are completed/obsolete) or have been removed from the graph when their timer fires are
+    skipped, as are tasks whose start lies in the past.
+    """
+
+    def __init__(
+        self,
+        graph: TaskDependencyGraph,
+        notify: Callable[[StartNotification], object],
+        *,
+        lead_times: Sequence[timedelta] = (timedelta(minutes=15),),
+        clock: Callable[[], datetime] = _utc_now,
+    ):
+        if not lead_times:
+            raise ValueError("At least one lead time is required")
+        if any(lead_time < timedelta(0) for lead_time in lead_times):
+            raise ValueError(f"The lead times must not be negative, but were {list(lead_times)}")
+        self._graph = graph
+        self._nodes = graph.get_digraph_view().nodes
+        self._notify = notify
+        self._lead_times = sorted(set(lead_times), reverse=True)  # the longest lead time (i.e. first timer) first
+        self._clock = clock
+        self._planned_start: dict[TaskId, datetime] = {}
+        self._generation: dict[TaskId, int] = {}  # bumped whenever the start of a task moves
+        self._pending: dict[TaskId, set[int]] = {}  # the indexes of the lead times that haven't fired yet
+        self._number_of_pending_timers = 0
+        self._heap: list[tuple[datetime, int, TaskId, int]] = []  # (fires at, lead time index, task, generation)
+        self._wakeup: asyncio.Event | None = None
+        self._is_stopped = False
+
+    @property
+    def number_of_pending_timers(self) -> int:
+        """
+        the number of timers that haven't fired yet
+        """
+        return self._number_of_pending_timers
+
+    def _is_pending(self, entry: tuple[datetime, int, TaskId, int]) -> bool:
+        _, lead_time_index, task_id, generation = entry
+        return self._generation.get(task_id) == generation and lead_time_index in self._pending[task_id]
+
+    def schedule(self, task_id: TaskId, planned_start: datetime) -> None:
+        """
+        (Re)arms the timers of a task that starts at planned_start; nothing happens if the start didn't change.
+        """
+        previous_start = self._planned_start.get(task_id)
+        if previous_start == planned_start:
+            return
+        now = self._clock()
+        previous_pending = self._pending.pop(task_id, set())
+        self._number_of_pending_timers -= len(previous_pending)
+        generation = self._generation.get(task_id, -1) + 1
+        self._generation[task_id] = generation
+        self._planned_start[task_id] = planned_start
+        pending: set[int] = set()
+        overdue: int | None = None
+        if planned_start >= now:
+            for index, lead_time in enumerate(self._lead_times):
+                fires_at = planned_start - lead_time
+                if fires_at > now:
+                    pending.add(index)
+                    heapq.heappush(self._heap, (fires_at, index, task_id, generation))
+                elif previous_start is None or index in previous_pending:
+                    overdue = index  # the lead times are sorted, so the shortest overdue lead time wins
+            if overdue is not None:
+                pending.add(overdue)
+                heapq.heappush(self._heap, (now, overdue, task_id, generation))
+        self._pending[task_id] = pending
+        self._number_of_pending_timers += len(pending)
+        self._compact()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def schedule_planned_starts(self) -> None:
+        """
+        Arms the timers of all tasks of the graph from their planned start (see
+        TaskDependencyGraph.calculate_planned_starting_time_of_task).
+        """
+        for task_id in self._nodes:
+            if task_id not in (ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE):
+                self.schedule(task_id, self._graph.calculate_planned_starting_time_of_task(task_id))
+
+    def reschedule(self, entries: Iterable[ForecastEntry]) -> None:
+        """
+        Moves the timers of the tasks whose forecast changed (see TaskDependencyGraph.update_forecast).
+        """
+        for entry in entries:
+            self.schedule(entry.task_id, entry.forecast_start)
+
+    def cancel(self, task_id: TaskId) -> None:
+        """
+        Disarms all timers of a task.
+        """
+        self._number_of_pending_timers -= len(self._pending.pop(task_id, set()))
+        self._generation.pop(task_id, None)
+        self._planned_start.pop(task_id, None)
+        self._compact()
+
+    def _compact(self) -> None:
+        """
+        Drops the outdated entries from the heap once they make up the majority of it; O(n) amortized over the
+        modifications that outdated them.
+        """
+        if len(self._heap) > 2 * self._number_of_pending_timers + 64:
+            self._heap = [entry for entry in self._heap if self._is_pending(entry)]
+            heapq.heapify(self._heap)
+
+    def get_next_firing_time(self) -> datetime | None:
+        """
+        Returns the moment the next pending timer fires (None if there is none).
+        """
+        while self._heap and not self._is_pending(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def fire_due(self, now: datetime | None = None) -> list[StartNotification]:
+        """
+        Fires all timers that are due at now (the current time of the clock by default), in the order of their firing
+        times, and returns the resulting notifications.
+        """
+        if now is None:
+            now = self._clock()
+        notifications: list[StartNotification] = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_pending(entry):
+                continue
+            _, lead_time_index, task_id, _ = entry
+            self._pending[task_id].discard(lead_time_index)
+            self._number_of_pending_timers -= 1
+            if task_id not in self._nodes:
+                continue
+            task: TaskNode = self._nodes[task_id]["domain_model"]
+            if _is_started(task):
+                continue
+            notification = StartNotification(
+                task=task, planned_start=self._planned_start[task_id], lead_time=self._lead_times[lead_time_index]
+            )
+            self._notify(notification)
+            notifications.append(notification)
+        return notifications
+
+    async def run(self) -> None:
+        """
+        Fires the timers when they're due until stop is called. The loop sleeps until the next timer fires and is
+        woken up early whenever a task is (re)scheduled.
+        If stop has been called before run started (e.g. before the task running it has been scheduled), run returns
+        at once; afterward, the notifier can be run again.
+        """
+        self._wakeup = asyncio.Event()
+        try:
+            while not self._is_stopped:
+                self._wakeup.clear()
+                self.fire_due()
+                next_firing_time = self.get_next_firing_time()
+                timeout = None
+                if next_firing_time is not None:
+                    timeout = max((next_firing_time - self._clock()).total_seconds(), 0.0)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+            self._is_stopped = False
+
+    def stop(self) -> None:
+        """
+        Makes run return (or the next call of run, if it's not running yet).
+        """
+        self._is_stopped = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+
+__all__ = ["StartNotifier"]
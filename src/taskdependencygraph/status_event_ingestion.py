@@ -0,0 +1,151 @@
+"""
+Ingestion of live task status events: bursts of events are coalesced and applied to the graph in one batch, and only
+the changed forecast entries are published.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from taskdependencygraph.models.forecast_entry import ForecastEntry
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_status_event import TaskStatusEvent
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+_logger = logging.getLogger(__name__)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+class StatusEventIngestor:  # pylint:disable=too-many-instance-attributes
+    """
+    Applies a stream of TaskStatusEvents to a TaskDependencyGraph and publishes the resulting forecast changes.
+
+    Events that arrive within the coalescing_window (measured from the first event of a burst) are coalesced: all
+    events of the same task are merged (later events win) and all tasks are updated in one batch, followed by one
+    incremental reforecast (see TaskDependencyGraph.update_forecast). publish is then called with the forecast
+    entries that changed, if any. A burst is cut off after max_batch_size events, which bounds the latency.
+
+    The forecast is made at the current time (as returned by clock), rounded down to the status_date_resolution
+    (relative to the start of the run): within the same resolution step, each burst only re-evaluates the downstream
+    cone of the updated tasks; a new step requires one full forecast pass.
+    Updates that can't be applied (e.g. unknown tasks or an actual finish before the actual start) are skipped and
+    passed to on_rejected (logged as warning by default); they don't affect the other updates of the burst.
+    """
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        graph: TaskDependencyGraph,
+        publish: Callable[[list[ForecastEntry]], object],
+        *,
+        coalescing_window: timedelta = timedelta(milliseconds=50),
+        max_batch_size: int = 10_000,
+        status_date_resolution: timedelta = timedelta(minutes=1),
+        clock: Callable[[], datetime] = _utc_now,
+        on_rejected: Callable[[TaskId, str], object] | None = None,
+    ):
+        if coalescing_window < timedelta(0):
+            raise ValueError(f"The coalescing_window must not be negative, but was {coalescing_window}")
+        if max_batch_size < 1:
+            raise ValueError(f"The max_batch_size must be at least 1, but was {max_batch_size}")
+        if status_date_resolution <= timedelta(0):
+            raise ValueError(f"The status_date_resolution must be positive, but was {status_date_resolution}")
+        self._graph = graph
+        self._publish = publish
+        self._coalescing_window = coalescing_window.total_seconds()
+        self._max_batch_size = max_batch_size
+        self._status_date_resolution = status_date_resolution
+        self._clock = clock
+        self._on_rejected = on_rejected
+        self._pending_changes: dict[TaskId, dict[str, Any]] = {}
+        self._number_of_pending_events = 0
+
+    def _add(self, event: TaskStatusEvent) -> None:
+        self._pending_changes.setdefault(event.task_id, {}).update(event.changes)
+        self._number_of_pending_events += 1
+
+    def _reject(self, task_id: TaskId, error_message: str) -> None:
+        if self._on_rejected is None:
+            _logger.warning("Skipped the status update of task %s: %s", task_id, error_message)
+        else:
+            self._on_rejected(task_id, error_message)
+
+    def _get_status_date(self) -> datetime:
+        starting_time_of_run = self._graph.starting_time_of_run
+        steps = (self._clock() - starting_time_of_run) // self._status_date_resolution
+        return starting_time_of_run + steps * self._status_date_resolution
+
+    def flush(self) -> list[ForecastEntry]:
+        """
+        Applies the pending (coalesced) events in one batch, reforecasts and publishes the changed forecast entries.
+        Returns the published entries (an empty list, if nothing changed; then publish is not called).
+        """
+        pending_changes = self._pending_changes
+        self._pending_changes = {}
+        self._number_of_pending_events = 0
+        with self._graph.batch():
+            for task_id, changes in pending_changes.items():
+                check_result = self._graph.can_task_be_updated(task_id, **changes)
+                if not check_result.can_be_updated:
+                    self._reject(task_id, check_result.error_message or "")
+                    continue
+                self._graph.update_task(task_id, **changes)
+        entries = self._graph.update_forecast(self._get_status_date())
+        if entries:
+            self._publish(entries)
+        return entries
+
+    def ingest(self, events: Iterable[TaskStatusEvent]) -> None:
+        """
+        Consumes a (synchronous) stream of events until it's exhausted.
+        The coalescing window is checked whenever an event arrives; the remaining events are applied at the end.
+        """
+        burst_started_at = 0.0
+        for event in events:
+            if self._number_of_pending_events == 0:
+                burst_started_at = time.monotonic()
+            self._add(event)
+            if (
+                self._number_of_pending_events >= self._max_batch_size
+                or time.monotonic() - burst_started_at >= self._coalescing_window
+            ):
+                self.flush()
+        if self._number_of_pending_events:
+            self.flush()
+
+    async def run(self, queue: "asyncio.Queue[TaskStatusEvent | None]") -> None:
+        """
+        Consumes events from an asyncio queue until it receives None. A burst is applied as soon as its coalescing
+        window has passed (or it reached max_batch_size), even if no further event arrives.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            event = await queue.get()
+            if event is None:
+                return
+            self._add(event)
+            deadline = loop.time() + self._coalescing_window
+            is_stopped = False
+            while self._number_of_pending_events < self._max_batch_size and not is_stopped:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if event is None:
+                    is_stopped = True
+                else:
+                    self._add(event)
+            self.flush()
+            if is_stopped:
+                return
+
+
+__all__ = ["StatusEventIngestor"]
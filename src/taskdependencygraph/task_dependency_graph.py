@@ -9,17 +9,27 @@ TaskDependencyGraph
 # pylint:disable=too-many-lines
 # pylint:disable=too-many-public-methods
 import copy
+import heapq
+import itertools
 import uuid
-from collections.abc import Mapping
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from itertools import pairwise
-from typing import Literal
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
 
 import networkx as nx  # type: ignore[import-untyped]
-from networkx import DiGraph, dag_longest_path, dag_longest_path_length
-from pydantic import AwareDatetime
+from networkx import DiGraph
+from pydantic import AwareDatetime, ValidationError
 
+from taskdependencygraph.calendar_index import CalendarAwareSchedule, CalendarIndex
+from taskdependencygraph.compact_task_graph import CompactTaskGraph
+from taskdependencygraph.forecast_state import ForecastState
+from taskdependencygraph.longest_paths import iter_longest_paths
 from taskdependencygraph.models.delay_impact import DelayImpact
+from taskdependencygraph.models.duration_distribution import DurationDistribution
+from taskdependencygraph.models.forecast_entry import ForecastEntry
+from taskdependencygraph.models.graph_change import AddEdge, AddTask, GraphChange, RemoveEdge, RemoveTask, UpdateTask
+from taskdependencygraph.models.graph_definition import GraphDefinition
 from taskdependencygraph.models.graph_definition_validation import (
     GraphDefinitionValidationFinding,
     GraphDefinitionValidationResult,
@@ -27,6 +37,7 @@ from taskdependencygraph.models.graph_definition_validation import (
 )
 from taskdependencygraph.models.ids import TaskDependencyId, TaskId
 from taskdependencygraph.models.mermaid_gantt_config import MermaidGanttConfig
+from taskdependencygraph.models.ranked_path import RankedPath
 from taskdependencygraph.models.schedule_report import ScheduleEntry, ScheduleReport
 from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
 from taskdependencygraph.models.task_dependency_update import (
@@ -34,16 +45,45 @@ from taskdependencygraph.models.task_dependency_update import (
     AddNodeToGraphPreviewResponse,
     RemoveEdgeFromGraphPreviewResponse,
     RemoveNodeFromGraphPreviewResponse,
+    UpdateNodeInGraphPreviewResponse,
 )
 from taskdependencygraph.models.task_node import TaskNode
 from taskdependencygraph.models.task_node_as_artificial_endnode import task_node_as_artificial_endnode
 from taskdependencygraph.models.task_node_as_artificial_startnode import task_node_as_artificial_startnode
+from taskdependencygraph.models.working_calendar import WorkingCalendar
+from taskdependencygraph.ready_set import ReadySet
+from taskdependencygraph.resource_leveling import ResourceLeveledSchedule
+from taskdependencygraph.schedule_state import ScheduleState
+from taskdependencygraph.topological_order import TopologicalOrder
+
+if TYPE_CHECKING:
+    from taskdependencygraph.schedule_simulation import ScheduleSimulationResult
 
 _ARTIFICIAL_NODE_IDS: frozenset[TaskId] = frozenset(
     {task_node_as_artificial_startnode.id, task_node_as_artificial_endnode.id}
 )
 
 
+class _RenderSnapshot(NamedTuple):
+    """
+    everything the exporters (labels, to_dot, to_mermaid_gantt) need to know about the schedule.
+    It's computed once per export instead of once per task.
+    """
+
+    node_ids: list[TaskId]
+    """
+    all node ids in export order: the real tasks in insertion order, followed by the artificial end and start node
+    """
+    critical_path: frozenset[TaskId]
+    """
+    the ids of all nodes on the critical path
+    """
+    labels: dict[TaskId, str]
+    """
+    the label text of every node (see TaskDependencyGraph._get_label_text)
+    """
+
+
 class TaskDependencyGraph:
     """
     This class is a wrapper around a directed graph. This means, that in this digraph class instances are instantiated,
@@ -241,8 +281,12 @@ class TaskDependencyGraph:
         """
         di_graph = nx.DiGraph()
         self._graph = di_graph  # The digraph is a protected attribute of the task dependency graph
+        # the indexes are kept up to date by all methods that add or remove nodes/edges (incl. the artificial ones)
+        self._external_id_index: dict[str, TaskId] = {}
+        self._edge_index: dict[TaskDependencyId, tuple[TaskId, TaskId]] = {}
         for task in task_list:
             di_graph.add_node(task.id, domain_model=task)
+            self._external_id_index[task.external_id] = task.id
         # As the task_instance.id, is the key in the resulting dictionary;
         # the edges need to link the task_instance.ids (and not the task_instances themselves).
         for edge in dependency_list:
@@ -252,9 +296,20 @@ class TaskDependencyGraph:
                 weight=self._graph.nodes[edge.task_predecessor]["domain_model"].planned_duration.total_seconds() / 60,
                 domain_model=edge,
             )
+            self._edge_index[edge.id] = (edge.task_predecessor, edge.task_successor)
         self._starting_time_of_run = starting_time_of_run
+        self._version = 0  # bumped with every modification of the graph; the schedule state is re-computed lazily
+        self._topological_order: TopologicalOrder | None = None  # sorted lazily, afterward maintained incrementally
+        self._schedule_state: ScheduleState | None = None
+        self._forecast_state: ForecastState | None = None  # the forecast of the most recently queried status date
+        self._ready_set: ReadySet | None = None  # built lazily, afterward maintained incrementally
+        # inside a batch, the inverse of every modification is logged, and the affected nodes are only collected
+        self._undo_log: list[Callable[[], object]] | None = None
+        # per (nested) batch: the dicts of the networkx graph whose order has already been logged (see _log_order_of)
+        self._logged_orders: list[set[tuple[str, TaskId | None]]] = []
+        self._pending_earliest_start_of: set[TaskId] = set()
+        self._pending_remaining_duration_of: set[TaskId] = set()
         self._add_artificial_nodes_and_edges()
-        self._account_for_earliest_start()
 
     def _add_artificial_endnodes_and_edges(self) -> None:
         r"""
@@ -299,17 +354,9 @@ class TaskDependencyGraph:
             if not any(DiGraph.successors(self._graph, task_without_successor))
         ]
         self._graph.add_node(task_node_as_artificial_endnode.id, domain_model=task_node_as_artificial_endnode)
+        self._external_id_index[task_node_as_artificial_endnode.external_id] = task_node_as_artificial_endnode.id
         for artificial_edge in artificial_dependency_list:
-            self._graph.add_edge(
-                artificial_edge[0],
-                artificial_edge[1],
-                weight=self._graph.nodes[artificial_edge[0]]["domain_model"].planned_duration.total_seconds() / 60,
-                domain_model=TaskDependencyEdge(
-                    id=TaskDependencyId(uuid.uuid4()),
-                    task_predecessor=artificial_edge[0],
-                    task_successor=artificial_edge[1],
-                ),
-            )
+            self._add_artificial_edge(*artificial_edge)
 
     def _add_artificial_startnode_and_edges(self) -> None:
         r"""
@@ -352,88 +399,288 @@ class TaskDependencyGraph:
             if not any(DiGraph.predecessors(self._graph, task_without_predecessor))
         ]
         self._graph.add_node(task_node_as_artificial_startnode.id, domain_model=task_node_as_artificial_startnode)
+        self._external_id_index[task_node_as_artificial_startnode.external_id] = task_node_as_artificial_startnode.id
         for artificial_edge in artificial_dependency_list:
-            self._graph.add_edge(
-                artificial_edge[0],
-                artificial_edge[1],
-                weight=0,
-                domain_model=TaskDependencyEdge(
-                    id=TaskDependencyId(uuid.uuid4()),
-                    task_predecessor=artificial_edge[0],
-                    task_successor=artificial_edge[1],
-                ),
-            )
+            self._add_artificial_edge(*artificial_edge)
 
     def _add_artificial_nodes_and_edges(self) -> None:
         """
         This method adds the artificial startnode and endnode and their edges to the task dependency graph.
+        It's only called once, on initialization. Afterward, the artificial edges are kept up to date by
+        _rewire_artificial_edges.
         """
         self._add_artificial_endnodes_and_edges()
         self._add_artificial_startnode_and_edges()
 
-    def _remove_artificial_nodes_and_edges(self) -> None:
+    def _add_artificial_edge(self, predecessor_id: TaskId, successor_id: TaskId) -> None:
         """
-        This method removes the artificial startnode and endnode and their edges from the task dependency graph.
+        Adds an edge from the artificial startnode or to the artificial endnode.
+        The id of the edge is a name based UUID (namespace: id of the artificial node, name: id of the task), so
+        re-wiring the same task always results in the same, stable edge id and no fresh uuid4 is needed. As both
+        endpoints are known to be valid, the pydantic validation of the edge is skipped, too.
         """
-        # see networkx docs: if we remove a node, all edges connected to it are removed as well
-        self._graph.remove_node(task_node_as_artificial_startnode.id)
-        self._graph.remove_node(task_node_as_artificial_endnode.id)
+        if predecessor_id == task_node_as_artificial_startnode.id:
+            edge_id = TaskDependencyId(uuid.uuid5(predecessor_id, str(successor_id)))
+        else:
+            edge_id = TaskDependencyId(uuid.uuid5(successor_id, str(predecessor_id)))
+        self._graph.add_edge(
+            predecessor_id,
+            successor_id,
+            weight=self._graph.nodes[predecessor_id]["domain_model"].planned_duration.total_seconds() / 60,
+            domain_model=TaskDependencyEdge.model_construct(
+                id=edge_id, task_predecessor=predecessor_id, task_successor=successor_id
+            ),
+        )
+        self._edge_index[edge_id] = (predecessor_id, successor_id)
 
-    def _stretch_edges_with_successor_that_has_fixed_start(self) -> None:
+    def _remove_edge(self, predecessor_id: TaskId, successor_id: TaskId) -> None:
         """
-        extends the duration of those tasks, which have a successor with the earliest possible start set.
-        Ideally, this should only be called if the edges are reset with self._reset_edges().
-        Use self._account_for_earliest_start() to ensure this.
+        Removes an (artificial or real) edge from the graph and the edge index.
         """
-        # Assume there are tasks A-->B-->C.
-        # If B has an earliest possible start, then the weight of the edge between A and B has to be stretched to
-        # account for the earliest possible start of B.
-        # The stretch amount is defined by the difference between A's actual duration and the earliest start of B.
-        # But if A itself is already delayed, then the stretch amount is defined by the difference between the actual
-        # start.
-        # The stretch amount/buffer length is returned by self._get_duration_or_buffer_length(...)
-        for task_id in nx.topological_sort(self._graph):
-            task = self._graph.nodes[task_id]["domain_model"]
-            if task.earliest_starttime is not None:
-                for predecessor_id in self._graph.predecessors(task.id):
-                    # For this to work, it's important that we always start the iteration at the start node.
-                    # Otherwise, the results from get_pseudo_duration might not account for the earliest start
-                    # (of predecessors) yet.
-                    # In other words: All tasks and respective edges, which are taken into consideration in
-                    # _get_pseudo_duration have to have their weights adjusted already.
-                    # This is guaranteed by the topological sort.
-                    self._graph.edges[predecessor_id, task_id]["weight"] = (
-                        self._get_duration_or_buffer_length(predecessor_id, task_id).total_seconds() / 60
-                    )
+        self._log_order_of("succ", predecessor_id)
+        self._log_order_of("pred", successor_id)
+        del self._edge_index[self._graph.edges[predecessor_id, successor_id]["domain_model"].id]
+        self._graph.remove_edge(predecessor_id, successor_id)
 
-    def _reset_edges(self) -> None:
+    def _rewire_artificial_edges(self, task_ids: Collection[TaskId]) -> tuple[list[TaskId], list[TaskId]]:
         """
-        (Re)sets the edge weights to the duration of the predecessor task.
-        Does _not_ consider the earliest possible starts.
-        This is used to reset the edge weights after nodes or edges have been modified.
+        Connects each of the given (real) tasks to the artificial startnode (endnode) iff the task has no other
+        predecessors (successors) and disconnects it otherwise.
+        Only the tasks whose in- or out-degree may have crossed zero need to be passed; all other tasks are untouched.
+        Returns the ids of the nodes whose earliest start and the ids of the nodes whose remaining duration is affected
+        by the re-wiring.
         """
-        for edge in self._graph.edges:
-            predecessor_id = edge[0]
-            self._graph.edges[edge]["weight"] = (
-                self._graph.nodes[predecessor_id]["domain_model"].planned_duration.total_seconds() / 60
+        earliest_start_of: list[TaskId] = []
+        remaining_duration_of: list[TaskId] = []
+        for task_id in task_ids:
+            predecessors = self._graph.pred[task_id]
+            if not predecessors:
+                self._add_artificial_edge(task_node_as_artificial_startnode.id, task_id)
+            elif len(predecessors) > 1 and task_node_as_artificial_startnode.id in predecessors:
+                self._remove_edge(task_node_as_artificial_startnode.id, task_id)
+            else:
+                continue
+            earliest_start_of.append(task_id)
+            remaining_duration_of.append(task_node_as_artificial_startnode.id)
+        for task_id in task_ids:
+            successors = self._graph.succ[task_id]
+            if not successors:
+                self._add_artificial_edge(task_id, task_node_as_artificial_endnode.id)
+            elif len(successors) > 1 and task_node_as_artificial_endnode.id in successors:
+                self._remove_edge(task_id, task_node_as_artificial_endnode.id)
+            else:
+                continue
+            earliest_start_of.append(task_node_as_artificial_endnode.id)
+            remaining_duration_of.append(task_id)
+        return earliest_start_of, remaining_duration_of
+
+    def _invalidate_schedule(
+        self, earliest_start_of: Iterable[TaskId] = (), remaining_duration_of: Iterable[TaskId] = ()
+    ) -> None:
+        """
+        Marks the schedule state as outdated. This has to be called after every modification of the graph.
+        The earliest starts of the nodes in earliest_start_of and the remaining durations of the nodes in
+        remaining_duration_of are affected by the modification; the changes are propagated from there on the next read
+        query. Nothing is re-computed before a read query needs it.
+        """
+        self._version += 1
+        if self._undo_log is not None:
+            self._pending_earliest_start_of.update(earliest_start_of)
+            self._pending_remaining_duration_of.update(remaining_duration_of)
+        else:
+            earliest_start_of = list(earliest_start_of)
+            if self._schedule_state is not None:
+                self._schedule_state.mark_dirty(earliest_start_of, remaining_duration_of)
+            if self._forecast_state is not None:
+                self._forecast_state.mark_dirty(earliest_start_of)
+
+    def _flush_pending_invalidations(self) -> None:
+        """
+        Hands the nodes that have been affected by the modifications of a batch over to the schedule (and forecast)
+        state. If a large part of the graph is affected, the state is dropped instead: computing it from scratch is
+        cheaper than propagating the changes one by one.
+        """
+        earliest_start_of = {n for n in self._pending_earliest_start_of if n in self._graph}
+        if self._schedule_state is not None:
+            remaining_duration_of = {n for n in self._pending_remaining_duration_of if n in self._graph}
+            if len(earliest_start_of) + len(remaining_duration_of) > self._graph.number_of_nodes() // 2:
+                self._schedule_state = None
+            else:
+                self._schedule_state.mark_dirty(earliest_start_of, remaining_duration_of)
+        if self._forecast_state is not None:
+            if len(earliest_start_of) > self._graph.number_of_nodes() // 2:
+                self._forecast_state.is_outdated = True
+            else:
+                self._forecast_state.mark_dirty(earliest_start_of)
+        self._pending_earliest_start_of = set()
+        self._pending_remaining_duration_of = set()
+
+    def _get_ordered_dict(self, kind: str, node_id: TaskId | None) -> dict[Any, Any]:
+        """
+        Returns one of the dicts networkx stores the graph in: the node dict (kind "node"), the successor (kind "succ")
+        or predecessor (kind "pred") adjacency dict of all nodes (node_id None) or the one of a single node.
+        """
+        # pylint:disable=protected-access
+        if kind == "node":
+            result: dict[Any, Any] = self._graph._node
+        else:
+            result = self._graph._succ if kind == "succ" else self._graph._pred
+        return result if node_id is None else result[node_id]
+
+    def _log_order_of(self, kind: str, node_id: TaskId | None = None) -> None:
+        """
+        Inside a batch, logs how to restore the order of a dict of the networkx graph (see _get_ordered_dict); this has
+        to be called before a key is removed from it. The iteration order of the graph determines the order of the
+        exports and which of several tied critical paths is reported; undoing a removal re-inserts the key at the end,
+        so the order is restored explicitly after the inverse modifications. Only the first removal from each dict per
+        batch is logged.
+        """
+        if self._undo_log is None or (kind, node_id) in self._logged_orders[-1]:
+            return
+        self._logged_orders[-1].add((kind, node_id))
+        order = list(self._get_ordered_dict(kind, node_id))
+
+        def _restore_order() -> None:
+            # keys that the modification added before the snapshot was taken have been removed again by its inverse
+            ordered_dict = self._get_ordered_dict(kind, node_id)
+            items = [(key, ordered_dict[key]) for key in order if key in ordered_dict]
+            ordered_dict.clear()
+            ordered_dict.update(items)
+
+        self._record_undo(_restore_order)
+
+    def _record_undo(self, undo: Callable[[], object]) -> None:
+        """
+        Logs the inverse of a modification, if the modification is part of a batch (see batch).
+        """
+        if self._undo_log is not None:
+            self._undo_log.append(undo)
+
+    @contextmanager
+    def batch(self) -> Iterator["TaskDependencyGraph"]:
+        """
+        Groups modifications of the graph into one transaction:
+
+            with tdg.batch():
+                tdg.add_task(...)
+                tdg.add_edge(...)
+
+        Every modification is still validated against the current (staged) state of the graph, but the schedule
+        maintenance is deferred until the batch is left: the schedule is then brought up to date once (on the next read
+        query) instead of after each single modification.
+        If an exception is raised inside the batch, all modifications of the batch are rolled back (including the order
+        in which the tasks and dependencies are iterated), and the exception is re-raised.
+        Batches may be nested; a failing inner batch only rolls back its own modifications.
+        """
+        is_outermost_batch = self._undo_log is None
+        undo_log: list[Callable[[], object]] = [] if self._undo_log is None else self._undo_log
+        self._undo_log = undo_log
+        self._logged_orders.append(set())
+        number_of_changes_before_batch = len(undo_log)
+        try:
+            yield self
+        except BaseException:
+            self._undo_log = None  # the undo operations must not be logged themselves
+            try:
+                while len(undo_log) > number_of_changes_before_batch:
+                    undo_log.pop()()
+            finally:
+                self._undo_log = undo_log
+            raise
+        finally:
+            self._logged_orders.pop()
+            if is_outermost_batch:
+                self._undo_log = None
+                self._flush_pending_invalidations()
+
+    def apply_changes(self, changes: Iterable[GraphChange]) -> None:
+        """
+        Applies the given changes in the given order in one batch (see batch).
+        Raises ValueError if any of the changes can't be applied; the graph is left unchanged in that case.
+        """
+        with self.batch():
+            for change in changes:
+                if isinstance(change, AddTask):
+                    self.add_task(change.task)
+                elif isinstance(change, AddEdge):
+                    self.add_edge(change.edge)
+                elif isinstance(change, RemoveTask):
+                    self.remove_task(change.task_id)
+                elif isinstance(change, RemoveEdge):
+                    self.remove_edge(change.edge_id)
+                elif isinstance(change, UpdateTask):
+                    self.update_task(change.task_id, **change.changes)
+                else:
+                    raise ValueError(f"Unsupported change: {change}")
+
+    def _get_topological_order(self) -> TopologicalOrder:
+        """
+        Returns the topological order of the graph.
+        The graph is only sorted once; afterward the order is updated by the methods that modify the graph.
+        """
+        if self._topological_order is None:
+            self._topological_order = TopologicalOrder.from_graph(self._graph)
+        return self._topological_order
+
+    def _get_schedule_state(self) -> ScheduleState:
+        """
+        Returns the schedule state of the current version of the graph.
+        It's only computed from scratch once; afterward only the changes since the last read query are propagated.
+        """
+        if self._pending_earliest_start_of or self._pending_remaining_duration_of:
+            self._flush_pending_invalidations()  # read query inside a batch
+        if self._schedule_state is None:
+            self._schedule_state = ScheduleState.compute(
+                self._graph, self._starting_time_of_run, self._version, self._get_topological_order()
+            )
+        elif self._schedule_state.version != self._version:
+            self._schedule_state.update(self._graph, self._starting_time_of_run, self._version)
+        return self._schedule_state
+
+    def _get_forecast_state(self, status_date: datetime) -> ForecastState:
+        """
+        Returns the forecast at the given status date for the current version of the graph.
+        The forecast of the most recent status date is kept: as long as the status date stays the same, only the
+        changes since the last forecast query are propagated; a new status date requires a full O(V+E) pass, whose
+        result is compared with the previous forecast, so that only the tasks whose forecast moved count as changed.
+        """
+        if self._pending_earliest_start_of or self._pending_remaining_duration_of:
+            self._flush_pending_invalidations()  # read query inside a batch
+        if (
+            self._forecast_state is None
+            or self._forecast_state.status_date != status_date
+            or self._forecast_state.is_outdated
+        ):
+            self._forecast_state = ForecastState.compute(
+                self._graph,
+                self._starting_time_of_run,
+                status_date,
+                self._version,
+                self._get_topological_order(),
+                previous=self._forecast_state,
             )
+        elif self._forecast_state.version != self._version:
+            self._forecast_state.update(self._graph, self._starting_time_of_run, self._version)
+        return self._forecast_state
 
-    def _account_for_earliest_start(self) -> None:
+    def _get_ready_set(self) -> ReadySet:
         """
-        Adjusts the edge weights to account for the earliest possible start of the successor task.
+        Returns the ready set; it's built on first use and maintained incrementally by all modifications afterward.
         """
-        self._reset_edges()
-        self._stretch_edges_with_successor_that_has_fixed_start()
+        if self._ready_set is None:
+            self._ready_set = ReadySet.from_graph(self._graph)
+        return self._ready_set
 
-    def _get_label_text(self, task_node: TaskNode) -> str:
+    def _get_label_text(self, task_node: TaskNode, planned_start: AwareDatetime | None = None) -> str:
         """
         returns the label text of this TaskNode in the dot representation based on the legacy visualization
+        :param planned_start: the planned start of the task, if it's already known (it's calculated otherwise)
         :return: the full label, example:
         EC2210|SAP PI Puffer stoppen (Kommunikation IS-U starten)|Tom Büsche - Dauer 15min|Start 10.10.2023 10:OO:OO"
         """
-        planned_start_str = datetime.strftime(
-            self.calculate_planned_starting_time_of_task(task_node.id), "%d.%m.%Y %H:%M:%S%Z"
-        )
+        if planned_start is None:
+            planned_start = self.calculate_planned_starting_time_of_task(task_node.id)
+        planned_start_str = datetime.strftime(planned_start, "%d.%m.%Y %H:%M:%S%Z")
         assignee_name_or_placeholder: str
 
         if task_node.assignee is None:
@@ -452,31 +699,148 @@ class TaskDependencyGraph:
         """
         returns a mapping of the individual task ids to their name
         """
-        result = {
-            self._graph.nodes[x]["domain_model"].id: self._get_label_text(self._graph.nodes[x]["domain_model"])
-            for x in self._graph.nodes
-        }
+        result = dict(self._get_render_snapshot().labels)
         result.update({task_node_as_artificial_startnode.id: "START", task_node_as_artificial_endnode.id: "END"})
         return result
 
-    def get_digraph_copy(self) -> DiGraph:
+    def _get_export_node_ids(self) -> list[TaskId]:
         """
-        Returns a deep copy of the internal networkx DiGraph for external processing.
+        Returns all node ids in the order in which they are exported: the real tasks in insertion order, followed by
+        the artificial end node and the artificial start node.
+        """
+        result = [node_id for node_id in self._graph.nodes if node_id not in _ARTIFICIAL_NODE_IDS]
+        result.extend((task_node_as_artificial_endnode.id, task_node_as_artificial_startnode.id))
+        return result
+
+    def _get_render_snapshot(self) -> _RenderSnapshot:
+        """
+        Collects everything the exporters need at once: one schedule lookup and one pass over all nodes.
+        """
+        schedule_state = self._get_schedule_state()
+        node_ids = self._get_export_node_ids()
+        labels = {
+            node_id: self._get_label_text(
+                self._graph.nodes[node_id]["domain_model"],
+                self._starting_time_of_run + schedule_state.earliest_start[node_id],
+            )
+            for node_id in node_ids
+        }
+        return _RenderSnapshot(node_ids=node_ids, critical_path=schedule_state.critical_path_set, labels=labels)
+
+    @property
+    def starting_time_of_run(self) -> AwareDatetime:
+        """
+        the start of the run, i.e. the earliest moment any task can start
+        """
+        return self._starting_time_of_run
+
+    def get_digraph_copy(self, deep: bool = True) -> DiGraph:
+        """
+        Returns a copy of the internal networkx DiGraph for external processing.
         The returned graph will be de-coupled from the TaskDependencyGraph instance.
         It may be used, e.g., to plot the graph with networkx directly (without going over the TaskDependencyGraph).
+        If deep is False, the copy has its own structure and attribute dicts, but shares the (frozen, hence immutable)
+        TaskNode and TaskDependencyEdge instances with this graph, which is a lot cheaper than copying all of them.
+        If you only need to read the graph (e.g. to feed it into a networkx algorithm), use get_digraph_view instead.
+        """
+        if deep:
+            return copy.deepcopy(self._graph)
+        return self._graph.copy()
+
+    def to_graph_definition(self) -> GraphDefinition:
+        """
+        Returns the tasks, dependencies and start of the run this graph can be constructed from (without the
+        artificial start/end node and their edges); the tasks and dependencies are not copied.
+        The tasks are listed in the order of this graph and the dependencies such that the graph constructed from the
+        definition iterates the predecessors and successors of each task in the same order as this graph, even if it
+        has been modified since its construction (see _get_ordered_dependencies). So the constructed graph breaks ties
+        between critical paths and orders its exports like this graph; only the tasks without successors are connected
+        to the artificial end node in task order.
+        """
+        return GraphDefinition(
+            task_list=[
+                self._graph.nodes[task_id]["domain_model"]
+                for task_id in self._graph.nodes
+                if task_id not in _ARTIFICIAL_NODE_IDS
+            ],
+            dependency_list=[self._graph.edges[edge]["domain_model"] for edge in self._get_ordered_dependencies()],
+            starting_time_of_run=self._starting_time_of_run,
+        )
+
+    def _get_ordered_dependencies(self) -> list[tuple[TaskId, TaskId]]:
         """
-        return copy.deepcopy(self._graph.copy())
+        Returns the endpoints of the (real) dependencies in an order in which adding them one by one reproduces the
+        order of the successors and the order of the predecessors of each task. The edge order of the graph (by
+        predecessor) already reproduces the successors; after modifications (an edge that has been removed and added
+        again is at the end of both orders), the predecessors may be in another order, though. Both orders are merged
+        by a topological sort of the dependencies (O(E log E)) that keeps the edge order wherever possible; as all
+        orders follow the (re-)insertion of the edges, there is always a solution.
+        """
+        edges = [
+            (predecessor_id, successor_id)
+            for predecessor_id, successor_id in self._graph.edges
+            if predecessor_id not in _ARTIFICIAL_NODE_IDS and successor_id not in _ARTIFICIAL_NODE_IDS
+        ]
+        position = {edge: index for index, edge in enumerate(edges)}
+        followers: list[list[int]] = [[] for _ in edges]
+        number_of_preceding_edges = [0] * len(edges)
+        for task_id in self._graph.nodes:
+            if task_id in _ARTIFICIAL_NODE_IDS:
+                continue
+            successors = [position[task_id, s] for s in self._graph.succ[task_id] if s not in _ARTIFICIAL_NODE_IDS]
+            predecessors = [position[p, task_id] for p in self._graph.pred[task_id] if p not in _ARTIFICIAL_NODE_IDS]
+            for earlier, later in itertools.chain(itertools.pairwise(successors), itertools.pairwise(predecessors)):
+                followers[earlier].append(later)
+                number_of_preceding_edges[later] += 1
+        heap = [index for index, number in enumerate(number_of_preceding_edges) if number == 0]  # sorted, i.e. a heap
+        result: list[tuple[TaskId, TaskId]] = []
+        while heap:
+            index = heapq.heappop(heap)
+            result.append(edges[index])
+            for follower in followers[index]:
+                number_of_preceding_edges[follower] -= 1
+                if number_of_preceding_edges[follower] == 0:
+                    heapq.heappush(heap, follower)
+        if len(result) != len(edges):  # pragma: no cover
+            raise RuntimeError("The orders of the predecessors and successors contradict each other — this is a bug")
+        return result
+
+    def get_digraph_view(self) -> DiGraph:
+        """
+        Returns a read-only view of the internal networkx DiGraph; nothing is copied.
+        The view is live: it reflects later modifications of the TaskDependencyGraph.
+        Any attempt to modify the view raises a networkx.NetworkXError.
+        """
+        return self._graph.copy(as_view=True)
+
+    def get_task_by_external_id(self, external_id: str) -> TaskNode:
+        """
+        Returns the task with the given external id.
+        Raises ValueError if there is no such task in the graph.
+        """
+        task_id = self._external_id_index.get(external_id)
+        if task_id is None or task_id in _ARTIFICIAL_NODE_IDS:
+            raise ValueError(f"Node with external id {external_id} does not exist in the graph")
+        result: TaskNode = self._graph.nodes[task_id]["domain_model"]
+        return result
+
+    def get_edge_by_id(self, edge_id: TaskDependencyId) -> TaskDependencyEdge:
+        """
+        Returns the edge with the given id.
+        Raises ValueError if there is no such edge in the graph (the internal artificial edges are not returned).
+        """
+        endpoints = self._edge_index.get(edge_id)
+        if endpoints is None or endpoints[0] in _ARTIFICIAL_NODE_IDS or endpoints[1] in _ARTIFICIAL_NODE_IDS:
+            raise ValueError(f"Edge with id {edge_id} does not exist in the graph")
+        result: TaskDependencyEdge = self._graph.edges[endpoints]["domain_model"]
+        return result
 
     def is_on_critical_path(self, task_id: TaskId) -> bool:
         """
         With this method it can be checked if a task is on the overall critical path, i.e. on the longest path
         between the first task and last task of this run.
         """
-        longest_path = dag_longest_path(self._graph, weight="weight")  # The weight of the edge is the duration
-        # of the task predecessor.
-        # The longest path is the path, the sum of whose task durations is the greatest.
-        # The longest_path is a list of their task ids as keys.
-        if task_id in longest_path:
+        if task_id in self._get_schedule_state().critical_path_set:
             return True
         if task_id not in self._graph.nodes and task_id not in (
             task_node_as_artificial_startnode.id,
@@ -494,7 +858,7 @@ class TaskDependencyGraph:
             return AddNodeToGraphPreviewResponse(
                 can_be_added=False, error_message=f"Node with id {task_node.id} already exists in the graph"
             )
-        if any(t for t in self._graph.nodes.values() if t["domain_model"].external_id == task_node.external_id):
+        if task_node.external_id in self._external_id_index:
             return AddNodeToGraphPreviewResponse(
                 can_be_added=False,
                 error_message=f"Node with external id {task_node.external_id} already exists in the graph",
@@ -510,10 +874,21 @@ class TaskDependencyGraph:
         check_result = self.can_task_be_added(task_node)
         if not check_result.can_be_added:
             raise ValueError(check_result.error_message)
-        self._remove_artificial_nodes_and_edges()
         self._graph.add_node(task_node.id, domain_model=task_node)
-        self._add_artificial_nodes_and_edges()
-        self._account_for_earliest_start()
+        self._external_id_index[task_node.external_id] = task_node.id
+        if self._graph.has_edge(task_node_as_artificial_startnode.id, task_node_as_artificial_endnode.id):
+            # the graph has been empty so far
+            self._remove_edge(task_node_as_artificial_startnode.id, task_node_as_artificial_endnode.id)
+        self._rewire_artificial_edges([task_node.id])
+        if self._topological_order is not None:
+            self._topological_order.insert_node(task_node.id)
+        if self._ready_set is not None:
+            self._ready_set.add_task(self._graph, task_node.id)
+        self._invalidate_schedule(
+            earliest_start_of=[task_node.id, task_node_as_artificial_endnode.id],
+            remaining_duration_of=[task_node.id, task_node_as_artificial_startnode.id],
+        )
+        self._record_undo(lambda: self.remove_task(task_node.id))
 
     def can_edge_be_added(self, task_dependency: TaskDependencyEdge) -> AddEdgeToGraphPreviewResponse:  # noqa: PLR0911
         """
@@ -529,7 +904,7 @@ class TaskDependencyGraph:
                 can_be_added=False,
                 error_message=f"Node with id {task_dependency.task_predecessor} (predecessor) does not exist in the graph",  # noqa: E501
             )
-        if task_dependency.id in {self._graph.edges[x, y]["domain_model"].id for x, y in self._graph.edges}:
+        if task_dependency.id in self._edge_index:
             return AddEdgeToGraphPreviewResponse(
                 can_be_added=False, error_message=f"Edge with id {task_dependency.id} already exists in the graph"
             )
@@ -549,7 +924,9 @@ class TaskDependencyGraph:
                 can_be_added=False,
                 error_message=f"Opposite edge between {task_dependency.task_successor} and {task_dependency.task_predecessor} already exists: {conflict_edge}",  # noqa: E501
             )
-        if nx.has_path(self._graph, task_dependency.task_successor, task_dependency.task_predecessor):
+        if self._get_topological_order().would_create_cycle(
+            self._graph, task_dependency.task_predecessor, task_dependency.task_successor
+        ):
             return AddEdgeToGraphPreviewResponse(
                 can_be_added=False,
                 error_message=f"Adding this edge would create a cycle between {task_dependency.task_predecessor} and {task_dependency.task_successor}",  # noqa: E501
@@ -564,7 +941,10 @@ class TaskDependencyGraph:
         check_result = self.can_edge_be_added(task_dependency)
         if not check_result.can_be_added:
             raise ValueError(check_result.error_message)
-        self._remove_artificial_nodes_and_edges()
+        # the order is updated first: if it raises, the graph hasn't been modified yet
+        self._get_topological_order().add_edge(
+            self._graph, task_dependency.task_predecessor, task_dependency.task_successor
+        )
         # there is lot's of stuff left todo: what if we want to add an edge without a successor or predecessor?
         self._graph.add_edge(
             task_dependency.task_predecessor,
@@ -573,8 +953,17 @@ class TaskDependencyGraph:
             / 60,
             domain_model=task_dependency,
         )
-        self._add_artificial_nodes_and_edges()
-        self._account_for_earliest_start()
+        self._edge_index[task_dependency.id] = (task_dependency.task_predecessor, task_dependency.task_successor)
+        earliest_start_of, remaining_duration_of = self._rewire_artificial_edges(
+            [task_dependency.task_predecessor, task_dependency.task_successor]
+        )
+        if self._ready_set is not None:
+            self._ready_set.add_edge(self._graph, task_dependency.task_predecessor, task_dependency.task_successor)
+        self._invalidate_schedule(
+            earliest_start_of=[task_dependency.task_successor, *earliest_start_of],
+            remaining_duration_of=[task_dependency.task_predecessor, *remaining_duration_of],
+        )
+        self._record_undo(lambda: self.remove_edge(task_dependency.id))
 
     def can_task_be_removed(self, task_id: TaskId) -> RemoveNodeFromGraphPreviewResponse:
         """
@@ -582,7 +971,8 @@ class TaskDependencyGraph:
 
         A task can be removed if it exists and is not an internal artificial node.
         Removing a task also removes all of its edges (predecessor and successor alike);
-        the graph is automatically re-wired with fresh artificial start/end edges after removal.
+        former predecessors (successors) that are left without successors (predecessors) are connected to the
+        artificial end (start) node after removal.
         Use this method to check feasibility before calling remove_task.
         """
         if task_id in _ARTIFICIAL_NODE_IDS:
@@ -605,10 +995,51 @@ class TaskDependencyGraph:
         check_result = self.can_task_be_removed(task_id)
         if not check_result.can_be_removed:
             raise ValueError(check_result.error_message)
-        self._remove_artificial_nodes_and_edges()
-        self._graph.remove_node(task_id)
-        self._add_artificial_nodes_and_edges()
-        self._account_for_earliest_start()
+        predecessor_ids = [p for p in self._graph.predecessors(task_id) if p not in _ARTIFICIAL_NODE_IDS]
+        successor_ids = [s for s in self._graph.successors(task_id) if s not in _ARTIFICIAL_NODE_IDS]
+        if self._undo_log is not None:
+            removed_task: TaskNode = self._graph.nodes[task_id]["domain_model"]
+            removed_edges: list[TaskDependencyEdge] = [
+                *(self._graph.edges[p, task_id]["domain_model"] for p in predecessor_ids),
+                *(self._graph.edges[task_id, s]["domain_model"] for s in successor_ids),
+            ]
+        for edge in (*self._graph.in_edges(task_id), *self._graph.out_edges(task_id)):
+            del self._edge_index[self._graph.edges[edge]["domain_model"].id]
+        del self._external_id_index[self._graph.nodes[task_id]["domain_model"].external_id]
+        if self._ready_set is not None:
+            self._ready_set.remove_task(self._graph, task_id)
+        if self._undo_log is not None:
+            for kind in ("node", "succ", "pred"):
+                self._log_order_of(kind)
+            for predecessor_id in self._graph.pred[task_id]:
+                self._log_order_of("succ", predecessor_id)
+            for successor_id in self._graph.succ[task_id]:
+                self._log_order_of("pred", successor_id)
+            self._log_order_of("succ", task_id)
+            self._log_order_of("pred", task_id)
+        self._graph.remove_node(task_id)  # this removes all edges (including artificial ones) of the task, too
+        earliest_start_of, remaining_duration_of = self._rewire_artificial_edges([*predecessor_ids, *successor_ids])
+        if self._graph.number_of_nodes() == 2:
+            # only the artificial nodes are left
+            self._add_artificial_edge(task_node_as_artificial_startnode.id, task_node_as_artificial_endnode.id)
+        if self._topological_order is not None:
+            self._topological_order.remove_node(task_id)
+        if self._schedule_state is not None:
+            self._schedule_state.remove_node(task_id)
+        if self._forecast_state is not None:
+            self._forecast_state.remove_node(task_id)
+        self._invalidate_schedule(
+            earliest_start_of=[*successor_ids, *earliest_start_of, task_node_as_artificial_endnode.id],
+            remaining_duration_of=[*predecessor_ids, *remaining_duration_of, task_node_as_artificial_startnode.id],
+        )
+        if self._undo_log is not None:
+
+            def _undo_remove_task() -> None:
+                self.add_task(removed_task)
+                for removed_edge in removed_edges:
+                    self.add_edge(removed_edge)
+
+            self._record_undo(_undo_remove_task)
 
     def can_edge_be_removed(self, edge_id: TaskDependencyId) -> RemoveEdgeFromGraphPreviewResponse:
         """
@@ -616,22 +1047,22 @@ class TaskDependencyGraph:
 
         An edge can be removed if it exists and connects two real (non-artificial) tasks.
         Removing an edge only removes the dependency between those two tasks; both tasks
-        remain in the graph. The graph is automatically re-wired with fresh artificial
-        start/end edges so that any task that loses its last real predecessor or successor
-        is still reachable. Use this method to check feasibility before calling remove_edge.
-        """
-        for u, v in self._graph.edges:
-            if self._graph.edges[u, v]["domain_model"].id == edge_id:
-                if u in _ARTIFICIAL_NODE_IDS or v in _ARTIFICIAL_NODE_IDS:
-                    return RemoveEdgeFromGraphPreviewResponse(
-                        can_be_removed=False,
-                        error_message=f"Edge with id {edge_id} is an internal artificial edge and cannot be removed",
-                    )
-                return RemoveEdgeFromGraphPreviewResponse(can_be_removed=True, error_message=None)
-        return RemoveEdgeFromGraphPreviewResponse(
-            can_be_removed=False,
-            error_message=f"Edge with id {edge_id} does not exist in the graph",
-        )
+        remain in the graph. Any task that loses its last real predecessor or successor is
+        connected to the artificial start/end node, so that it's still reachable.
+        Use this method to check feasibility before calling remove_edge.
+        """
+        endpoints = self._edge_index.get(edge_id)
+        if endpoints is None:
+            return RemoveEdgeFromGraphPreviewResponse(
+                can_be_removed=False,
+                error_message=f"Edge with id {edge_id} does not exist in the graph",
+            )
+        if endpoints[0] in _ARTIFICIAL_NODE_IDS or endpoints[1] in _ARTIFICIAL_NODE_IDS:
+            return RemoveEdgeFromGraphPreviewResponse(
+                can_be_removed=False,
+                error_message=f"Edge with id {edge_id} is an internal artificial edge and cannot be removed",
+            )
+        return RemoveEdgeFromGraphPreviewResponse(can_be_removed=True, error_message=None)
 
     def remove_edge(self, edge_id: TaskDependencyId) -> None:
         """
@@ -641,37 +1072,95 @@ class TaskDependencyGraph:
         check_result = self.can_edge_be_removed(edge_id)
         if not check_result.can_be_removed:
             raise ValueError(check_result.error_message)
-        edge_to_remove: tuple[TaskId, TaskId] | None = None
-        for u, v in self._graph.edges:
-            if self._graph.edges[u, v]["domain_model"].id == edge_id:
-                edge_to_remove = (u, v)
-                break
-        if edge_to_remove is None:  # pragma: no cover
-            raise RuntimeError(f"Edge {edge_id} passed validation but could not be located — this is a bug")
-        self._remove_artificial_nodes_and_edges()
-        self._graph.remove_edge(*edge_to_remove)
-        self._add_artificial_nodes_and_edges()
-        self._account_for_earliest_start()
-
-    def _get_duration_or_buffer_length(self, predecessor_id: TaskId, successor_id: TaskId) -> timedelta:
-        """
-        Returns either the duration of the task or the difference to a successor with earliest_starttime set.
-        This is necessary to calculate start times of tasks where there is any task with the earliest starting time on
-        the path.
-        In case of the difference to a successor with earliest_starttime being larger than the duration of the task
-        itself, the start time of the successor task as well as all following tasks on this path is later than the
-        duration of previous tasks suggests (as the earliest starting time of the successor task makes every following
-        task on the path start later...).
-        To the outside caller, this shall be transparent.
-        """
-        if not self._graph.has_edge(predecessor_id, successor_id):
-            raise ValueError(f"Edge between {predecessor_id} and {successor_id} does not exist")
-        predecessor_duration: timedelta = self._graph.nodes[predecessor_id]["domain_model"].planned_duration
-        successor_start: AwareDatetime | None = self._graph.nodes[successor_id]["domain_model"].earliest_starttime
-        if successor_start is None:
-            return predecessor_duration
-        pseudo_duration = successor_start - self.calculate_planned_starting_time_of_task(predecessor_id)
-        return max(pseudo_duration, predecessor_duration)
+        edge_to_remove = self._edge_index[edge_id]
+        removed_edge: TaskDependencyEdge = self._graph.edges[edge_to_remove]["domain_model"]
+        self._remove_edge(*edge_to_remove)
+        if self._ready_set is not None:
+            self._ready_set.remove_edge(self._graph, *edge_to_remove)
+        earliest_start_of, remaining_duration_of = self._rewire_artificial_edges(edge_to_remove)
+        self._invalidate_schedule(
+            earliest_start_of=[edge_to_remove[1], *earliest_start_of],
+            remaining_duration_of=[edge_to_remove[0], *remaining_duration_of],
+        )
+        self._record_undo(lambda: self.add_edge(removed_edge))
+
+    def _get_updated_task(self, task_id: TaskId, changes: Mapping[str, Any]) -> TaskNode | str:  # noqa: PLR0911
+        """
+        Returns the task with the given changes applied (and validated) or an error message, if that's not possible.
+        """
+        if task_id in _ARTIFICIAL_NODE_IDS:
+            return f"Node with id {task_id} is an internal artificial node and cannot be updated"
+        if task_id not in self._graph.nodes:
+            return f"Node with id {task_id} does not exist in the graph"
+        unknown_fields = set(changes) - set(TaskNode.model_fields)
+        if unknown_fields:
+            return f"TaskNode has no field(s) {', '.join(sorted(unknown_fields))}"
+        if "id" in changes and changes["id"] != task_id:
+            return "The id of a task cannot be changed"
+        task: TaskNode = self._graph.nodes[task_id]["domain_model"]
+        try:
+            # model_copy(update=...) would skip the validation
+            updated_task = TaskNode.model_validate({**task.model_dump(), **changes})
+        except ValidationError as validation_error:
+            return f"The changes are invalid: {validation_error}"
+        if updated_task.external_id != task.external_id and updated_task.external_id in self._external_id_index:
+            return f"Node with external id {updated_task.external_id} already exists in the graph"
+        return updated_task
+
+    def can_task_be_updated(self, task_id: TaskId, **changes: Any) -> UpdateNodeInGraphPreviewResponse:
+        """
+        Returns information on whether the given fields of a task can be updated (see update_task).
+        """
+        updated_task_or_error = self._get_updated_task(task_id, changes)
+        if isinstance(updated_task_or_error, str):
+            return UpdateNodeInGraphPreviewResponse(can_be_updated=False, error_message=updated_task_or_error)
+        return UpdateNodeInGraphPreviewResponse(can_be_updated=True, error_message=None)
+
+    def update_task(self, task_id: TaskId, **changes: Any) -> None:
+        """
+        Updates fields of a task in place, e.g. tdg.update_task(task_id, planned_duration=timedelta(minutes=30)).
+        As TaskNodes are frozen, the task node is replaced by an updated copy; all edges of the task are kept.
+        Only the schedule downstream of the task is re-computed (on the next read query), and only if the planned
+        duration, the earliest start time or the actual start/finish times (which only affect the forecast) changed.
+        Record the progress of a run like this: tdg.update_task(task_id, actual_starttime=now).
+        Raises ValueError if the task does not exist, is an artificial node or if the changes are invalid.
+        """
+        updated_task_or_error = self._get_updated_task(task_id, changes)
+        if isinstance(updated_task_or_error, str):
+            raise ValueError(updated_task_or_error)
+        previous_task = self._replace_task(updated_task_or_error)
+        self._record_undo(lambda: self._replace_task(previous_task))
+
+    def _replace_task(self, task_node: TaskNode) -> TaskNode:
+        """
+        Replaces the domain model of an existing task and returns the previous one.
+        """
+        previous_task: TaskNode = self._graph.nodes[task_node.id]["domain_model"]
+        self._graph.nodes[task_node.id]["domain_model"] = task_node
+        del self._external_id_index[previous_task.external_id]
+        self._external_id_index[task_node.external_id] = task_node.id
+        if self._ready_set is not None:
+            self._ready_set.update_task(self._graph, previous_task, task_node)
+        earliest_start_of: list[TaskId] = []
+        remaining_duration_of: list[TaskId] = []
+        if task_node.planned_duration != previous_task.planned_duration:
+            weight = task_node.planned_duration.total_seconds() / 60
+            for successor_id in self._graph.successors(task_node.id):
+                self._graph.edges[task_node.id, successor_id]["weight"] = weight
+                earliest_start_of.append(successor_id)
+            # the earliest start of the task itself is the same, but its forecast finish (see ForecastState) isn't
+            earliest_start_of.append(task_node.id)
+            remaining_duration_of.append(task_node.id)
+        if (task_node.earliest_starttime, task_node.actual_starttime, task_node.actual_finishtime) != (
+            previous_task.earliest_starttime,
+            previous_task.actual_starttime,
+            previous_task.actual_finishtime,
+        ):
+            # the actual times don't change the plan, but the forecast, which is marked dirty along with the plan
+            earliest_start_of.append(task_node.id)
+        if earliest_start_of or remaining_duration_of:
+            self._invalidate_schedule(earliest_start_of=earliest_start_of, remaining_duration_of=remaining_duration_of)
+        return previous_task
 
     def calculate_planned_duration_of_predecessor_tasks_on_critical_path(self, task_id: TaskId) -> timedelta:
         """
@@ -680,42 +1169,22 @@ class TaskDependencyGraph:
         critical path, which are on the last path towards the task in question, as the task in question might not be
         on the overall critical path).
         Thus, we can calculate how long it takes to get from the first task(s) to the task in question.
+        The value is looked up from the forward pass of the ScheduleState (see _compute_earliest_start_of_node in
+        schedule_state), which already accounts for the earliest possible starts of the task and its predecessors.
         """
-        # In the following, we will need this dictionary to get from the node id to the node and then to its
-        # planned duration.
-        # gets the last and thus the longest path in the list
-        if task_id not in self._graph.nodes():
-            # 1st case: invalid task id
-            raise ValueError("This task id is invalid.")
-        if task_id == task_node_as_artificial_endnode.id:
-            duration_of_tasks_on_overall_longest_path = dag_longest_path_length(self._graph, weight="weight")
-            return timedelta(minutes=duration_of_tasks_on_overall_longest_path)
-        generator_of_simple_paths_sorted_from_short_to_long = nx.shortest_simple_paths(
-            self._graph, task_node_as_artificial_startnode.id, task_id, weight="weight"
-        )
-        list_of_simple_paths_sorted_from_short_to_long: list[list[TaskId]] = list(
-            generator_of_simple_paths_sorted_from_short_to_long
-        )
-        longest_simple_path: list[TaskId] = list_of_simple_paths_sorted_from_short_to_long.pop()
-        result = sum(
-            (timedelta(minutes=self._graph.edges[edge]["weight"]) for edge in pairwise(longest_simple_path)),
-            timedelta(seconds=0),
-        )
-        return result
+        try:
+            return self._get_schedule_state().earliest_start[task_id]
+        except KeyError as key_error:
+            # invalid task id
+            raise ValueError("This task id is invalid.") from key_error
 
     def calculate_planned_starting_time_of_task(self, task_id: TaskId) -> AwareDatetime:
         """
         With this method we can calculate the planned starting time of a task.
         """
-        planned_duration_of_predecessor_tasks_on_critical_path = (
-            self.calculate_planned_duration_of_predecessor_tasks_on_critical_path(task_id)
+        return self._starting_time_of_run + self.calculate_planned_duration_of_predecessor_tasks_on_critical_path(
+            task_id
         )
-        task_domain_model = self._graph.nodes[task_id]["domain_model"]
-        own_earliest_start: AwareDatetime | None = task_domain_model.earliest_starttime
-        starting_time_of_task = self._starting_time_of_run + planned_duration_of_predecessor_tasks_on_critical_path
-        if own_earliest_start is None:
-            return starting_time_of_task
-        return max(starting_time_of_task, own_earliest_start)
 
     def calculate_planned_finish_time_of_task(self, task_id: TaskId) -> AwareDatetime:
         """
@@ -733,15 +1202,19 @@ class TaskDependencyGraph:
         """
         Returns the ordered list of task IDs on the critical path, from graph start to graph finish.
 
-        Uses the same weighted-DAG semantics as is_on_critical_path: each directed edge carries the
-        duration of its predecessor node as weight. Tasks with an earliest_starttime may cause their
-        incoming edge weight to be stretched beyond the raw predecessor duration (see
-        _stretch_edges_with_successor_that_has_fixed_start), so wall-clock delays are reflected.
+        The path is taken from the forward pass of the schedule state (see ScheduleState.critical_predecessors_of):
+        walking back from the artificial end node, it always follows a direct predecessor that finishes exactly when
+        the current task starts. The earliest_starttime of a task acts as a release time: if it determines the start
+        of the task, the path continues through the predecessors that finish before the release, although they have
+        slack, so wall-clock delays are reflected.
+        The path always leads from the artificial start node to the artificial end node, so it also contains
+        zero-duration tasks (e.g. milestones) that finish with the graph; it's only empty (without the artificial
+        nodes) if the graph has no tasks.
 
-        Tie-breaking: when multiple paths share the same total weight, the result follows NetworkX's
-        deterministic graph-insertion order (the path whose first differing node was inserted first
-        wins). Use a separate get_critical_path_task_id_paths() API (not yet implemented) if all
-        tied paths are needed.
+        Tie-breaking: when several predecessors finish at the same moment, the first one in the insertion order of
+        the predecessors wins (the artificial end node is connected to the tasks without successors in task order on
+        construction, and afterward in the order in which they became tasks without successors).
+        Use get_critical_path_task_id_paths() if all tied paths are needed.
 
         Note: is_on_critical_path() does not filter artificial nodes, so calling it with an
         artificial node ID may return True while that ID is absent from the default output here.
@@ -749,11 +1222,71 @@ class TaskDependencyGraph:
         By default artificial start/end node IDs are excluded. Pass include_artificial_nodes=True
         to include them (useful for debugging or advanced consumers).
         """
-        path: list[TaskId] = dag_longest_path(self._graph, weight="weight")
+        path: list[TaskId] = list(self._get_schedule_state().critical_path)
         if include_artificial_nodes:
             return path
         return [tid for tid in path if tid not in _ARTIFICIAL_NODE_IDS]
 
+    def get_critical_path_task_id_paths(self, include_artificial_nodes: bool = False) -> Iterator[list[TaskId]]:
+        """
+        Lazily yields all critical paths, i.e. all paths with the same (maximal) length as the one returned by
+        get_critical_path_task_ids, which is the first one yielded.
+
+        Plans with many parallel branches of equal duration can have exponentially many critical paths; only iterate
+        as far as you need (or use count_critical_paths). The paths are found by a search over the edges whose
+        predecessor finishes exactly when the successor starts (the zero slack edges of the forward pass), so each
+        path costs O(sum of the in-degrees along the path), independent of how many paths there are in total.
+        The include_artificial_nodes parameter has the same semantics as in get_critical_path_task_ids.
+        Raises RuntimeError if the graph is modified during the iteration.
+        """
+        version = self._version
+        schedule_state = self._get_schedule_state()
+        for path in schedule_state.iter_critical_paths(self._graph, self._starting_time_of_run):
+            if include_artificial_nodes:
+                yield path
+            else:
+                yield [tid for tid in path if tid not in _ARTIFICIAL_NODE_IDS]
+            if self._version != version:
+                raise RuntimeError("The graph has been modified during the iteration over its critical paths")
+
+    def count_critical_paths(self) -> int:
+        """
+        Returns the number of critical paths (see get_critical_path_task_id_paths) without enumerating them, O(V+E).
+        """
+        return self._get_schedule_state().count_critical_paths(self._graph, self._starting_time_of_run)
+
+    def get_top_k_paths(self, k: int, include_artificial_nodes: bool = False) -> list[RankedPath]:
+        """
+        Returns the k longest paths from the graph start to the graph finish (or fewer, if there aren't as many),
+        longest first, together with their total duration and their slack relative to the graph finish.
+        The longest path is the critical path (unless earliest_starttimes delay the graph finish); the following ones
+        are the near-critical chains that become critical first when their tasks take longer than planned.
+
+        The paths are enumerated with an Eppstein-style implicit path heap over the backward pass (see
+        iter_longest_paths), without enumerating any other paths: O(E log V + k log k) plus the length of the
+        returned paths. Tied paths are ranked in graph insertion order.
+        The include_artificial_nodes parameter has the same semantics as in get_critical_path_task_ids.
+        Raises ValueError if k is not positive.
+        """
+        if k < 1:
+            raise ValueError(f"k must be positive, got {k}")
+        schedule_state = self._get_schedule_state()
+        paths = iter_longest_paths(
+            self._graph,
+            task_node_as_artificial_startnode.id,
+            self._get_topological_order().ordered_node_ids,
+            schedule_state.remaining_duration,
+        )
+        return [
+            RankedPath(
+                rank=rank,
+                task_ids=path if include_artificial_nodes else path[1:-1],  # the paths run from START to END
+                total_duration=total_duration,
+                slack=schedule_state.graph_finish - total_duration,
+            )
+            for rank, (total_duration, path) in enumerate(itertools.islice(paths, k), start=1)
+        ]
+
     def get_critical_path_tasks(self, include_artificial_nodes: bool = False) -> list[TaskNode]:
         """
         Returns the ordered list of TaskNode objects on the critical path, from graph start to graph finish.
@@ -766,26 +1299,6 @@ class TaskDependencyGraph:
             for tid in self.get_critical_path_task_ids(include_artificial_nodes=include_artificial_nodes)
         ]
 
-    def _compute_latest_start(self) -> dict[TaskId, timedelta]:
-        """
-        Backward pass: returns the latest-start offset (from graph start) for every node.
-
-        Processes nodes in reverse topological order. For each node the latest finish is the
-        minimum latest-start of all direct successors; latest start = latest finish − duration.
-        Uses only planned_duration (not stretched edge weights) so that waiting time introduced
-        by earliest_starttime on a successor is correctly reflected as slack for its predecessors.
-        """
-        graph_finish: timedelta = timedelta(minutes=dag_longest_path_length(self._graph, weight="weight"))
-        latest_start: dict[TaskId, timedelta] = {}
-        for node in reversed(list(nx.topological_sort(self._graph))):
-            successors = list(self._graph.successors(node))
-            if not successors:
-                latest_start[node] = graph_finish
-            else:
-                latest_finish = min(latest_start[s] for s in successors)
-                latest_start[node] = latest_finish - self._graph.nodes[node]["domain_model"].planned_duration
-        return latest_start
-
     def calculate_total_slack_of_task(self, task_id: TaskId) -> timedelta:
         """
         Returns the total slack of a task: the maximum amount of time by which the task's
@@ -795,25 +1308,22 @@ class TaskDependencyGraph:
         the whole graph. A positive value means the task can absorb that much delay without
         affecting the graph finish.
 
-        Computed via a backward pass through the DAG (see _compute_latest_start): for each node
+        Computed via a backward pass through the DAG (see ScheduleState): for each node
         the latest allowable finish (LF) equals the minimum of the latest starts of all direct
         successors, and latest start (LS) = LF − planned_duration. Total slack = LS − ES, where
-        ES is the existing planned-start calculation. Crucially, the backward pass uses only
-        planned_duration rather than the stretched edge weights, so waiting time introduced by an
-        earliest_starttime constraint on a successor is correctly counted as slack for the
-        predecessor rather than being consumed by the edge weight.
+        ES is the existing planned-start calculation. Waiting time introduced by an
+        earliest_starttime constraint on a successor is counted as slack for the predecessor.
 
         Raises ValueError for unknown task IDs and for the internal artificial start/end nodes,
         which are not part of the public API.
 
-        Note: each call runs a full backward pass (O(V+E)). For bulk queries over all tasks,
-        prefer create_schedule_report() which amortises the backward pass across all entries.
+        Note: the backward pass only runs once per version of the graph (see ScheduleState); subsequent calls on an
+        unmodified graph are O(1).
         """
         if task_id not in self._graph.nodes or task_id in _ARTIFICIAL_NODE_IDS:
             raise ValueError(f"Task with id {task_id!r} is not a real task in this graph")
-        latest_start = self._compute_latest_start()
-        earliest_start = self.calculate_planned_starting_time_of_task(task_id) - self._starting_time_of_run
-        return latest_start[task_id] - earliest_start
+        schedule_state = self._get_schedule_state()
+        return schedule_state.latest_start_of(task_id) - schedule_state.earliest_start[task_id]
 
     def calculate_planned_finish_time_of_graph(self) -> AwareDatetime:
         """
@@ -824,6 +1334,105 @@ class TaskDependencyGraph:
         """
         return self.calculate_planned_starting_time_of_task(task_node_as_artificial_endnode.id)
 
+    def calculate_forecast_starting_time_of_task(self, task_id: TaskId, status_date: AwareDatetime) -> AwareDatetime:
+        """
+        Returns the forecast start of a task at the given status date, i.e. based on what actually happened so far:
+        * tasks that have been started (actual_starttime) started at their actual start time
+        * all other tasks can't start before the status date (nor before their earliest_starttime or the forecast
+          finish of their predecessors)
+
+        The forecast of the most recent status date is kept up to date incrementally: recording actual start/finish
+        times (see update_task) only re-evaluates the downstream cone of the task on the next forecast query, as far
+        as the forecast actually changes. The plan (calculate_planned_starting_time_of_task) is not affected by the
+        actual times. Raises ValueError for unknown task IDs and for the artificial start/end nodes.
+        """
+        if task_id not in self._graph.nodes or task_id in _ARTIFICIAL_NODE_IDS:
+            raise ValueError(f"Task with id {task_id!r} is not a real task in this graph")
+        return self._starting_time_of_run + self._get_forecast_state(status_date).start[task_id]
+
+    def calculate_forecast_finish_time_of_task(self, task_id: TaskId, status_date: AwareDatetime) -> AwareDatetime:
+        """
+        Returns the forecast finish of a task at the given status date:
+        * tasks that have been finished (actual_finishtime) finished at their actual finish time
+        * running tasks (only an actual_starttime) finish after their planned_duration, but not before the status date
+        * all other tasks finish planned_duration after their forecast start
+        See calculate_forecast_starting_time_of_task for details.
+        """
+        if task_id not in self._graph.nodes or task_id in _ARTIFICIAL_NODE_IDS:
+            raise ValueError(f"Task with id {task_id!r} is not a real task in this graph")
+        return self._starting_time_of_run + self._get_forecast_state(status_date).finish[task_id]
+
+    def calculate_forecast_finish_time_of_graph(self, status_date: AwareDatetime) -> AwareDatetime:
+        """
+        Returns the forecast finish time of the entire graph at the given status date — the moment the last task is
+        expected to complete (see calculate_forecast_finish_time_of_task).
+        """
+        return (
+            self._starting_time_of_run + self._get_forecast_state(status_date).start[task_node_as_artificial_endnode.id]
+        )
+
+    def update_forecast(self, status_date: AwareDatetime) -> list[ForecastEntry]:
+        """
+        Brings the forecast at the given status date up to date (see calculate_forecast_starting_time_of_task) and
+        returns the entries of all tasks whose forecast start or finish changed since the previous call of this method,
+        ordered by forecast start. The changes are collected by every forecast update in between (including those of
+        other forecast queries), so no change is lost. If the status date moved since the previous forecast query, the
+        tasks whose forecast start or finish moved along with it count as changed, too.
+        """
+        forecast_state = self._get_forecast_state(status_date)
+        changed_task_ids = [tid for tid in forecast_state.changed_nodes if tid not in _ARTIFICIAL_NODE_IDS]
+        forecast_state.changed_nodes = set()
+        entries = [
+            ForecastEntry(
+                task_id=tid,
+                forecast_start=self._starting_time_of_run + forecast_state.start[tid],
+                forecast_finish=self._starting_time_of_run + forecast_state.finish[tid],
+            )
+            for tid in changed_task_ids
+        ]
+        entries.sort(key=lambda e: (e.forecast_start, self._graph.nodes[e.task_id]["domain_model"].external_id))
+        return entries
+
+    def is_task_ready(self, task_id: TaskId) -> bool:
+        """
+        Returns True if the task is ready to be requested (see get_ready_tasks).
+        Raises ValueError for unknown task IDs and for the artificial start/end nodes.
+        """
+        if task_id not in self._graph.nodes or task_id in _ARTIFICIAL_NODE_IDS:
+            raise ValueError(f"Task with id {task_id!r} is not a real task in this graph")
+        return task_id in self._get_ready_set().ready
+
+    def get_ready_tasks(
+        self, order_by: Literal["total_slack", "planned_start"] = "total_slack", limit: int | None = None
+    ) -> list[TaskNode]:
+        """
+        Returns the tasks that are ready to be requested: all of their direct predecessors are COMPLETED or OBSOLETE,
+        but the tasks themselves are still NOT_YET_REQUESTED (or have no execution_status at all).
+        The tasks are ordered by total slack (most urgent first, ties broken by planned start) or by planned start
+        (ties broken by total slack); limit restricts the result to the first tasks.
+
+        The number of unfinished predecessors of each task is counted once and afterward kept up to date by every
+        modification (e.g. update_task(task_id, execution_status=...)) in O(out-degree) of the modified task.
+        The ready tasks are kept in a heap, so the first k of them are returned in O(k log R) for R ready tasks, as
+        long as the schedule doesn't change; otherwise the heap is rebuilt once in O(R).
+        """
+        if limit is not None and limit < 0:
+            raise ValueError(f"The limit must not be negative, but was {limit}")
+        if order_by not in ("total_slack", "planned_start"):
+            raise ValueError(f"Unknown order {order_by!r}; use 'total_slack' or 'planned_start'")
+        schedule_state = self._get_schedule_state()
+
+        def _total_slack(task_id: TaskId) -> timedelta:
+            return schedule_state.latest_start_of(task_id) - schedule_state.earliest_start[task_id]
+
+        def _key_of(task_id: TaskId) -> tuple[timedelta, timedelta]:
+            if order_by == "total_slack":
+                return _total_slack(task_id), schedule_state.earliest_start[task_id]
+            return schedule_state.earliest_start[task_id], _total_slack(task_id)
+
+        ready_task_ids = self._get_ready_set().get_ready_task_ids(order_by, _key_of, self._version, limit)
+        return [self._graph.nodes[tid]["domain_model"] for tid in ready_task_ids]
+
     def create_schedule_report(self, include_artificial_nodes: bool = False) -> ScheduleReport:
         """
         Returns a ScheduleReport containing planning data for all tasks in the graph.
@@ -837,13 +1446,132 @@ class TaskDependencyGraph:
         Predecessor and successor lists are sorted by the same key on the referenced task.
         """
         critical_path_ids = self.get_critical_path_task_ids(include_artificial_nodes=include_artificial_nodes)
-        critical_path_set = set(critical_path_ids)
+        # All start times and latest-start offsets are taken from the same (cached) schedule state.
+        schedule_state = self._get_schedule_state()
+        latest_start_cache: dict[TaskId, timedelta] = {
+            tid: schedule_state.latest_start_of(tid) for tid in schedule_state.earliest_start
+        }
+        return self._create_schedule_report(
+            include_artificial_nodes, critical_path_ids, schedule_state.earliest_start, latest_start_cache
+        )
+
+    def create_resource_leveled_schedule_report(self, include_artificial_nodes: bool = False) -> ScheduleReport:
+        """
+        Returns a ScheduleReport like create_schedule_report, but for a resource-constrained schedule in which no
+        assignee works on more than one task at a time (assignees are identified by their id; tasks without an
+        assignee are not constrained). Whenever a person could start several tasks, the one with the least total slack
+        in the unconstrained schedule goes first (see ResourceLeveledSchedule). The graph itself is not modified.
+
+        In the leveled schedule, the next task of the same assignee acts as an additional successor of a task:
+        total_slack, free_slack, late_start and late_finish are the delays that neither push out the leveled graph
+        finish (nor the next task of the assignee, respectively) nor change the order in which each person works on
+        their tasks. critical_path_task_ids is the chain of tasks that determines the leveled graph finish; two
+        consecutive tasks of this chain are either dependent or done one after another by the same person.
+        predecessor_task_ids and successor_task_ids still only contain the dependencies from the graph.
 
-        # Pre-compute all start times and latest-start offsets once to avoid repeated DAG traversals.
+        Runs in O((V+E) + V log V); the result is not cached.
+        """
+        schedule_state = self._get_schedule_state()
+        total_slack = {
+            tid: schedule_state.latest_start_of(tid) - offset for tid, offset in schedule_state.earliest_start.items()
+        }
+        leveled_schedule = ResourceLeveledSchedule.compute(
+            self._graph,
+            self._get_topological_order().ordered_node_ids,
+            self._starting_time_of_run,
+            total_slack,
+            schedule_state.earliest_start,
+        )
+        critical_path_ids = [
+            tid for tid in leveled_schedule.critical_path if include_artificial_nodes or tid not in _ARTIFICIAL_NODE_IDS
+        ]
+        return self._create_schedule_report(
+            include_artificial_nodes,
+            critical_path_ids,
+            leveled_schedule.start,
+            leveled_schedule.latest_start,
+            resource_successor=leveled_schedule.resource_successor,
+        )
+
+    def create_calendar_aware_schedule_report(
+        self,
+        calendar: WorkingCalendar | None = None,
+        calendars_of_assignees: Mapping[uuid.UUID, WorkingCalendar] | None = None,
+        include_artificial_nodes: bool = False,
+    ) -> ScheduleReport:
+        """
+        Returns a ScheduleReport like create_schedule_report, but for a schedule in which the tasks are only worked on
+        inside the working intervals (minus the blackout periods) of their calendar: a task starts at a working moment
+        and its planned_duration is working time, i.e. the work pauses outside the working intervals.
+        The calendar of a task is the calendar of its assignee (calendars_of_assignees maps the ids of the assignees to
+        their calendars) or else the given calendar; tasks without any calendar are worked on around the clock.
+
+        total_slack, free_slack, late_start and late_finish are measured in wall-clock time (not in working time).
+        critical_path_task_ids follows, from the end of the graph backwards, always the predecessor that finishes last;
+        it ends at a task whose start is delayed by its calendar, as its predecessors have slack then.
+
+        Each calendar is compiled once into an index with prefix sums of the working time (see CalendarIndex), so the
+        passes run in O((V+E) + V log n) for calendars with n intervals. The graph itself is not modified and the result
+        is not cached. Raises ValueError if a calendar doesn't contain enough working time for its tasks.
+        """
+        compiled_calendars: dict[int, CalendarIndex] = {}
+
+        def _compile(working_calendar: WorkingCalendar) -> CalendarIndex:
+            if id(working_calendar) not in compiled_calendars:
+                compiled_calendars[id(working_calendar)] = CalendarIndex.from_calendar(working_calendar)
+            return compiled_calendars[id(working_calendar)]
+
+        default_calendar = _compile(calendar) if calendar is not None else None
+        calendars_by_assignee = {
+            person_id: _compile(working_calendar)
+            for person_id, working_calendar in (calendars_of_assignees or {}).items()
+        }
+
+        def _calendar_of(task: TaskNode) -> CalendarIndex | None:
+            if task.id in _ARTIFICIAL_NODE_IDS:
+                return None
+            if task.assignee is not None and task.assignee.id in calendars_by_assignee:
+                return calendars_by_assignee[task.assignee.id]
+            return default_calendar
+
+        calendar_aware_schedule = CalendarAwareSchedule.compute(
+            self._graph, self._get_topological_order().ordered_node_ids, self._starting_time_of_run, _calendar_of
+        )
+        critical_path_ids = [
+            tid
+            for tid in calendar_aware_schedule.critical_path
+            if include_artificial_nodes or tid not in _ARTIFICIAL_NODE_IDS
+        ]
+        return self._create_schedule_report(
+            include_artificial_nodes,
+            critical_path_ids,
+            calendar_aware_schedule.start,
+            calendar_aware_schedule.latest_start,
+            finish_offsets=calendar_aware_schedule.finish,
+            latest_finish_offsets=calendar_aware_schedule.latest_finish,
+        )
+
+    def _create_schedule_report(  # pylint:disable=too-many-arguments
+        self,
+        include_artificial_nodes: bool,
+        critical_path_ids: list[TaskId],
+        start_offsets: Mapping[TaskId, timedelta],
+        latest_start_offsets: Mapping[TaskId, timedelta],
+        *,
+        finish_offsets: Mapping[TaskId, timedelta] | None = None,
+        latest_finish_offsets: Mapping[TaskId, timedelta] | None = None,
+        resource_successor: Mapping[TaskId, TaskId] | None = None,
+    ) -> ScheduleReport:
+        """
+        Creates the ScheduleReport from the start and latest start of every node (offsets from the start of the run).
+        Unless given explicitly, the (latest) finish is the (latest) start plus the planned duration.
+        The free slack also accounts for the resource_successor of a task (the next task of the same assignee), if any.
+        """
+        resource_successor = resource_successor or {}
+        critical_path_set = set(critical_path_ids)
         start_cache: dict[TaskId, AwareDatetime] = {
-            tid: self.calculate_planned_starting_time_of_task(tid) for tid in self._graph.nodes
+            tid: self._starting_time_of_run + offset for tid, offset in start_offsets.items()
         }
-        latest_start_cache: dict[TaskId, timedelta] = self._compute_latest_start()
 
         def _task_sort_key(tid: TaskId) -> tuple[AwareDatetime, str, str]:
             task: TaskNode = self._graph.nodes[tid]["domain_model"]
@@ -856,9 +1584,14 @@ class TaskDependencyGraph:
             task: TaskNode = self._graph.nodes[task_id]["domain_model"]
             planned_start = start_cache[task_id]
             planned_finish = (
-                self.calculate_planned_finish_time_of_task(task_id)
-                if task_id not in _ARTIFICIAL_NODE_IDS
-                else planned_start + task.planned_duration
+                planned_start + task.planned_duration
+                if finish_offsets is None
+                else self._starting_time_of_run + finish_offsets[task_id]
+            )
+            late_finish = (
+                self._starting_time_of_run + latest_start_offsets[task_id] + task.planned_duration
+                if latest_finish_offsets is None
+                else self._starting_time_of_run + latest_finish_offsets[task_id]
             )
             predecessor_ids = sorted(
                 [
@@ -876,6 +1609,9 @@ class TaskDependencyGraph:
                 ],
                 key=_task_sort_key,
             )
+            next_starts = [start_cache[s] for s in self._graph.successors(task_id) if s not in _ARTIFICIAL_NODE_IDS]
+            if task_id in resource_successor:
+                next_starts.append(start_cache[resource_successor[task_id]])
 
             entries.append(
                 ScheduleEntry(
@@ -889,21 +1625,18 @@ class TaskDependencyGraph:
                     planned_duration=task.planned_duration,
                     is_milestone=task.is_milestone,
                     is_on_critical_path=task_id in critical_path_set,
-                    total_slack=latest_start_cache[task_id] - (planned_start - self._starting_time_of_run),
-                    free_slack=min(
-                        (start_cache[s] for s in self._graph.successors(task_id) if s not in _ARTIFICIAL_NODE_IDS),
-                        default=start_cache[task_node_as_artificial_endnode.id],
-                    )
+                    total_slack=latest_start_offsets[task_id] - start_offsets[task_id],
+                    free_slack=min(next_starts, default=start_cache[task_node_as_artificial_endnode.id])
                     - planned_finish,
-                    late_start=self._starting_time_of_run + latest_start_cache[task_id],
-                    late_finish=self._starting_time_of_run + latest_start_cache[task_id] + task.planned_duration,
+                    late_start=self._starting_time_of_run + latest_start_offsets[task_id],
+                    late_finish=late_finish,
                     predecessor_task_ids=predecessor_ids,
                     successor_task_ids=successor_ids,
                 )
             )
 
         entries.sort(key=lambda e: (e.planned_start, e.external_id, e.name))
-        graph_finish = self.calculate_planned_finish_time_of_graph()
+        graph_finish = start_cache[task_node_as_artificial_endnode.id]
 
         return ScheduleReport(
             graph_start=self._starting_time_of_run,
@@ -930,16 +1663,19 @@ class TaskDependencyGraph:
             raise ValueError(f"delay must be positive, got {delay}")
         if task_id not in self._graph.nodes or task_id in _ARTIFICIAL_NODE_IDS:
             raise ValueError(f"Task with id {task_id!r} is not a real task in this graph")
+        schedule_state = self._get_schedule_state()
         start_cache: dict[TaskId, AwareDatetime] = {
-            tid: self.calculate_planned_starting_time_of_task(tid) for tid in self._graph.nodes
+            tid: self._starting_time_of_run + offset for tid, offset in schedule_state.earliest_start.items()
+        }
+        latest_start_cache: dict[TaskId, timedelta] = {
+            tid: schedule_state.latest_start_of(tid) for tid in schedule_state.earliest_start
         }
-        latest_start_cache = self._compute_latest_start()
         task_total_slack = latest_start_cache[task_id] - (start_cache[task_id] - self._starting_time_of_run)
         if delay <= task_total_slack:
             return []
         prop_delay: dict[TaskId, timedelta] = {task_id: delay}
         result: list[DelayImpact] = [DelayImpact(task_id=task_id, additional_delay=delay - task_total_slack)]
-        for node in nx.topological_sort(self._graph):
+        for node in self._get_topological_order().ordered_node_ids:
             if node == task_id or node in _ARTIFICIAL_NODE_IDS:
                 continue
             incoming = timedelta(0)
@@ -958,6 +1694,52 @@ class TaskDependencyGraph:
                 result.append(DelayImpact(task_id=node, additional_delay=node_additional_delay))
         return result
 
+    def simulate_schedule(  # pylint:disable=too-many-arguments
+        self,
+        distributions: Mapping[TaskId, DurationDistribution],
+        number_of_samples: int = 10_000,
+        *,
+        seed: int | None = None,
+        processes: int = 1,
+        chunk_size: int | None = None,
+    ) -> "ScheduleSimulationResult":
+        """
+        Runs a Monte Carlo simulation of the schedule: in each sample, the duration of every task with a distribution
+        is drawn from its distribution (all other tasks keep their planned_duration) and the whole graph is scheduled.
+        The result contains the distribution of the finish time of the graph (e.g. its P50/P80/P95 quantiles) and the
+        criticality index of each task (the fraction of samples in which the task is on a critical path, in the sense of
+        get_critical_path_task_id_paths).
+
+        All samples are scheduled at once with vectorised passes over numpy arrays (tasks × samples); the samples are
+        processed in chunks of chunk_size (by default chosen such that each tasks × samples matrix of a chunk needs
+        about 32 MB). With processes > 1, the chunks are distributed to a pool of worker processes. Pass a seed to get
+        reproducible results (independent of the number of processes).
+
+        This requires the optional dependency numpy (pip install taskdependencygraph[numpy]).
+        Raises ValueError if a distribution refers to a task that is not a real task in this graph.
+        """
+        if number_of_samples < 1:
+            raise ValueError(f"number_of_samples must be positive, got {number_of_samples}")
+        for task_id in distributions:
+            if task_id not in self._graph.nodes or task_id in _ARTIFICIAL_NODE_IDS:
+                raise ValueError(f"Task with id {task_id!r} is not a real task in this graph")
+        try:
+            from taskdependencygraph.schedule_simulation import simulate  # noqa: PLC0415
+        except ImportError as import_error:
+            raise ImportError(
+                "The schedule simulation requires numpy; install it with: pip install taskdependencygraph[numpy]"
+            ) from import_error
+        compact_graph = CompactTaskGraph.from_graph(self._graph, self._get_topological_order().ordered_node_ids)
+        return simulate(
+            compact_graph,
+            self._starting_time_of_run,
+            distributions,
+            number_of_samples,
+            seed=seed,
+            processes=processes,
+            chunk_size=chunk_size,
+        )
+
     def create_list_of_task_node_copies_with_planned_starting_time(self) -> list[TaskNode]:
         """
         Returns a new task_list, in which tasks are sorted by their planned_starting_time.
@@ -992,49 +1774,44 @@ class TaskDependencyGraph:
             raise ValueError(f"Node with id {sub_start} (start) is not a milestone")
         if not self._graph.nodes[sub_end]["domain_model"].is_milestone:
             raise ValueError(f"Node with id {sub_end} (end) is not a milestone")
-        if not nx.has_path(self._graph, sub_start, sub_end):
+        descendants_of_start: set[TaskId] = nx.descendants(self._graph, sub_start) | {sub_start}
+        if sub_end not in descendants_of_start:
             raise ValueError(f"There is no path between {sub_start} and {sub_end}")
 
-        # Collect all paths between sub_start and sub_end
-        all_paths = list(nx.all_simple_paths(self._graph, source=sub_start, target=sub_end))
-
-        # Extract all nodes and edges in these paths
-        nodes_in_paths: set[TaskId] = set()
-        edges_in_paths: set[tuple[TaskId, TaskId]] = set()
-        for path in all_paths:
-            nodes_in_paths.update(path)
-            edges_in_paths.update((path[i], path[i + 1]) for i in range(len(path) - 1))
-
-        # Create the subgraph from these nodes and edges
-        sub_graph = self._graph.subgraph(nodes_in_paths).edge_subgraph(edges_in_paths).copy()
-
-        result = TaskDependencyGraph(
-            task_list=[sub_graph.nodes[x]["domain_model"] for x in sub_graph.nodes],
-            dependency_list=[sub_graph.edges[x, y]["domain_model"] for x, y in sub_graph.edges],
+        # A node is on a path between sub_start and sub_end iff it's both a descendant of sub_start and an ancestor of
+        # sub_end; in a DAG, so is every edge between two such nodes. This is O(V+E), whereas enumerating all (simple)
+        # paths may take exponential time.
+        nodes_in_paths: set[TaskId] = descendants_of_start & (nx.ancestors(self._graph, sub_end) | {sub_end})
+        node_ids = [node_id for node_id in self._graph.nodes if node_id in nodes_in_paths]
+        # The task nodes and edges are frozen (immutable) models, so the new graph can safely share them with this one.
+        return TaskDependencyGraph(
+            task_list=[self._graph.nodes[node_id]["domain_model"] for node_id in node_ids],
+            dependency_list=[
+                edge["domain_model"]
+                for node_id in node_ids
+                for successor_id, edge in self._graph.succ[node_id].items()
+                if successor_id in nodes_in_paths
+            ],
             starting_time_of_run=self.calculate_planned_starting_time_of_task(sub_start),
         )
-        # I'm not 100% sure we need this.
-        # My intention was to de-couple the new graph as much from the original graph as possible.
-        # If they still shared the same (identical, not only equal) nodes, then they might interfere in some scenarios.
-        return copy.deepcopy(result)
 
-    def _get_task_dot(self, task_id: TaskId) -> str:
+    def _get_task_dot(self, task_id: TaskId, snapshot: _RenderSnapshot) -> str:
         """
         Returns the dot-representation of a single task; This will be basically the dot-representation of the task node
         itself + the properties/attributes that can only be calculated from the TaskDependencyGraph in which the task
-        is embedded.
+        is embedded (and which are looked up from the snapshot).
         For details on the dot language see https://graphviz.org/doc/info/lang.html
         """
         node: TaskNode = self._graph.nodes[task_id]["domain_model"]
         node_attributes: dict[Literal["label", "color"], str] = {
-            "label": self._get_label_text(node),
+            "label": snapshot.labels[task_id],
         }
-        if self.is_on_critical_path(task_id=task_id):
+        if task_id in snapshot.critical_path:
             node_attributes["color"] = "red"
         result = node.to_dot(node_attributes)
         return result
 
-    def _get_task_mermaid_gantt(self, task_id: TaskId) -> str:
+    def _get_task_mermaid_gantt(self, task_id: TaskId, snapshot: _RenderSnapshot) -> str:
         """
         Returns the mermaid-gantt-representation of a single task within the TDG.
         """
@@ -1042,7 +1819,7 @@ class TaskDependencyGraph:
         node: TaskNode = self._graph.nodes[task_id]["domain_model"]
         attributes: list[str] = []
         # "Tags are optional, but if used, they must be specified first"
-        if self.is_on_critical_path(task_id=task_id):
+        if task_id in snapshot.critical_path:
             attributes.append("crit")
         if node.is_milestone or task_id in {task_node_as_artificial_startnode.id, task_node_as_artificial_endnode.id}:
             attributes.append("milestone")
@@ -1067,12 +1844,17 @@ class TaskDependencyGraph:
         For details on the dot language see https://graphviz.org/doc/info/lang.html
         The style information (font, colors, labels ...) have been adapted from /legacy/legacy_visualization_example.dot
         """
+        snapshot = self._get_render_snapshot()
         result: str = "digraph fahrplan{\nrankdir = LR;\nnode [shape=record fontname=Calibri];\n"
-        result += "".join(self._get_task_dot(tid) for tid in self._graph.nodes().keys())
-        result += "".join(
-            self._graph[predecessor][successor]["domain_model"].to_dot()
-            for predecessor, successor in self._graph.edges()
-        )
+        result += "".join(self._get_task_dot(tid, snapshot) for tid in snapshot.node_ids)
+        # the edges are exported grouped by their predecessors (in export order); the edges of the artificial start
+        # node are sorted by the export order of their successors
+        position = {tid: index for index, tid in enumerate(snapshot.node_ids)}
+        for predecessor in snapshot.node_ids:
+            successors = self._graph.succ[predecessor]
+            if predecessor == task_node_as_artificial_startnode.id:
+                successors = sorted(successors, key=position.__getitem__)
+            result += "".join(self._graph[predecessor][successor]["domain_model"].to_dot() for successor in successors)
         result += "}"
         # for debugging purposes you might copy the result from your IDE/Debugger and paste it here:
         # https://kroki.io/#try (select 'GraphViz' in the dropdown)
@@ -1097,14 +1879,15 @@ class TaskDependencyGraph:
             f"    tickInterval {config.tick_interval}\n"
         )
 
+        snapshot = self._get_render_snapshot()
         if not config.group_by_phase:
             body = f"    section {config.section_label}\n"
-            body += "".join(self._get_task_mermaid_gantt(tid) for tid in self._graph.nodes().keys())
+            body += "".join(self._get_task_mermaid_gantt(tid, snapshot) for tid in snapshot.node_ids)
             return header + body
 
-        # Group tasks by phase, preserving graph iteration order within each group.
+        # Group tasks by phase, preserving export order within each group.
         phases: dict[str | None, list[TaskId]] = {}
-        for tid in self._graph.nodes():
+        for tid in snapshot.node_ids:
             phase = self._graph.nodes[tid]["domain_model"].phase
             if phase not in phases:
                 phases[phase] = []
@@ -1114,6 +1897,6 @@ class TaskDependencyGraph:
         for phase, tids in phases.items():
             section_name = config.section_label if phase is None else phase
             body += f"    section {section_name}\n"
-            body += "".join(self._get_task_mermaid_gantt(tid) for tid in tids)
+            body += "".join(self._get_task_mermaid_gantt(tid, snapshot) for tid in tids)
 
         return header + body
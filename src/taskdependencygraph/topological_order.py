@@ -0,0 +1,142 @@
+"""
+The TopologicalOrder is an online (dynamic) topological order of the nodes of a TaskDependencyGraph.
+"""
+
+from collections.abc import Iterable
+
+import networkx as nx  # type: ignore[import-untyped]
+from networkx import DiGraph
+
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+
+
+class TopologicalOrder:
+    """
+    A topological order of all nodes (including the artificial ones) that is maintained while the graph is modified,
+    instead of being re-computed with a topological sort after each modification.
+
+    Adding an edge uses the algorithm by Pearce and Kelly ("A Dynamic Topological Sort Algorithm for Directed Acyclic
+    Graphs", 2006): an edge that already respects the order is accepted in O(1); otherwise only the nodes between the
+    ranks of its endpoints that are reachable from the successor or reach the predecessor are searched and re-ordered.
+    Removing nodes or edges never breaks a topological order.
+    This is an internal helper of the TaskDependencyGraph; it's not meant to be used on its own.
+    """
+
+    def __init__(self, rank: dict[TaskId, int]):
+        self.rank = rank
+        """
+        maps every node id to its position in the topological order.
+        The ranks are unique, but not necessarily contiguous.
+        """
+        self._ordered_node_ids: list[TaskId] | None = None
+
+    @classmethod
+    def from_graph(cls, graph: DiGraph) -> "TopologicalOrder":
+        """
+        Sorts the graph topologically from scratch (O(V+E)).
+        Raises a networkx.NetworkXUnfeasible error if the graph contains a cycle.
+        """
+        ordered_node_ids: list[TaskId] = list(nx.topological_sort(graph))
+        result = cls({node: rank for rank, node in enumerate(ordered_node_ids)})
+        result._ordered_node_ids = ordered_node_ids  # pylint:disable=protected-access
+        return result
+
+    @property
+    def ordered_node_ids(self) -> list[TaskId]:
+        """
+        all node ids in topological order
+        """
+        if self._ordered_node_ids is None:
+            self._ordered_node_ids = sorted(self.rank, key=self.rank.__getitem__)
+        return self._ordered_node_ids
+
+    def insert_node(self, task_id: TaskId) -> None:
+        """
+        Inserts a new (not yet connected) node into the order: right before the artificial end node, which is always
+        the last node.
+        """
+        self.rank[task_id] = self.rank[ID_OF_ARTIFICIAL_ENDNODE]
+        self.rank[ID_OF_ARTIFICIAL_ENDNODE] += 1
+        self._ordered_node_ids = None
+
+    def remove_node(self, task_id: TaskId) -> None:
+        """
+        Removes a node that has been removed from the graph.
+        """
+        del self.rank[task_id]
+        self._ordered_node_ids = None
+
+    def would_create_cycle(self, graph: DiGraph, predecessor_id: TaskId, successor_id: TaskId) -> bool:
+        """
+        Returns true iff adding an edge from predecessor to successor to the graph would create a cycle (a self-loop
+        is a cycle, too).
+        This is O(1) if the edge respects the current order.
+        """
+        if predecessor_id == successor_id:
+            return True
+        if self.rank[predecessor_id] < self.rank[successor_id]:
+            return False
+        return self._search_forward(graph, successor_id, predecessor_id) is None
+
+    def add_edge(self, graph: DiGraph, predecessor_id: TaskId, successor_id: TaskId) -> None:
+        """
+        Updates the order after an edge from predecessor to successor has been added (or before it will be added).
+        The edge must not create a cycle (see would_create_cycle).
+        """
+        lower_bound = self.rank[successor_id]
+        upper_bound = self.rank[predecessor_id]
+        if upper_bound < lower_bound:
+            return
+        forward = None if predecessor_id == successor_id else self._search_forward(graph, successor_id, predecessor_id)
+        if forward is None:
+            raise ValueError(f"An edge between {predecessor_id} and {successor_id} would create a cycle")
+        backward = self._search_backward(graph, predecessor_id, lower_bound)
+        self._reorder(backward, forward)
+
+    def _search_forward(self, graph: DiGraph, start_id: TaskId, target_id: TaskId) -> set[TaskId] | None:
+        """
+        Returns all nodes that are reachable from start and are ranked before target (the "forward region").
+        Returns None if target itself is reachable from start.
+        """
+        upper_bound = self.rank[target_id]
+        visited: set[TaskId] = {start_id}
+        stack: list[TaskId] = [start_id]
+        while stack:
+            node = stack.pop()
+            for successor_id in graph.successors(node):
+                if successor_id == target_id:
+                    return None
+                if successor_id not in visited and self.rank[successor_id] < upper_bound:
+                    visited.add(successor_id)
+                    stack.append(successor_id)
+        return visited
+
+    def _search_backward(self, graph: DiGraph, start_id: TaskId, lower_bound: int) -> set[TaskId]:
+        """
+        Returns all nodes from which start is reachable and that are ranked after lower_bound (the "backward region").
+        """
+        visited: set[TaskId] = {start_id}
+        stack: list[TaskId] = [start_id]
+        while stack:
+            node = stack.pop()
+            for predecessor_id in graph.predecessors(node):
+                if predecessor_id not in visited and self.rank[predecessor_id] > lower_bound:
+                    visited.add(predecessor_id)
+                    stack.append(predecessor_id)
+        return visited
+
+    def _reorder(self, backward: Iterable[TaskId], forward: Iterable[TaskId]) -> None:
+        """
+        Re-assigns the ranks of the affected nodes such that the whole backward region comes before the whole forward
+        region. The relative order within each region is kept and no other node is moved.
+        """
+        backward_sorted = sorted(backward, key=self.rank.__getitem__)
+        forward_sorted = sorted(forward, key=self.rank.__getitem__)
+        affected = [*backward_sorted, *forward_sorted]
+        for node, rank in zip(affected, sorted(self.rank[node] for node in affected), strict=True):
+            self.rank[node] = rank
+        self._ordered_node_ids = None
+
+
+__all__ = ["TopologicalOrder"]
@@ -0,0 +1,221 @@
+"""
+Level-synchronous, vectorised forward and backward passes for the CompactTaskGraph.
+This module requires the optional dependency numpy (pip install taskdependencygraph[numpy]); don't import it directly
+but use the backend argument of the CompactTaskGraph passes.
+"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from taskdependencygraph.compact_task_graph import CompactTaskGraph
+
+_Int64Array = npt.NDArray[np.int64]
+_MAX_UNROLLED_DEGREE = 8
+"""
+the neighbours of nodes with up to this many neighbours are combined one column at a time (which avoids a large
+temporary copy); for nodes with more neighbours, all of them are gathered at once
+"""
+
+
+def _gather_segments(
+    offsets: _Int64Array, indices: npt.NDArray[np.int32], nodes: _Int64Array
+) -> tuple[_Int64Array, _Int64Array]:
+    """
+    Concatenates the CSR rows of the given nodes. Returns the concatenated column indices and the start of the row of
+    each node within them (plus the total length as last entry).
+    """
+    counts = offsets[nodes + 1] - offsets[nodes]
+    starts = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+    positions = np.repeat(offsets[nodes] - starts[:-1], counts) + np.arange(starts[-1], dtype=np.int64)
+    return indices[positions].astype(np.int64), starts
+
+
+def _segment_max(values: _Int64Array, starts: _Int64Array) -> _Int64Array:
+    """
+    Returns the maximum of each segment values[starts[i]:starts[i + 1]]; empty segments yield 0.
+    """
+    result = np.zeros(len(starts) - 1, dtype=np.int64)
+    non_empty = starts[1:] > starts[:-1]
+    if non_empty.any():
+        result[non_empty] = np.maximum.reduceat(values, starts[:-1][non_empty] - starts[0])
+    return result
+
+
+def _group_by_degree(
+    nodes: _Int64Array, starts: _Int64Array, neighbours: _Int64Array
+) -> list[tuple[_Int64Array, _Int64Array]]:
+    """
+    Groups the given nodes by their number of neighbours (the segments neighbours[starts[i]:starts[i + 1]]).
+    Returns, per degree d, the nodes and their neighbours as matrix nodes × d.
+    """
+    degree = np.diff(starts)
+    result = []
+    for group_degree in np.unique(degree):
+        selected = np.flatnonzero(degree == group_degree)
+        positions = starts[selected, np.newaxis] - starts[0] + np.arange(group_degree)
+        result.append((nodes[selected], neighbours[starts[0] : starts[-1]][positions]))
+    return result
+
+
+class TopologicalLevels:
+    """
+    The tasks of a CompactTaskGraph grouped by their topological level (the number of edges on the longest path from a
+    source). The predecessors of a task are all on lower levels, its successors all on higher levels; hence all tasks
+    of one level can be scheduled at once.
+    The edges are re-laid out in level order, such that the incoming (outgoing) edges of all tasks of a level form one
+    contiguous slice, which is reduced with a single segmented maximum.
+    """
+
+    def __init__(self, graph: "CompactTaskGraph", levels: list[_Int64Array]):
+        self.nodes: _Int64Array = np.concatenate(levels) if levels else np.zeros(0, dtype=np.int64)
+        """
+        the task indices sorted by level
+        """
+        self.level_offsets = np.zeros(len(levels) + 1, dtype=np.int64)
+        """
+        the tasks of level i are nodes[level_offsets[i]:level_offsets[i + 1]]
+        """
+        np.cumsum([len(level) for level in levels], out=self.level_offsets[1:])
+        self.predecessors, self.predecessor_starts = _gather_segments(
+            np.frombuffer(graph.predecessor_offsets, dtype=np.int64),
+            np.frombuffer(graph.predecessor_indices, dtype=np.int32),
+            self.nodes,
+        )
+        self.successors, self.successor_starts = _gather_segments(
+            np.frombuffer(graph.successor_offsets, dtype=np.int64),
+            np.frombuffer(graph.successor_indices, dtype=np.int32),
+            self.nodes,
+        )
+        self._degree_groups: tuple[list[list[tuple[_Int64Array, _Int64Array]]], ...] | None = None
+
+    @classmethod
+    def compute(cls, graph: "CompactTaskGraph", max_number_of_levels: int) -> "TopologicalLevels | None":
+        """
+        Splits the graph into levels using a vectorised variant of Kahn's algorithm.
+        Returns None if there are more than max_number_of_levels levels; deep and narrow graphs are scheduled faster
+        by the plain python passes, because the vectorised passes have a fixed overhead per level.
+        """
+        successor_offsets = np.frombuffer(graph.successor_offsets, dtype=np.int64)
+        successor_indices = np.frombuffer(graph.successor_indices, dtype=np.int32)
+        in_degree = np.diff(np.frombuffer(graph.predecessor_offsets, dtype=np.int64))
+        frontier = np.flatnonzero(in_degree == 0).astype(np.int64)
+        levels: list[_Int64Array] = []
+        while frontier.size:
+            if len(levels) >= max_number_of_levels:
+                return None
+            levels.append(frontier)
+            targets, _ = _gather_segments(successor_offsets, successor_indices, frontier)
+            candidates, decrements = np.unique(targets, return_counts=True)
+            in_degree[candidates] -= decrements
+            frontier = candidates[in_degree[candidates] == 0]
+        return cls(graph, levels)
+
+    def compute_earliest_starts(self, graph: "CompactTaskGraph", run_start: int, no_earliest_start: int) -> _Int64Array:
+        """
+        Forward pass, one segmented maximum over the finish times of the predecessors per level.
+        """
+        duration = np.frombuffer(graph.duration, dtype=np.int64)
+        release = np.frombuffer(graph.earliest_start, dtype=np.int64)
+        release_offset = np.maximum(np.where(release == no_earliest_start, run_start, release) - run_start, 0)
+        result = np.zeros(len(duration), dtype=np.int64)
+        for level in range(len(self.level_offsets) - 1):
+            first, last = self.level_offsets[level], self.level_offsets[level + 1]
+            nodes = self.nodes[first:last]
+            starts = self.predecessor_starts[first : last + 1]
+            predecessors = self.predecessors[starts[0] : starts[-1]]
+            latest_finish = _segment_max(result[predecessors] + duration[predecessors], starts)
+            result[nodes] = np.maximum(latest_finish, release_offset[nodes])
+        return result
+
+    def compute_remaining_durations(self, graph: "CompactTaskGraph") -> _Int64Array:
+        """
+        Backward pass, one segmented maximum over the remaining durations of the successors per level.
+        """
+        duration = np.frombuffer(graph.duration, dtype=np.int64)
+        result = np.zeros(len(duration), dtype=np.int64)
+        for level in reversed(range(len(self.level_offsets) - 1)):
+            first, last = self.level_offsets[level], self.level_offsets[level + 1]
+            nodes = self.nodes[first:last]
+            starts = self.successor_starts[first : last + 1]
+            successors = self.successors[starts[0] : starts[-1]]
+            result[nodes] = duration[nodes] + _segment_max(result[successors], starts)
+        return result
+
+    def _get_degree_groups(self) -> tuple[list[list[tuple[_Int64Array, _Int64Array]]], ...]:
+        """
+        Returns, per level, the tasks grouped by their number of predecessors and grouped by their number of
+        successors (see _group_by_degree). The passes over many samples process each group with one gather per
+        neighbour slot, which is much faster than a segmented reduction along the task axis of a 2D array.
+        The groups are computed on first use.
+        """
+        if self._degree_groups is None:
+            by_number_of_predecessors = []
+            by_number_of_successors = []
+            for level in range(len(self.level_offsets) - 1):
+                first, last = self.level_offsets[level], self.level_offsets[level + 1]
+                nodes = self.nodes[first:last]
+                by_number_of_predecessors.append(
+                    _group_by_degree(nodes, self.predecessor_starts[first : last + 1], self.predecessors)
+                )
+                by_number_of_successors.append(
+                    _group_by_degree(nodes, self.successor_starts[first : last + 1], self.successors)
+                )
+            self._degree_groups = (by_number_of_predecessors, by_number_of_successors)
+        return self._degree_groups
+
+    def compute_earliest_starts_of_samples(self, durations: _Int64Array, release_offset: _Int64Array) -> _Int64Array:
+        """
+        Forward pass for many samples at once: durations has the shape tasks × samples (each row holds the sampled
+        durations of one task, so that the rows of a task's predecessors are gathered as contiguous blocks);
+        release_offset holds the earliest start of each task relative to the start of the run (0 if it has none).
+        Returns the earliest starts in the same shape as durations.
+        """
+        number_of_samples = durations.shape[1]
+        finish = np.empty_like(durations)
+        for groups in self._get_degree_groups()[0]:
+            for nodes, predecessors in groups:
+                start = np.repeat(release_offset[nodes, np.newaxis], number_of_samples, axis=1)
+                if predecessors.shape[1] > _MAX_UNROLLED_DEGREE:
+                    np.maximum(start, finish[predecessors].max(axis=1), out=start)
+                else:
+                    for column in predecessors.T:
+                        np.maximum(start, finish[column], out=start)
+                start += durations[nodes]
+                finish[nodes] = start
+        return finish - durations
+
+    def compute_critical_samples(
+        self, durations: _Int64Array, earliest_starts: _Int64Array, release_offset: _Int64Array
+    ) -> npt.NDArray[np.bool_]:
+        """
+        Backward pass for many samples at once (shapes as in compute_earliest_starts_of_samples): returns, per task
+        and sample, whether the task is on a critical path, i.e. on a chain of tasks without any slack that ends with
+        the finish of the graph. The same rule as in ScheduleState.critical_predecessors_of applies: a dependency is
+        part of such a chain iff the predecessor finishes exactly when the successor starts or if the successor is held
+        back by its earliest start (release_offset), because then the path continues through all of its predecessors.
+        """
+        finish = earliest_starts + durations
+        graph_finish = finish.max(axis=0, initial=0)
+        is_released = earliest_starts == release_offset[:, np.newaxis]
+        result = np.zeros(durations.shape, dtype=np.bool_)
+        for groups in reversed(self._get_degree_groups()[1]):
+            for nodes, successors in groups:
+                if successors.shape[1] == 0:
+                    result[nodes] = finish[nodes] == graph_finish
+                elif successors.shape[1] > _MAX_UNROLLED_DEGREE:
+                    tight = (finish[nodes, np.newaxis] == earliest_starts[successors]) | is_released[successors]
+                    result[nodes] = (result[successors] & tight).any(axis=1)
+                else:
+                    critical = np.zeros((len(nodes), durations.shape[1]), dtype=np.bool_)
+                    node_finish = finish[nodes]
+                    for column in successors.T:
+                        critical |= result[column] & ((node_finish == earliest_starts[column]) | is_released[column])
+                    result[nodes] = critical
+        return result
+
+
+__all__ = ["TopologicalLevels"]
@@ -300,3 +300,22 @@ def build_another_complex_graph_with_unsorted_task_list_and_different_starting_t
     #           9
     #        //   \
     #       10     11
+
+
+starting_time_of_run_3 = datetime(year=2024, month=1, day=1, tzinfo=UTC)
+
+
+def build_task(name: str, duration_minutes: int = 5, earliest_start: AwareDatetime | None = None) -> TaskNode:
+    return TaskNode(
+        id=TaskId(uuid.uuid4()),
+        external_id=name,
+        name=name,
+        planned_duration=timedelta(minutes=duration_minutes),
+        earliest_starttime=earliest_start,
+    )
+
+
+def build_edge(predecessor: TaskNode, successor: TaskNode) -> TaskDependencyEdge:
+    return TaskDependencyEdge(
+        id=TaskDependencyId(uuid.uuid4()), task_predecessor=predecessor.id, task_successor=successor.id
+    )
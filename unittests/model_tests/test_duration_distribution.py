@@ -0,0 +1,40 @@
+"""
+Tests for the validation of the duration distributions
+"""
+
+from datetime import timedelta
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from taskdependencygraph.models.duration_distribution import (
+    DurationDistribution,
+    EmpiricalDuration,
+    LognormalDuration,
+    PertDuration,
+    TriangularDuration,
+)
+
+
+@pytest.mark.parametrize("model_class", [TriangularDuration, PertDuration])
+def test_three_point_estimates_have_to_be_ordered(model_class: type[TriangularDuration | PertDuration]) -> None:
+    model_class(minimum=timedelta(minutes=5), most_likely=timedelta(minutes=5), maximum=timedelta(minutes=5))
+    with pytest.raises(ValidationError, match="minimum <= most_likely <= maximum"):
+        model_class(minimum=timedelta(minutes=5), most_likely=timedelta(minutes=10), maximum=timedelta(minutes=8))
+
+
+def test_invalid_parameters_are_rejected() -> None:
+    with pytest.raises(ValidationError):
+        LognormalDuration(median=timedelta(0), sigma=0.5)
+    with pytest.raises(ValidationError):
+        LognormalDuration(median=timedelta(minutes=1), sigma=-1)
+    with pytest.raises(ValidationError):
+        EmpiricalDuration(observed_durations=[])
+    with pytest.raises(ValidationError):
+        PertDuration(minimum=timedelta(0), most_likely=timedelta(0), maximum=timedelta(0), shape=0)
+
+
+def test_distributions_are_discriminated_by_kind() -> None:
+    adapter: TypeAdapter[DurationDistribution] = TypeAdapter(DurationDistribution)
+    parsed = adapter.validate_json('{"kind": "lognormal", "median": "PT10M", "sigma": 0.3}')
+    assert parsed == LognormalDuration(median=timedelta(minutes=10), sigma=0.3)
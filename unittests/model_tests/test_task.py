@@ -1,5 +1,8 @@
 import uuid
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
 
 from taskdependencygraph.models.ids import TaskId
 from taskdependencygraph.models.task_node import TaskNode
@@ -17,3 +20,20 @@ def test_task_is_hashable() -> None:
         planned_duration=timedelta(minutes=1),
     )
     _ = hash(task), "must not raise a TypeError"
+
+
+def test_actual_finishtime_requires_a_valid_actual_starttime() -> None:
+    started = datetime(2024, 1, 1, 8, 0, 0, tzinfo=UTC)
+    task = TaskNode(
+        id=TaskId(uuid.uuid4()),
+        external_id="123",
+        name="the task's name",
+        planned_duration=timedelta(minutes=1),
+        actual_starttime=started,
+        actual_finishtime=started,
+    )
+    assert task.actual_finishtime == task.actual_starttime
+    with pytest.raises(ValidationError, match="must have an actual_starttime"):
+        task.model_validate({**task.model_dump(), "actual_starttime": None})
+    with pytest.raises(ValidationError, match="must not be before the actual_starttime"):
+        task.model_validate({**task.model_dump(), "actual_finishtime": started - timedelta(minutes=1)})
@@ -0,0 +1,23 @@
+"""
+Tests for the TaskStatusEvent
+"""
+
+import uuid
+from datetime import UTC, datetime
+
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_execution_status import TaskExecutionStatus
+from taskdependencygraph.models.task_status_event import TaskStatusEvent
+
+
+def test_only_explicitly_set_fields_are_changes() -> None:
+    task_id = TaskId(uuid.uuid4())
+    assert TaskStatusEvent(task_id=task_id, execution_status=TaskExecutionStatus.STARTED).changes == {
+        "execution_status": TaskExecutionStatus.STARTED
+    }
+    assert TaskStatusEvent(task_id=task_id, actual_starttime=None).changes == {"actual_starttime": None}
+    started = datetime(2024, 1, 1, tzinfo=UTC)
+    parsed = TaskStatusEvent.model_validate_json(
+        f'{{"task_id": "{task_id}", "actual_starttime": "{started.isoformat()}"}}'
+    )
+    assert parsed.changes == {"actual_starttime": started}
@@ -0,0 +1,34 @@
+"""
+Tests for the validation of the working calendar models
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from taskdependencygraph.models.working_calendar import TimeInterval, WorkingCalendar
+
+_T0 = datetime(2024, 1, 1, 8, 0, 0, tzinfo=UTC)
+
+
+def test_intervals_must_not_be_empty() -> None:
+    TimeInterval(start=_T0, end=_T0 + timedelta(minutes=1))
+    with pytest.raises(ValidationError, match="has to be before its end"):
+        TimeInterval(start=_T0, end=_T0)
+    with pytest.raises(ValidationError, match="has to be before its end"):
+        TimeInterval(start=_T0, end=_T0 - timedelta(hours=1))
+
+
+def test_intervals_must_be_timezone_aware() -> None:
+    with pytest.raises(ValidationError):
+        TimeInterval(start=datetime(2024, 1, 1, 8), end=datetime(2024, 1, 1, 9))
+
+
+def test_calendar_round_trips_through_json() -> None:
+    calendar = WorkingCalendar(
+        working_intervals=[TimeInterval(start=_T0, end=_T0 + timedelta(hours=8))],
+        blackout_periods=[TimeInterval(start=_T0 + timedelta(hours=4), end=_T0 + timedelta(hours=5))],
+    )
+    assert WorkingCalendar.model_validate_json(calendar.model_dump_json()) == calendar
+    assert WorkingCalendar(working_intervals=[]).blackout_periods == []
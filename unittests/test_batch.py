@@ -0,0 +1,175 @@
+"""
+tests for the transactional batch modification of the TDG
+"""
+
+# pylint:disable=protected-access
+import copy
+import random
+from datetime import timedelta
+
+import pytest
+from pydantic import TypeAdapter
+
+from taskdependencygraph import (
+    AddEdge,
+    AddTask,
+    GraphChange,
+    RemoveEdge,
+    RemoveTask,
+    TaskDependencyGraph,
+    UpdateTask,
+)
+
+from .example_data_for_test_task_dependency_graph import build_edge, build_task, starting_time_of_run_3
+from .example_tdgs import graph_anna, task_A, task_B, task_C, task_D
+
+
+def _snapshot(tdg: TaskDependencyGraph) -> tuple[object, ...]:
+    graph = tdg.get_digraph_copy()
+    return (
+        {n: graph.nodes[n]["domain_model"] for n in graph.nodes},
+        {(u, v): (graph.edges[u, v]["domain_model"], graph.edges[u, v]["weight"]) for u, v in graph.edges},
+        dict(tdg._edge_index),
+        dict(tdg._external_id_index),
+        tdg.create_schedule_report(),
+    )
+
+
+def test_apply_changes_equals_single_modifications() -> None:
+    e, f = build_task("E", 7), build_task("F", 3)
+    changes: list[GraphChange] = [
+        AddTask(task=e),
+        AddTask(task=f),
+        AddEdge(edge=build_edge(task_D, e)),
+        AddEdge(edge=build_edge(e, f)),
+        AddEdge(edge=build_edge(task_A, f)),
+    ]
+    batched = copy.deepcopy(graph_anna)
+    batched.create_schedule_report()
+    batched.apply_changes(changes)
+    one_by_one = copy.deepcopy(graph_anna)
+    for change in changes:
+        one_by_one.apply_changes([change])
+    assert batched.create_schedule_report() == one_by_one.create_schedule_report()
+    assert batched.calculate_planned_starting_time_of_task(f.id) == one_by_one.calculate_planned_starting_time_of_task(
+        f.id
+    )
+
+
+def test_failing_change_rolls_back_the_whole_batch() -> None:
+    graph = copy.deepcopy(graph_anna)
+    before = _snapshot(graph)
+    e = build_task("E")
+    edge_a_c = graph.get_digraph_copy().edges[task_A.id, task_C.id]["domain_model"]
+    with pytest.raises(ValueError, match="cycle"):
+        graph.apply_changes(
+            [
+                AddTask(task=e),
+                AddEdge(edge=build_edge(task_D, e)),
+                RemoveEdge(edge_id=edge_a_c.id),
+                RemoveTask(task_id=task_C.id),
+                AddEdge(edge=build_edge(e, task_A)),  # A --> B --> D --> E --> A
+            ]
+        )
+    assert _snapshot(graph) == before
+
+
+def test_exception_inside_batch_rolls_back() -> None:
+    graph = copy.deepcopy(graph_anna)
+    before = _snapshot(graph)
+    with pytest.raises(RuntimeError), graph.batch():
+        graph.remove_task(task_B.id)
+        graph.add_task(build_task("E"))
+        raise RuntimeError("something unrelated went wrong")
+    assert _snapshot(graph) == before
+
+
+def test_failing_inner_batch_only_rolls_back_its_own_changes() -> None:
+    graph = copy.deepcopy(graph_anna)
+    e, f = build_task("E"), build_task("F")
+    with graph.batch():
+        graph.add_task(e)
+        with pytest.raises(ValueError), graph.batch():
+            graph.add_task(f)
+            graph.add_task(f)
+        graph.add_edge(build_edge(task_D, e))
+    assert graph.get_task_by_external_id("E") == e
+    with pytest.raises(ValueError):
+        graph.get_task_by_external_id("F")
+    assert graph.calculate_planned_starting_time_of_task(e.id) == graph.calculate_planned_finish_time_of_task(task_D.id)
+
+
+def test_schedule_maintenance_is_deferred_until_the_batch_is_left() -> None:
+    graph = copy.deepcopy(graph_anna)
+    state = graph._get_schedule_state()
+    e = build_task("E", 60)
+    with graph.batch():
+        graph.add_task(e)
+        graph.add_edge(build_edge(task_D, e))
+        assert not state._earliest_start_dirty
+    assert graph.calculate_planned_finish_time_of_graph() == graph.calculate_planned_finish_time_of_task(e.id)
+    assert graph.calculate_planned_finish_time_of_task(e.id) == graph.calculate_planned_finish_time_of_task(
+        task_D.id
+    ) + timedelta(minutes=60)
+
+
+def test_read_query_inside_a_batch_sees_the_staged_state() -> None:
+    graph = TaskDependencyGraph(task_list=[], dependency_list=[], starting_time_of_run=starting_time_of_run_3)
+    graph.create_schedule_report()
+    a, b = build_task("A", 10), build_task("B", 20)
+    with graph.batch():
+        graph.add_task(a)
+        graph.add_task(b)
+        graph.add_edge(build_edge(a, b))
+        assert graph.calculate_planned_starting_time_of_task(b.id) == starting_time_of_run_3 + timedelta(minutes=10)
+    assert graph.calculate_planned_finish_time_of_graph() == starting_time_of_run_3 + timedelta(minutes=30)
+
+
+def test_graph_changes_can_be_parsed() -> None:
+    e = build_task("E")
+    changes: list[GraphChange] = [AddTask(task=e), RemoveTask(task_id=e.id)]
+    adapter = TypeAdapter(list[GraphChange])
+    assert adapter.validate_json(adapter.dump_json(changes)) == changes
+
+
+def _observable_order(tdg: TaskDependencyGraph) -> tuple[object, ...]:
+    return (
+        tdg.create_schedule_report(include_artificial_nodes=True),
+        tdg.get_critical_path_task_ids(),
+        list(tdg.get_critical_path_task_id_paths()),
+        tdg.to_dot(),
+        tdg.to_mermaid_gantt(),
+        list(tdg.get_digraph_view().edges),
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_rollback_restores_the_order_of_the_graph(seed: int) -> None:
+    """
+    the order of the graph decides which of several tied critical paths is reported; a rollback must restore it, too
+    """
+    rng = random.Random(seed)
+    tasks = [build_task(f"T{index}") for index in range(12)]
+    edges = [
+        build_edge(tasks[predecessor], tasks[successor])
+        for successor in range(2, len(tasks))
+        for predecessor in rng.sample(range(successor), 2)
+    ]
+    graph = TaskDependencyGraph(task_list=tasks, dependency_list=edges, starting_time_of_run=starting_time_of_run_3)
+    assert graph.count_critical_paths() > 1
+    before = _observable_order(graph)
+    first, second, third = rng.sample(tasks, 3)
+    e = build_task("E")
+    with pytest.raises(ValueError):
+        graph.apply_changes(
+            [
+                UpdateTask(task_id=third.id, changes={"planned_duration": timedelta(minutes=1)}),
+                RemoveTask(task_id=first.id),
+                RemoveTask(task_id=second.id),
+                UpdateTask(task_id=third.id, changes={"planned_duration": timedelta(minutes=9)}),
+                AddTask(task=e),
+                AddEdge(edge=build_edge(third, e)),
+                RemoveTask(task_id=first.id),  # has been removed already
+            ]
+        )
+    assert _observable_order(graph) == before
@@ -0,0 +1,122 @@
+"""
+tests for the parallel computation of the schedule reports of many graphs
+"""
+
+import copy
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from taskdependencygraph.batch_scheduling import (
+    create_schedule_reports,
+    decode_graph_definition,
+    encode_graph_definition,
+)
+from taskdependencygraph.models.graph_definition import GraphDefinition
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+from .example_data_for_test_task_dependency_graph import build_edge, build_task, starting_time_of_run_3
+from .example_tdgs import graph_anna, graph_bernd, graph_carmen, graph_daniel, graph_emily, graph_ferdinand
+
+_GRAPHS = [graph_anna, graph_bernd, graph_carmen, graph_daniel, graph_emily, graph_ferdinand]
+
+
+def test_the_encoding_keeps_everything_the_schedule_depends_on() -> None:
+    start = datetime(2024, 3, 1, 8, 0, tzinfo=timezone(timedelta(hours=1)))
+    tasks = [
+        TaskNode(
+            id=TaskId(uuid.uuid4()),
+            external_id="MS1000",
+            name="Beginn der Migration ✓",
+            phase="1000",
+            tags=["IS-U"],
+            planned_duration=timedelta(minutes=90, microseconds=1),
+            earliest_starttime=start + timedelta(hours=2),
+        ),
+        TaskNode(
+            id=TaskId(uuid.uuid4()), external_id="MS2", name="M", planned_duration=timedelta(0), is_milestone=True
+        ),
+    ]
+    definition = GraphDefinition(task_list=tasks, dependency_list=[], starting_time_of_run=start)
+    decoded = decode_graph_definition(encode_graph_definition(definition))
+    assert decoded.starting_time_of_run == start
+    assert decoded.starting_time_of_run.utcoffset() == timedelta(hours=1)
+    assert decoded.dependency_list == []
+    fields = {"id", "external_id", "name", "phase", "tags", "planned_duration", "is_milestone", "earliest_starttime"}
+    for original, task in zip(tasks, decoded.task_list, strict=True):
+        assert task.model_dump(include=fields) == original.model_dump(include=fields)
+    definition = copy.deepcopy(graph_ferdinand).to_graph_definition()
+    decoded = decode_graph_definition(encode_graph_definition(definition))
+    assert decoded.dependency_list == definition.dependency_list
+    with pytest.raises(ValueError):
+        encode_graph_definition(definition.model_copy(update={"task_list": definition.task_list[1:]}))
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_reports_match_the_reports_of_the_graphs(processes: int) -> None:
+    graphs: list[TaskDependencyGraph | GraphDefinition] = [copy.deepcopy(graph) for graph in _GRAPHS]
+    graphs.append(copy.deepcopy(graph_anna).to_graph_definition())
+    results = list(create_schedule_reports(graphs, processes=processes, chunk_size=2, include_artificial_nodes=True))
+    assert sorted(result.index for result in results) == list(range(len(graphs)))
+    for result in results:
+        graph = graphs[result.index]
+        if isinstance(graph, GraphDefinition):
+            graph = TaskDependencyGraph(
+                task_list=graph.task_list,
+                dependency_list=graph.dependency_list,
+                starting_time_of_run=graph.starting_time_of_run,
+            )
+        assert result.report == graph.create_schedule_report(include_artificial_nodes=True)
+        assert result.computation_time > timedelta(0)
+
+
+def test_stopping_early_and_invalid_arguments() -> None:
+    graphs = [copy.deepcopy(graph) for graph in _GRAPHS * 4]
+    results = create_schedule_reports(graphs, processes=2, chunk_size=1)
+    assert next(results).report.entries
+    results.close()  # cancels the chunks that haven't been started yet
+    with pytest.raises(ValueError):
+        create_schedule_reports(graphs, chunk_size=0)
+    with pytest.raises(ValueError):
+        create_schedule_reports(graphs, processes=0)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_reports_of_modified_graphs_with_tied_paths_match_the_reports_of_the_graphs(processes: int) -> None:
+    a, b, c, d, e, f, g = (build_task(external_id, 10) for external_id in "ABCDEFG")
+    a_c, b_c, a_d, b_d, c_e, d_e, e_f = (
+        build_edge(predecessor, successor)
+        for predecessor, successor in [(a, c), (b, c), (a, d), (b, d), (c, e), (d, e), (e, f)]
+    )
+    graph = TaskDependencyGraph(
+        task_list=[a, b, c, d, e, f, g],
+        dependency_list=[a_c, b_c, a_d, b_d, c_e, d_e, e_f],
+        starting_time_of_run=starting_time_of_run_3,
+    )
+    # all paths through E are tied: the re-added edges move to the end of the predecessors and successors
+    for edge in [a_c, c_e]:
+        graph.remove_edge(edge.id)
+        graph.add_edge(edge)
+    graph.remove_task(f.id)
+    # with G as long as these paths, E (which has no successor now) is connected to the end node after G
+    graph_with_tied_sinks = copy.deepcopy(graph)
+    graph_with_tied_sinks.update_task(g.id, planned_duration=timedelta(minutes=30))
+    graphs = [graph, graph_with_tied_sinks]
+    results = list(create_schedule_reports(graphs, processes=processes, include_artificial_nodes=True))
+    assert len(results) == len(graphs)
+    for result in results:
+        assert result.report == graphs[result.index].create_schedule_report(include_artificial_nodes=True)
+    definition = graph.to_graph_definition()
+    rebuilt = TaskDependencyGraph(
+        task_list=definition.task_list,
+        dependency_list=definition.dependency_list,
+        starting_time_of_run=definition.starting_time_of_run,
+    )
+    for task_id in graph.get_digraph_view().nodes:
+        if task_id != ID_OF_ARTIFICIAL_ENDNODE:
+            assert list(rebuilt.get_digraph_view().pred[task_id]) == list(graph.get_digraph_view().pred[task_id])
+            assert list(rebuilt.get_digraph_view().succ[task_id]) == list(graph.get_digraph_view().succ[task_id])
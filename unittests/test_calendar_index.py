@@ -0,0 +1,89 @@
+"""
+tests for the compiled working calendar
+"""
+
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from taskdependencygraph.calendar_index import CalendarIndex
+from taskdependencygraph.models.working_calendar import TimeInterval, WorkingCalendar
+
+_T0 = datetime(2024, 1, 1, 0, 0, 0, tzinfo=UTC)
+
+
+def _interval(start_minute: int, end_minute: int) -> TimeInterval:
+    return TimeInterval(start=_T0 + timedelta(minutes=start_minute), end=_T0 + timedelta(minutes=end_minute))
+
+
+def _minute(moment: datetime) -> int:
+    return (moment - _T0) // timedelta(minutes=1)
+
+
+def test_overlapping_intervals_are_merged_and_blackouts_cut_out() -> None:
+    calendar = WorkingCalendar(
+        working_intervals=[_interval(0, 60), _interval(30, 90), _interval(90, 120), _interval(200, 300)],
+        blackout_periods=[_interval(100, 110), _interval(115, 250), _interval(280, 290)],
+    )
+    index = CalendarIndex.from_calendar(calendar)
+    # working time: [0, 100) + [110, 115) + [250, 280) + [290, 300)
+    assert index.working_time_until(_T0 + timedelta(minutes=300)) == timedelta(minutes=145)
+    assert index.next_working_moment(_T0 + timedelta(minutes=100)) == _T0 + timedelta(minutes=110)
+    assert index.next_working_moment(_T0 + timedelta(minutes=115)) == _T0 + timedelta(minutes=250)
+    assert index.add_working_time(_T0 + timedelta(minutes=95), timedelta(minutes=10)) == _T0 + timedelta(minutes=115)
+    assert index.add_working_time(_T0 + timedelta(minutes=95), timedelta(minutes=11)) == _T0 + timedelta(minutes=251)
+
+
+def test_running_out_of_working_time() -> None:
+    index = CalendarIndex.from_calendar(WorkingCalendar(working_intervals=[_interval(0, 60)]))
+    assert index.add_working_time(_T0, timedelta(minutes=60)) == _T0 + timedelta(minutes=60)
+    with pytest.raises(ValueError, match="enough working time after"):
+        index.add_working_time(_T0, timedelta(minutes=61))
+    with pytest.raises(ValueError, match="enough working time after"):
+        index.next_working_moment(_T0 + timedelta(minutes=60))
+    with pytest.raises(ValueError, match="enough working time before"):
+        index.subtract_working_time(_T0 + timedelta(minutes=30), timedelta(minutes=31))
+
+
+def test_queries_agree_with_a_minute_by_minute_walk() -> None:
+    rng = random.Random(3)
+    for _ in range(20):
+        working_intervals = []
+        for _ in range(rng.randint(1, 15)):
+            start = rng.randrange(0, 1000)
+            working_intervals.append(_interval(start, start + rng.randint(1, 80)))
+        blackout_periods = []
+        for _ in range(rng.randint(0, 5)):
+            start = rng.randrange(0, 1000)
+            blackout_periods.append(_interval(start, start + rng.randint(1, 50)))
+        index = CalendarIndex.from_calendar(
+            WorkingCalendar(working_intervals=working_intervals, blackout_periods=blackout_periods)
+        )
+        is_working_minute = [
+            any(i.start <= _T0 + timedelta(minutes=m) < i.end for i in working_intervals)
+            and not any(b.start <= _T0 + timedelta(minutes=m) < b.end for b in blackout_periods)
+            for m in range(1200)
+        ]
+        working_minutes = [m for m, is_working in enumerate(is_working_minute) if is_working]
+        for _ in range(50):
+            minute = rng.randrange(0, 1100)
+            moment = _T0 + timedelta(minutes=minute)
+            assert index.working_time_until(moment) == timedelta(minutes=sum(is_working_minute[:minute]))
+            later_working_minutes = [m for m in working_minutes if m >= minute]
+            if later_working_minutes:
+                assert _minute(index.next_working_moment(moment)) == later_working_minutes[0]
+            duration = rng.randint(1, 60)
+            if len(later_working_minutes) >= duration:
+                # the task works in the minutes later_working_minutes[:duration] and finishes at the end of the last
+                finish = index.add_working_time(moment, timedelta(minutes=duration))
+                assert _minute(finish) == later_working_minutes[duration - 1] + 1
+                # starting later than the returned latest start can't finish in time
+                latest_start = index.subtract_working_time(finish, timedelta(minutes=duration))
+                assert (
+                    index.add_working_time(index.next_working_moment(latest_start), timedelta(minutes=duration))
+                    == finish
+                )
+                one_minute_later = latest_start + timedelta(minutes=1)
+                if len([m for m in working_minutes if m >= _minute(one_minute_later)]) >= duration:
+                    assert index.add_working_time(one_minute_later, timedelta(minutes=duration)) > finish
@@ -0,0 +1,145 @@
+"""
+tests for the array backed CompactTaskGraph
+"""
+
+# pylint:disable=protected-access
+import copy
+import itertools
+import random
+import sys
+from array import array
+from datetime import timedelta
+
+import pytest
+
+from taskdependencygraph.compact_task_graph import NO_EARLIEST_START, CompactTaskGraph, to_epoch_microseconds
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+from .example_data_for_test_task_dependency_graph import build_edge, build_task, starting_time_of_run_3
+from .example_tdgs import graph_anna, graph_bernd, graph_carmen, graph_daniel, graph_emily, graph_ferdinand
+
+
+@pytest.mark.parametrize("graph", [graph_anna, graph_bernd, graph_carmen, graph_daniel, graph_emily, graph_ferdinand])
+def test_passes_match_the_schedule_of_the_tdg(graph: TaskDependencyGraph) -> None:
+    tdg = copy.deepcopy(graph)
+    order = tdg._get_topological_order().ordered_node_ids
+    compact = CompactTaskGraph.from_graph(tdg._graph, order)
+    state = tdg._get_schedule_state()
+    earliest_starts = compact.compute_earliest_starts(tdg._starting_time_of_run)
+    remaining_durations = compact.compute_remaining_durations()
+    for index, task_id in enumerate(compact.task_ids):
+        assert timedelta(microseconds=earliest_starts[index]) == state.earliest_start[task_id]
+        assert timedelta(microseconds=remaining_durations[index]) == state.remaining_duration[task_id]
+
+
+def test_from_tasks_sorts_topologically_and_builds_both_adjacencies() -> None:
+    a, b, c, d = build_task("A", 10), build_task("B", 20), build_task("C", 5), build_task("D", 1)
+    compact = CompactTaskGraph.from_tasks(
+        [d, c, b, a], [build_edge(a, b), build_edge(a, c), build_edge(b, d), build_edge(c, d)]
+    )
+    index = compact.index_of
+    assert index[a.id] < index[b.id] < index[d.id]
+    assert index[a.id] < index[c.id] < index[d.id]
+    successors_of_a = compact.successor_indices[
+        compact.successor_offsets[index[a.id]] : compact.successor_offsets[index[a.id] + 1]
+    ]
+    assert sorted(successors_of_a) == sorted([index[b.id], index[c.id]])
+    predecessors_of_d = compact.predecessor_indices[
+        compact.predecessor_offsets[index[d.id]] : compact.predecessor_offsets[index[d.id] + 1]
+    ]
+    assert sorted(predecessors_of_d) == sorted([index[b.id], index[c.id]])
+    earliest_starts = compact.compute_earliest_starts(starting_time_of_run_3)
+    assert earliest_starts[index[d.id]] == 30 * 60 * 1_000_000
+    assert compact.compute_remaining_durations()[index[a.id]] == 31 * 60 * 1_000_000
+    assert len(compact) == 4
+
+
+def test_earliest_starttime_is_respected_and_ignored_before_the_run() -> None:
+    early = build_task("early", 10, earliest_start=starting_time_of_run_3 - timedelta(hours=1))
+    late = build_task("late", 10, earliest_start=starting_time_of_run_3 + timedelta(hours=1))
+    plain = build_task("plain", 10)
+    compact = CompactTaskGraph.from_tasks([early, late, plain], [build_edge(early, late)])
+    assert compact.earliest_start[compact.index_of[plain.id]] == NO_EARLIEST_START
+    earliest_starts = compact.compute_earliest_starts(starting_time_of_run_3)
+    assert earliest_starts[compact.index_of[early.id]] == 0
+    assert earliest_starts[compact.index_of[late.id]] == 60 * 60 * 1_000_000
+    assert earliest_starts[compact.index_of[plain.id]] == 0
+
+
+def test_cycles_and_unknown_tasks_are_rejected() -> None:
+    a, b = build_task("A", 1), build_task("B", 1)
+    with pytest.raises(ValueError, match="cycle"):
+        CompactTaskGraph.from_tasks([a, b], [build_edge(a, b), build_edge(b, a)])
+    with pytest.raises(ValueError, match="not part of the tasks"):
+        CompactTaskGraph.from_tasks([a], [build_edge(a, b)])
+
+
+def _random_wide_graph(seed: int, number_of_levels: int, width: int) -> CompactTaskGraph:
+    rng = random.Random(seed)
+    levels = [
+        [
+            build_task(
+                f"{level}-{i}",
+                rng.randint(0, 60),
+                earliest_start=starting_time_of_run_3 + timedelta(minutes=rng.randint(-60, 600))
+                if rng.random() < 0.1
+                else None,
+            )
+            for i in range(width)
+        ]
+        for level in range(number_of_levels)
+    ]
+    edges = {
+        (predecessor.id, successor.id): build_edge(predecessor, successor)
+        for level in range(1, number_of_levels)
+        for successor in levels[level]
+        for predecessor in rng.sample(levels[rng.randrange(level)], 2)
+    }
+    return CompactTaskGraph.from_tasks([task for level in levels for task in level], list(edges.values()))
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_numpy_backend_matches_python_backend(seed: int) -> None:
+    pytest.importorskip("numpy")
+    compact = _random_wide_graph(seed, number_of_levels=6, width=40)
+    assert compact.compute_earliest_starts(starting_time_of_run_3, backend="numpy") == compact.compute_earliest_starts(
+        starting_time_of_run_3, backend="python"
+    )
+    assert compact.compute_remaining_durations(backend="numpy") == compact.compute_remaining_durations(backend="python")
+
+
+def test_auto_backend_uses_numpy_only_for_large_and_wide_graphs() -> None:
+    pytest.importorskip("numpy")
+    small = _random_wide_graph(1, number_of_levels=3, width=10)
+    assert small._get_levels("auto") is None
+    wide = _random_wide_graph(1, number_of_levels=4, width=600)
+    assert wide._get_levels("auto") is not None
+    chain = [build_task(f"T{i}", 1) for i in range(2_500)]
+    deep = CompactTaskGraph.from_tasks(chain, [build_edge(a, b) for a, b in itertools.pairwise(chain)])
+    assert deep._get_levels("auto") is None
+    assert deep._get_levels("numpy") is not None
+    assert deep.compute_earliest_starts(starting_time_of_run_3, backend="auto") == deep.compute_earliest_starts(
+        starting_time_of_run_3, backend="numpy"
+    )
+
+
+def test_numpy_backend_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "taskdependencygraph.vectorized_passes", None)
+    compact = _random_wide_graph(1, number_of_levels=2, width=5)
+    with pytest.raises(ImportError, match="numpy"):
+        compact.compute_earliest_starts(starting_time_of_run_3, backend="numpy")
+    assert len(compact.compute_earliest_starts(starting_time_of_run_3, backend="auto")) == 10
+
+
+def test_with_earliest_starts_shares_everything_else() -> None:
+    a, b = build_task("A", 10), build_task("B", 20)
+    compact = CompactTaskGraph.from_tasks([a, b], [build_edge(a, b)])
+    sibling = compact.with_earliest_starts(
+        array("q", [NO_EARLIEST_START, to_epoch_microseconds(starting_time_of_run_3 + timedelta(hours=1))])
+    )
+    assert sibling.duration is compact.duration
+    assert sibling.successor_indices is compact.successor_indices
+    assert compact.compute_earliest_starts(starting_time_of_run_3)[compact.index_of[b.id]] == 10 * 60 * 1_000_000
+    assert sibling.compute_earliest_starts(starting_time_of_run_3)[sibling.index_of[b.id]] == 60 * 60 * 1_000_000
+    with pytest.raises(ValueError):
+        compact.with_earliest_starts(array("q"))
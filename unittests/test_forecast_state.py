@@ -0,0 +1,201 @@
+"""
+tests for the forecast of a TDG at a status date, based on the actual start and finish times of the tasks
+"""
+
+# pylint:disable=protected-access
+import copy
+import random
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from taskdependencygraph.forecast_state import ForecastState
+from taskdependencygraph.models.forecast_entry import ForecastEntry
+from taskdependencygraph.models.ids import TaskDependencyId, TaskId
+from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+from .example_tdgs import graph_anna, task_A, task_B, task_C, task_D
+
+# graph_anna: A (5min) -> B (20min) -> D (4min) and A -> C (1min)
+
+
+def _minutes(minutes: int) -> timedelta:
+    return timedelta(minutes=minutes)
+
+
+def test_without_progress_the_forecast_at_the_start_of_the_run_equals_the_plan() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph._starting_time_of_run
+    for task in (task_A, task_B, task_C, task_D):
+        assert graph.calculate_forecast_starting_time_of_task(
+            task.id, t0
+        ) == graph.calculate_planned_starting_time_of_task(task.id)
+    assert graph.calculate_forecast_finish_time_of_graph(t0) == graph.calculate_planned_finish_time_of_graph()
+
+
+def test_completed_running_and_pending_tasks() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph._starting_time_of_run
+    status_date = t0 + _minutes(30)
+    graph.update_task(task_A.id, actual_starttime=t0 + _minutes(2), actual_finishtime=t0 + _minutes(10))
+    graph.update_task(task_B.id, actual_starttime=t0 + _minutes(12))
+    # A is fixed
+    assert graph.calculate_forecast_starting_time_of_task(task_A.id, status_date) == t0 + _minutes(2)
+    assert graph.calculate_forecast_finish_time_of_task(task_A.id, status_date) == t0 + _minutes(10)
+    # B is running: 20min after its actual start
+    assert graph.calculate_forecast_finish_time_of_task(task_B.id, status_date) == t0 + _minutes(32)
+    # C could have started after A, but it hasn't started yet
+    assert graph.calculate_forecast_starting_time_of_task(task_C.id, status_date) == status_date
+    assert graph.calculate_forecast_starting_time_of_task(task_D.id, status_date) == t0 + _minutes(32)
+    assert graph.calculate_forecast_finish_time_of_graph(status_date) == t0 + _minutes(36)
+    # B is overdue at a later status date: it finishes "now" at the earliest
+    later = t0 + _minutes(40)
+    assert graph.calculate_forecast_finish_time_of_task(task_B.id, later) == later
+    assert graph.calculate_forecast_finish_time_of_graph(later) == later + _minutes(4)
+    # the plan is not affected by the actual times
+    assert graph.calculate_planned_finish_time_of_graph() == t0 + _minutes(29)
+
+
+def test_a_finished_graph_finishes_with_its_last_task() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph._starting_time_of_run
+    with graph.batch():
+        for task in (task_A, task_B, task_C, task_D):
+            graph.update_task(task.id, actual_starttime=t0, actual_finishtime=t0 + _minutes(1))
+    assert graph.calculate_forecast_finish_time_of_graph(t0 + _minutes(60)) == t0 + _minutes(1)
+
+
+def test_invalid_task_ids_are_rejected() -> None:
+    graph = copy.deepcopy(graph_anna)
+    with pytest.raises(ValueError, match="not a real task"):
+        graph.calculate_forecast_starting_time_of_task(TaskId(uuid.uuid4()), graph._starting_time_of_run)
+    with pytest.raises(ValueError, match="not a real task"):
+        graph.calculate_forecast_finish_time_of_task(ID_OF_ARTIFICIAL_ENDNODE, graph._starting_time_of_run)
+
+
+def test_recording_progress_only_re_evaluates_the_downstream_cone() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph._starting_time_of_run
+    state = graph._get_forecast_state(t0)
+    graph.update_task(task_C.id, actual_starttime=t0 + _minutes(7))
+    evaluated = state.update(graph._graph, t0, graph._version)
+    # C still finishes long before D; the propagation stops at the artificial end node
+    assert evaluated == {task_C.id, ID_OF_ARTIFICIAL_ENDNODE}
+    assert graph._get_forecast_state(t0) is state
+    graph.update_task(task_A.id, actual_starttime=t0, actual_finishtime=t0 + _minutes(8))
+    assert graph.calculate_forecast_finish_time_of_task(task_D.id, t0) == t0 + _minutes(32)
+    assert graph._get_forecast_state(t0) is state
+    # a new status date starts over
+    assert graph._get_forecast_state(t0 + _minutes(1)) is not state
+
+
+_T0 = datetime(2024, 1, 1, 0, 0, 0, tzinfo=UTC)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_updates_match_a_full_recomputation(seed: int) -> None:
+    rng = random.Random(seed)
+    status_date = _T0 + _minutes(60)
+    graph = TaskDependencyGraph(task_list=[], dependency_list=[], starting_time_of_run=_T0)
+    task_ids: list[TaskId] = []
+    for step in range(150):
+        action = rng.random()
+        if action < 0.3 or len(task_ids) < 2:
+            task = TaskNode(
+                id=TaskId(uuid.uuid4()),
+                external_id=f"T{step}",
+                name=f"T{step}",
+                planned_duration=_minutes(rng.randint(0, 30)),
+                earliest_starttime=_T0 + _minutes(rng.randint(0, 120)) if rng.random() < 0.2 else None,
+            )
+            graph.add_task(task)
+            task_ids.append(task.id)
+        elif action < 0.6:
+            predecessor, successor = rng.sample(task_ids, 2)
+            edge = TaskDependencyEdge(
+                id=TaskDependencyId(uuid.uuid4()), task_predecessor=predecessor, task_successor=successor
+            )
+            if graph.can_edge_be_added(edge).can_be_added:
+                graph.add_edge(edge)
+        elif action < 0.7:
+            graph.update_task(rng.choice(task_ids), planned_duration=_minutes(rng.randint(0, 30)))
+        elif action < 0.95:
+            actual_start = _T0 + _minutes(rng.randint(0, 60))
+            with graph.batch():
+                graph.update_task(
+                    rng.choice(task_ids),
+                    actual_starttime=actual_start,
+                    actual_finishtime=actual_start + _minutes(rng.randint(0, 40)) if rng.random() < 0.5 else None,
+                )
+        else:
+            graph.remove_task(task_ids.pop(rng.randrange(len(task_ids))))
+        if step % 5 == 0:
+            state = graph._get_forecast_state(status_date)
+            fresh = ForecastState.compute(
+                graph._graph, _T0, status_date, graph._version, graph._get_topological_order()
+            )
+            assert state.start == fresh.start
+            assert state.finish == fresh.finish
+
+
+def test_changing_a_duration_moves_the_forecast_like_in_a_new_graph() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph._starting_time_of_run
+    status_date = t0 + _minutes(2)
+    graph.update_task(task_C.id, actual_starttime=t0 + _minutes(5))
+    graph.calculate_forecast_finish_time_of_graph(status_date)  # the forecast is cached from here on
+    graph.update_task(task_A.id, planned_duration=_minutes(60))
+    graph.update_task(task_C.id, planned_duration=_minutes(90))
+    definition = graph.to_graph_definition()
+    fresh = TaskDependencyGraph(
+        task_list=definition.task_list,
+        dependency_list=definition.dependency_list,
+        starting_time_of_run=definition.starting_time_of_run,
+    )
+    for task in (task_A, task_B, task_C, task_D):
+        assert graph.calculate_forecast_starting_time_of_task(
+            task.id, status_date
+        ) == fresh.calculate_forecast_starting_time_of_task(task.id, status_date)
+        assert graph.calculate_forecast_finish_time_of_task(
+            task.id, status_date
+        ) == fresh.calculate_forecast_finish_time_of_task(task.id, status_date)
+    assert graph.calculate_forecast_finish_time_of_task(task_A.id, status_date) == status_date + _minutes(60)
+    assert graph.calculate_forecast_finish_time_of_graph(status_date) == fresh.calculate_forecast_finish_time_of_graph(
+        status_date
+    )
+
+
+def test_update_forecast_returns_the_changed_entries_only() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph._starting_time_of_run
+    assert {entry.task_id for entry in graph.update_forecast(t0)} == {task_A.id, task_B.id, task_C.id, task_D.id}
+    assert graph.update_forecast(t0) == []
+    graph.update_task(task_C.id, actual_starttime=t0 + _minutes(7))
+    assert graph.update_forecast(t0) == [
+        ForecastEntry(task_id=task_C.id, forecast_start=t0 + _minutes(7), forecast_finish=t0 + _minutes(8))
+    ]
+    graph.update_task(task_B.id, actual_starttime=t0 + _minutes(6))
+    # other forecast queries don't swallow the changes
+    assert graph.calculate_forecast_finish_time_of_task(task_D.id, t0) == t0 + _minutes(30)
+    assert [entry.task_id for entry in graph.update_forecast(t0)] == [task_B.id, task_D.id]
+
+
+def test_a_full_reforecast_only_returns_the_tasks_that_moved() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph._starting_time_of_run
+    graph.update_forecast(t0)
+    # the batch affects all tasks, so the forecast is re-computed from scratch, but nothing moves
+    with graph.batch():
+        for task in (task_A, task_B, task_C, task_D):
+            graph.update_task(task.id, earliest_starttime=t0)
+    assert graph.update_forecast(t0) == []
+    assert graph.update_forecast(t0 + _minutes(1)) == [
+        ForecastEntry(task_id=task_A.id, forecast_start=t0 + _minutes(1), forecast_finish=t0 + _minutes(6)),
+        ForecastEntry(task_id=task_B.id, forecast_start=t0 + _minutes(6), forecast_finish=t0 + _minutes(26)),
+        ForecastEntry(task_id=task_C.id, forecast_start=t0 + _minutes(6), forecast_finish=t0 + _minutes(7)),
+        ForecastEntry(task_id=task_D.id, forecast_start=t0 + _minutes(26), forecast_finish=t0 + _minutes(30)),
+    ]
@@ -0,0 +1,133 @@
+"""
+tests for the ready set of a TDG, i.e. the tasks whose predecessors are all finished, but which haven't been requested
+"""
+
+# pylint:disable=protected-access
+import copy
+import random
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from taskdependencygraph.models.ids import TaskDependencyId, TaskId
+from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
+from taskdependencygraph.models.task_execution_status import TaskExecutionStatus
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+from .example_tdgs import graph_anna, task_A, task_B, task_C, task_D
+
+# graph_anna: A (5min) -> B (20min) -> D (4min) and A -> C (1min)
+
+
+def _ready_ids(graph: TaskDependencyGraph, order_by: str = "total_slack") -> list[TaskId]:
+    return [task.id for task in graph.get_ready_tasks(order_by=order_by)]  # type:ignore[arg-type]
+
+
+def test_tasks_become_ready_when_their_predecessors_are_finished() -> None:
+    graph = copy.deepcopy(graph_anna)
+    assert _ready_ids(graph) == [task_A.id]
+    graph.update_task(task_A.id, execution_status=TaskExecutionStatus.REQUESTED)
+    assert _ready_ids(graph) == []
+    assert not graph.is_task_ready(task_A.id)
+    graph.update_task(task_A.id, execution_status=TaskExecutionStatus.COMPLETED)
+    # B is on the critical path, C has 19min slack
+    assert _ready_ids(graph) == [task_B.id, task_C.id]
+    assert _ready_ids(graph, "planned_start") == [task_B.id, task_C.id]
+    assert [task.id for task in graph.get_ready_tasks(limit=1)] == [task_B.id]
+    graph.update_task(task_C.id, execution_status=TaskExecutionStatus.OBSOLETE)
+    graph.update_task(task_B.id, execution_status=TaskExecutionStatus.STARTED)
+    assert _ready_ids(graph) == []
+    graph.update_task(task_B.id, execution_status=TaskExecutionStatus.COMPLETED)
+    assert _ready_ids(graph) == [task_D.id]
+    assert graph.is_task_ready(task_D.id)
+    # reopening a finished task blocks its successors again
+    graph.update_task(task_B.id, execution_status=TaskExecutionStatus.STARTED)
+    assert _ready_ids(graph) == []
+
+
+def test_structural_modifications_and_rollbacks_keep_the_ready_set_up_to_date() -> None:
+    graph = copy.deepcopy(graph_anna)
+    assert _ready_ids(graph) == [task_A.id]
+    graph.remove_task(task_A.id)
+    assert set(_ready_ids(graph)) == {task_B.id, task_C.id}
+    edge = TaskDependencyEdge(id=TaskDependencyId(uuid.uuid4()), task_predecessor=task_C.id, task_successor=task_B.id)
+    graph.add_edge(edge)
+    assert _ready_ids(graph) == [task_C.id]
+    with pytest.raises(RuntimeError), graph.batch():
+        graph.remove_edge(edge.id)
+        graph.update_task(task_C.id, execution_status=TaskExecutionStatus.COMPLETED)
+        assert _ready_ids(graph) == [task_B.id]
+        raise RuntimeError("rollback")
+    assert _ready_ids(graph) == [task_C.id]
+
+
+def test_ready_set_rejects_invalid_arguments() -> None:
+    graph = copy.deepcopy(graph_anna)
+    with pytest.raises(ValueError):
+        graph.is_task_ready(ID_OF_ARTIFICIAL_STARTNODE)
+    with pytest.raises(ValueError):
+        graph.get_ready_tasks(limit=-1)
+    with pytest.raises(ValueError):
+        graph.get_ready_tasks(order_by="name")  # type:ignore[arg-type]
+
+
+_T0 = datetime(2024, 1, 1, 0, 0, 0, tzinfo=UTC)
+_STATUSES = [None, *TaskExecutionStatus]
+
+
+def _brute_force_ready_ids(graph: TaskDependencyGraph, task_ids: list[TaskId]) -> set[TaskId]:
+    finished = (TaskExecutionStatus.COMPLETED, TaskExecutionStatus.OBSOLETE)
+    return {
+        tid
+        for tid in task_ids
+        if graph._graph.nodes[tid]["domain_model"].execution_status in (None, TaskExecutionStatus.NOT_YET_REQUESTED)
+        and all(
+            graph._graph.nodes[p]["domain_model"].execution_status in finished
+            for p in graph._graph.predecessors(tid)
+            if p != ID_OF_ARTIFICIAL_STARTNODE
+        )
+    }
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_updates_match_a_brute_force_scan(seed: int) -> None:
+    rng = random.Random(seed)
+    graph = TaskDependencyGraph(task_list=[], dependency_list=[], starting_time_of_run=_T0)
+    task_ids: list[TaskId] = []
+    for step in range(200):
+        action = rng.random()
+        if action < 0.25 or len(task_ids) < 2:
+            task = TaskNode(
+                id=TaskId(uuid.uuid4()),
+                external_id=f"T{step}",
+                name=f"T{step}",
+                planned_duration=timedelta(minutes=rng.randint(0, 30)),
+                execution_status=rng.choice(_STATUSES),
+            )
+            graph.add_task(task)
+            task_ids.append(task.id)
+        elif action < 0.5:
+            predecessor, successor = rng.sample(task_ids, 2)
+            edge = TaskDependencyEdge(
+                id=TaskDependencyId(uuid.uuid4()), task_predecessor=predecessor, task_successor=successor
+            )
+            if graph.can_edge_be_added(edge).can_be_added:
+                graph.add_edge(edge)
+        elif action < 0.9:
+            graph.update_task(rng.choice(task_ids), execution_status=rng.choice(_STATUSES))
+        else:
+            graph.remove_task(task_ids.pop(rng.randrange(len(task_ids))))
+        if step % 4 == 0:
+            expected = _brute_force_ready_ids(graph, task_ids)
+            ready_tasks = graph.get_ready_tasks()
+            assert {task.id for task in ready_tasks} == expected
+            slacks = [graph.calculate_total_slack_of_task(task.id) for task in ready_tasks]
+            assert slacks == sorted(slacks)
+            planned_starts = [
+                graph.calculate_planned_starting_time_of_task(task.id)
+                for task in graph.get_ready_tasks(order_by="planned_start")
+            ]
+            assert planned_starts == sorted(planned_starts)
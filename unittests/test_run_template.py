@@ -0,0 +1,142 @@
+"""
+tests for run templates and the (lightweight) runs created from them
+"""
+
+import copy
+import random
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from taskdependencygraph.models.ids import RunGroupId, RunId, TaskDependencyId, TaskId
+from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
+from taskdependencygraph.models.task_execution_status import TaskExecutionStatus
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.run_template import RunTemplate
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+from .example_tdgs import graph_anna, graph_bernd, graph_carmen, graph_daniel, graph_emily, graph_ferdinand, task_A
+
+_T0 = datetime(2024, 1, 1, 0, 0, 0, tzinfo=UTC)
+
+
+def _run_id() -> RunId:
+    return RunId(uuid.uuid4())
+
+
+@pytest.mark.parametrize("graph", [graph_anna, graph_bernd, graph_carmen, graph_daniel, graph_emily, graph_ferdinand])
+def test_runs_match_the_schedule_of_the_tdg(graph: TaskDependencyGraph) -> None:
+    tdg = copy.deepcopy(graph)
+    template = RunTemplate.from_task_dependency_graph(tdg)
+    run = template.create_run(_run_id(), tdg.starting_time_of_run)
+    assert len(template) == tdg.get_digraph_view().number_of_nodes() - 2
+    for task in template.tasks:
+        assert run.calculate_planned_starting_time_of_task(task.id) == tdg.calculate_planned_starting_time_of_task(
+            task.id
+        )
+        assert run.calculate_planned_finish_time_of_task(task.id) == tdg.calculate_planned_finish_time_of_task(task.id)
+        assert run.calculate_total_slack_of_task(task.id) == tdg.calculate_total_slack_of_task(task.id)
+    assert run.calculate_planned_finish_time_of_graph() == tdg.calculate_planned_finish_time_of_graph()
+
+
+def test_runs_only_store_their_own_start_overrides_and_statuses() -> None:
+    tdg = copy.deepcopy(graph_anna)
+    template = RunTemplate.from_task_dependency_graph(tdg)
+    rehearsal = template.create_run(_run_id(), _T0, run_group_id=RunGroupId(uuid.uuid4()))
+    cutover = template.create_run(
+        _run_id(), _T0 + timedelta(days=7), earliest_starttime_overrides={task_A.id: _T0 + timedelta(days=7, hours=1)}
+    )
+    assert rehearsal.template is cutover.template
+    assert rehearsal.calculate_planned_finish_time_of_graph() == _T0 + timedelta(minutes=29)
+    assert cutover.calculate_planned_finish_time_of_graph() == _T0 + timedelta(days=7, hours=1, minutes=29)
+    assert cutover.get_earliest_starttime(task_A.id) == _T0 + timedelta(days=7, hours=1)
+    assert rehearsal.get_earliest_starttime(task_A.id) is None
+    # resetting the override to the plan's value drops it
+    cutover.set_earliest_starttime(task_A.id, None)
+    assert cutover.earliest_starttime_overrides == {}
+    assert cutover.calculate_planned_finish_time_of_graph() == _T0 + timedelta(days=7, minutes=29)
+    rehearsal.set_execution_status(task_A.id, TaskExecutionStatus.COMPLETED)
+    assert rehearsal.get_execution_status(task_A.id) == TaskExecutionStatus.COMPLETED
+    assert cutover.get_execution_status(task_A.id) is None
+    with pytest.raises(ValueError):
+        rehearsal.get_execution_status(TaskId(uuid.uuid4()))
+
+
+def test_invalid_definitions_are_rejected() -> None:
+    task = TaskNode(id=TaskId(uuid.uuid4()), external_id="A", name="A", planned_duration=timedelta(minutes=1))
+    with pytest.raises(ValueError, match="Invalid graph definition"):
+        RunTemplate(
+            [task],
+            [
+                TaskDependencyEdge(
+                    id=TaskDependencyId(uuid.uuid4()), task_predecessor=task.id, task_successor=TaskId(uuid.uuid4())
+                )
+            ],
+        )
+
+
+def test_a_materialised_run_matches_the_run() -> None:
+    rng = random.Random(7)
+    tasks = [
+        TaskNode(
+            id=TaskId(uuid.uuid4()),
+            external_id=f"T{index}",
+            name=f"T{index}",
+            planned_duration=timedelta(minutes=rng.randint(0, 30)),
+            earliest_starttime=_T0 + timedelta(minutes=rng.randint(0, 300)) if rng.random() < 0.2 else None,
+        )
+        for index in range(200)
+    ]
+    dependencies = [
+        TaskDependencyEdge(
+            id=TaskDependencyId(uuid.uuid4()),
+            task_predecessor=tasks[predecessor].id,
+            task_successor=tasks[successor].id,
+        )
+        for successor in range(1, len(tasks))
+        for predecessor in rng.sample(range(successor), min(successor, 2))
+    ]
+    template = RunTemplate(tasks, dependencies)
+    run = template.create_run(_run_id(), _T0 + timedelta(hours=1))
+    for task in rng.sample(tasks, 20):
+        run.set_earliest_starttime(
+            task.id, _T0 + timedelta(minutes=rng.randint(0, 600)) if rng.random() < 0.8 else None
+        )
+        run.set_execution_status(task.id, rng.choice(list(TaskExecutionStatus)))
+    tdg = run.to_task_dependency_graph()
+    for task in tasks:
+        assert run.calculate_planned_starting_time_of_task(task.id) == tdg.calculate_planned_starting_time_of_task(
+            task.id
+        )
+        assert run.calculate_total_slack_of_task(task.id) == tdg.calculate_total_slack_of_task(task.id)
+        materialised_task = tdg.get_task_by_external_id(task.external_id)
+        assert materialised_task.execution_status == run.get_execution_status(task.id)
+        assert materialised_task.earliest_starttime == run.get_earliest_starttime(task.id)
+
+
+def test_a_materialised_run_keeps_the_order_of_the_plan() -> None:
+    rng = random.Random(3)
+    tasks = [
+        TaskNode(
+            id=TaskId(uuid.uuid4()), external_id=f"T{index}", name=f"T{index}", planned_duration=timedelta(minutes=5)
+        )
+        for index in range(30)
+    ]
+    # the tasks are passed in reverse topological order and all durations are equal, so there are many tied paths
+    dependencies = [
+        TaskDependencyEdge(
+            id=TaskDependencyId(uuid.uuid4()),
+            task_predecessor=tasks[predecessor].id,
+            task_successor=tasks[successor].id,
+        )
+        for predecessor in range(len(tasks) - 1)
+        for successor in rng.sample(range(predecessor + 1, len(tasks)), min(2, len(tasks) - predecessor - 1))
+    ]
+    tasks.reverse()
+    rng.shuffle(dependencies)
+    tdg = TaskDependencyGraph(task_list=tasks, dependency_list=dependencies, starting_time_of_run=_T0)
+    materialised = RunTemplate(tasks, dependencies).create_run(_run_id(), _T0).to_task_dependency_graph()
+    assert list(materialised.get_critical_path_task_id_paths()) == list(tdg.get_critical_path_task_id_paths())
+    assert materialised.to_dot() == tdg.to_dot()
+    assert materialised.to_mermaid_gantt() == tdg.to_mermaid_gantt()
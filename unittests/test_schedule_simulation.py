@@ -0,0 +1,190 @@
+"""
+tests for the Monte Carlo schedule simulation
+"""
+
+import copy
+import sys
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from taskdependencygraph.models.duration_distribution import (
+    DurationDistribution,
+    EmpiricalDuration,
+    LognormalDuration,
+    PertDuration,
+    TriangularDuration,
+)
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+from .example_data_for_test_task_dependency_graph import build_edge, build_task, starting_time_of_run_3
+from .example_tdgs import graph_anna, graph_bernd, graph_carmen, graph_daniel, graph_emily, graph_ferdinand
+
+np = pytest.importorskip("numpy")
+
+
+def _triangular(minimum: int, most_likely: int, maximum: int) -> TriangularDuration:
+    return TriangularDuration(
+        minimum=timedelta(minutes=minimum),
+        most_likely=timedelta(minutes=most_likely),
+        maximum=timedelta(minutes=maximum),
+    )
+
+
+@pytest.mark.parametrize("graph", [graph_anna, graph_bernd, graph_carmen, graph_daniel, graph_emily, graph_ferdinand])
+def test_simulation_without_uncertainty_reproduces_the_plan(graph: TaskDependencyGraph) -> None:
+    tdg = copy.deepcopy(graph)
+    result = tdg.simulate_schedule({}, number_of_samples=3)
+    assert result.get_finish_times() == [tdg.calculate_planned_finish_time_of_graph()] * 3
+    on_a_critical_path = {task_id for path in tdg.get_critical_path_task_id_paths() for task_id in path}
+    for task_id, criticality_index in result.criticality_index.items():
+        assert criticality_index == (1.0 if task_id in on_a_critical_path else 0.0)
+    assert ID_OF_ARTIFICIAL_ENDNODE not in result.criticality_index
+
+
+def test_degenerate_distributions_equal_the_planned_duration() -> None:
+    a, b = build_task("A", 10), build_task("B", 20)
+    tdg = TaskDependencyGraph(
+        task_list=[a, b], dependency_list=[build_edge(a, b)], starting_time_of_run=starting_time_of_run_3
+    )
+    distributions: dict[TaskId, DurationDistribution] = {
+        a.id: PertDuration(
+            minimum=timedelta(minutes=5), most_likely=timedelta(minutes=5), maximum=timedelta(minutes=5)
+        ),
+        b.id: _triangular(7, 7, 7),
+    }
+    result = tdg.simulate_schedule(distributions, number_of_samples=10)
+    assert set(result.get_finish_times()) == {starting_time_of_run_3 + timedelta(minutes=12)}
+
+
+def test_quantiles_of_a_chain() -> None:
+    a, b, c = build_task("A", 10), build_task("B", 20), build_task("C", 5)
+    tdg = TaskDependencyGraph(
+        task_list=[a, b, c],
+        dependency_list=[build_edge(a, b), build_edge(b, c)],
+        starting_time_of_run=starting_time_of_run_3,
+    )
+    distributions = {a.id: _triangular(5, 10, 30), b.id: _triangular(10, 20, 60)}
+    result = tdg.simulate_schedule(distributions, number_of_samples=20_000, seed=42)
+    assert result.number_of_samples == 20_000
+    quantiles = result.get_finish_time_quantiles()
+    assert list(quantiles) == [0.5, 0.8, 0.95]
+    assert starting_time_of_run_3 + timedelta(minutes=20) <= quantiles[0.5] <= quantiles[0.8] <= quantiles[0.95]
+    assert quantiles[0.95] <= starting_time_of_run_3 + timedelta(minutes=95)
+    # the mean of a triangular distribution is (minimum + most_likely + maximum) / 3
+    mean_minutes = result.graph_finish.mean() / 60_000_000
+    assert mean_minutes == pytest.approx(15 + 30 + 5, rel=0.01)
+    assert all(criticality_index == 1.0 for criticality_index in result.criticality_index.values())
+    with pytest.raises(ValueError):
+        result.get_finish_time_quantile(1.5)
+
+
+def test_criticality_index_of_parallel_tasks() -> None:
+    a, b = build_task("A", 10), build_task("B", 10)
+    tdg = TaskDependencyGraph(task_list=[a, b], dependency_list=[], starting_time_of_run=starting_time_of_run_3)
+    result = tdg.simulate_schedule({a.id: _triangular(0, 10, 20)}, number_of_samples=20_000, seed=1)
+    assert result.criticality_index[a.id] == pytest.approx(0.5, abs=0.02)
+    assert result.criticality_index[b.id] == pytest.approx(0.5, abs=0.02)
+
+
+def test_earliest_starttime_is_a_release_time_in_every_sample() -> None:
+    a = build_task("A", 10)
+    b = build_task("B", 10, earliest_start=starting_time_of_run_3 + timedelta(minutes=15))
+    tdg = TaskDependencyGraph(
+        task_list=[a, b], dependency_list=[build_edge(a, b)], starting_time_of_run=starting_time_of_run_3
+    )
+    result = tdg.simulate_schedule({a.id: _triangular(0, 10, 30)}, number_of_samples=10_000, seed=1)
+    assert min(result.get_finish_times()) == starting_time_of_run_3 + timedelta(minutes=25)
+    # as in get_critical_path_task_ids, the critical path continues through A if B is held back by its release
+    assert result.criticality_index == {a.id: 1.0, b.id: 1.0}
+
+
+def test_deterministic_criticality_equals_the_critical_paths() -> None:
+    """
+    tasks that hold back a released task are critical, too (see ScheduleState.critical_predecessors_of); this covers
+    tasks with few and with many successors
+    """
+    a, b = build_task("A", 10), build_task("B", 5)
+    released = build_task("R", 10, earliest_start=starting_time_of_run_3 + timedelta(minutes=30))
+    fan_out = [build_task(f"F{index}", 1 + index % 3) for index in range(12)]
+    c = build_task("C", 3)
+    tdg = TaskDependencyGraph(
+        task_list=[a, b, released, *fan_out, c],
+        dependency_list=[
+            build_edge(a, b),
+            build_edge(b, released),
+            *(build_edge(released, task) for task in fan_out),
+            *(build_edge(task, c) for task in fan_out),
+            build_edge(a, c),
+        ],
+        starting_time_of_run=starting_time_of_run_3,
+    )
+    on_a_critical_path = {task_id for path in tdg.get_critical_path_task_id_paths() for task_id in path}
+    assert {a.id, b.id, released.id, c.id} <= on_a_critical_path
+    result = tdg.simulate_schedule({b.id: _triangular(5, 5, 5)}, number_of_samples=4)
+    assert {task_id for task_id, index in result.criticality_index.items() if index == 1.0} == on_a_critical_path
+    assert set(result.criticality_index.values()) == {0.0, 1.0}
+
+
+@pytest.mark.parametrize(
+    ("distribution", "expected_mean_minutes"),
+    [
+        pytest.param(
+            PertDuration(
+                minimum=timedelta(minutes=10), most_likely=timedelta(minutes=20), maximum=timedelta(minutes=60)
+            ),
+            (10 + 4 * 20 + 60) / 6,
+            id="pert",
+        ),
+        pytest.param(
+            LognormalDuration(median=timedelta(minutes=10), sigma=0.5), 10 * np.exp(0.5**2 / 2), id="lognormal"
+        ),
+        pytest.param(
+            EmpiricalDuration(observed_durations=[timedelta(minutes=5), timedelta(minutes=15)]), 10, id="empirical"
+        ),
+    ],
+)
+def test_mean_of_the_distributions(
+    distribution: PertDuration | LognormalDuration | EmpiricalDuration, expected_mean_minutes: float
+) -> None:
+    a = build_task("A", 1)
+    tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=starting_time_of_run_3)
+    result = tdg.simulate_schedule({a.id: distribution}, number_of_samples=50_000, seed=7)
+    assert result.graph_finish.mean() / 60_000_000 == pytest.approx(expected_mean_minutes, rel=0.02)
+
+
+def test_results_only_depend_on_seed_and_chunk_size() -> None:
+    tasks = [build_task(f"T{i}", 10 + i) for i in range(6)]
+    edges = [build_edge(tasks[0], tasks[i]) for i in range(1, 5)] + [
+        build_edge(tasks[i], tasks[5]) for i in range(1, 5)
+    ]
+    tdg = TaskDependencyGraph(task_list=tasks, dependency_list=edges, starting_time_of_run=starting_time_of_run_3)
+    distributions = {task.id: _triangular(5, 10 + i, 40) for i, task in enumerate(tasks)}
+    sequential = tdg.simulate_schedule(distributions, number_of_samples=1_000, seed=3, chunk_size=300)
+    parallel = tdg.simulate_schedule(distributions, number_of_samples=1_000, seed=3, chunk_size=300, processes=2)
+    assert np.array_equal(sequential.graph_finish, parallel.graph_finish)
+    assert sequential.criticality_index == parallel.criticality_index
+    other_seed = tdg.simulate_schedule(distributions, number_of_samples=1_000, seed=4, chunk_size=300)
+    assert not np.array_equal(sequential.graph_finish, other_seed.graph_finish)
+
+
+def test_invalid_arguments_are_rejected() -> None:
+    a = build_task("A", 10)
+    tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=starting_time_of_run_3)
+    with pytest.raises(ValueError, match="not a real task"):
+        tdg.simulate_schedule({TaskId(uuid.uuid4()): _triangular(1, 2, 3)})
+    with pytest.raises(ValueError, match="not a real task"):
+        tdg.simulate_schedule({ID_OF_ARTIFICIAL_ENDNODE: _triangular(1, 2, 3)})
+    with pytest.raises(ValueError, match="number_of_samples"):
+        tdg.simulate_schedule({}, number_of_samples=0)
+
+
+def test_simulation_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "taskdependencygraph.schedule_simulation", None)
+    a = build_task("A", 10)
+    tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=starting_time_of_run_3)
+    with pytest.raises(ImportError, match="numpy"):
+        tdg.simulate_schedule({})
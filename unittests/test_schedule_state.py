@@ -0,0 +1,166 @@
+"""
+tests for the cached and incrementally updated schedule state of the TDG
+"""
+
+# pylint:disable=protected-access
+import copy
+import random
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from taskdependencygraph.models.ids import TaskDependencyId, TaskId
+from taskdependencygraph.models.task_dependency_edge import TaskDependencyEdge
+from taskdependencygraph.models.task_node import TaskNode
+from taskdependencygraph.models.task_node_as_artificial_endnode import ID_OF_ARTIFICIAL_ENDNODE
+from taskdependencygraph.models.task_node_as_artificial_startnode import ID_OF_ARTIFICIAL_STARTNODE
+from taskdependencygraph.schedule_state import ScheduleState
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+from .example_tdgs import graph_anna, task_A, task_B, task_C, task_D
+
+
+def test_read_queries_share_one_schedule_state() -> None:
+    graph = copy.deepcopy(graph_anna)
+    state = graph._get_schedule_state()
+    assert isinstance(state, ScheduleState)
+    graph.create_schedule_report()
+    graph.is_on_critical_path(task_B.id)
+    graph.calculate_total_slack_of_task(task_C.id)
+    graph.calculate_delay_impact(task_A.id, timedelta(minutes=1))
+    graph.labels()
+    assert graph._get_schedule_state() is state
+    assert state.version == graph._version
+
+
+def test_schedule_state_contains_forward_and_backward_pass() -> None:
+    graph = copy.deepcopy(graph_anna)
+    state = graph._get_schedule_state()
+    assert state.topological_order.rank[task_A.id] < state.topological_order.rank[task_B.id]
+    assert state.earliest_start[task_D.id] == timedelta(minutes=25)
+    assert state.graph_finish == timedelta(minutes=29)
+    assert state.latest_start_of(task_C.id) == timedelta(minutes=28)
+    assert task_B.id in state.critical_path_set
+    assert task_C.id not in state.critical_path_set
+
+
+def test_adding_a_task_updates_the_schedule_state() -> None:
+    graph = copy.deepcopy(graph_anna)
+    graph._get_schedule_state()
+    new_task = TaskNode(id=TaskId(uuid.uuid4()), external_id="E", name="E", planned_duration=timedelta(minutes=60))
+    graph.add_task(new_task)
+    assert graph._get_schedule_state().version == graph._version
+    assert graph.get_critical_path_task_ids() == [new_task.id]
+
+
+def test_adding_and_removing_an_edge_updates_the_schedule_state() -> None:
+    graph = copy.deepcopy(graph_anna)
+    edge = TaskDependencyEdge(id=TaskDependencyId(uuid.uuid4()), task_predecessor=task_D.id, task_successor=task_C.id)
+    graph.add_edge(edge)
+    assert graph.calculate_planned_finish_time_of_task(task_C.id) - graph._starting_time_of_run == timedelta(minutes=30)
+    graph.remove_edge(edge.id)
+    assert graph.calculate_planned_finish_time_of_task(task_C.id) - graph._starting_time_of_run == timedelta(minutes=6)
+
+
+def test_removing_a_task_updates_the_schedule_state() -> None:
+    graph = copy.deepcopy(graph_anna)
+    graph._get_schedule_state()
+    graph.remove_task(task_B.id)
+    assert graph.calculate_planned_finish_time_of_graph() - graph._starting_time_of_run == timedelta(minutes=6)
+
+
+def test_propagation_stops_where_the_earliest_start_does_not_change() -> None:
+    graph = copy.deepcopy(graph_anna)
+    state = graph._get_schedule_state()
+    # C is not on the critical path: after A, C (1min) ends long before B (20min)->D
+    short_task = TaskNode(id=TaskId(uuid.uuid4()), external_id="E", name="E", planned_duration=timedelta(minutes=1))
+    graph.add_task(short_task)
+    graph.add_edge(
+        TaskDependencyEdge(id=TaskDependencyId(uuid.uuid4()), task_predecessor=task_C.id, task_successor=short_task.id)
+    )
+    evaluated = state.update(graph._graph, graph._starting_time_of_run, graph._version)
+    assert task_B.id not in evaluated
+    assert task_D.id not in evaluated
+    assert state.earliest_start[short_task.id] == timedelta(minutes=6)
+
+
+_T0 = datetime(2024, 1, 1, 0, 0, 0, tzinfo=UTC)
+
+
+def _assert_schedule_equals_a_freshly_built_graph(graph: TaskDependencyGraph) -> None:
+    tasks = [
+        graph._graph.nodes[n]["domain_model"]
+        for n in graph._graph.nodes
+        if n in graph._get_schedule_state().earliest_start
+    ]
+    real_tasks = [t for t in tasks if t.id not in (ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE)]
+    edges = [
+        graph._graph.edges[u, v]["domain_model"]
+        for u, v in graph._graph.edges
+        if u != ID_OF_ARTIFICIAL_STARTNODE and v != ID_OF_ARTIFICIAL_ENDNODE
+    ]
+    fresh = TaskDependencyGraph(task_list=real_tasks, dependency_list=edges, starting_time_of_run=_T0)
+    state = graph._get_schedule_state()
+    fresh_state = fresh._get_schedule_state()
+    assert state.earliest_start == fresh_state.earliest_start
+    assert state.remaining_duration == fresh_state.remaining_duration
+    assert state.graph_finish == fresh_state.graph_finish
+    for task in real_tasks:
+        assert graph.calculate_total_slack_of_task(task.id) == fresh.calculate_total_slack_of_task(task.id)
+    for u, v in graph._graph.edges:
+        assert graph._graph.edges[u, v]["weight"] == pytest.approx(fresh._graph.edges[u, v]["weight"])
+    assert graph._edge_index == {graph._graph.edges[u, v]["domain_model"].id: (u, v) for u, v in graph._graph.edges}
+    assert graph._external_id_index == {
+        graph._graph.nodes[n]["domain_model"].external_id: n for n in graph._graph.nodes
+    }
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+def test_incremental_updates_match_a_full_recomputation(seed: int) -> None:
+    rng = random.Random(seed)
+    graph = TaskDependencyGraph(task_list=[], dependency_list=[], starting_time_of_run=_T0)
+    task_ids: list[TaskId] = []
+    edge_ids: list[TaskDependencyId] = []
+    for step in range(120):
+        action = rng.random()
+        if action < 0.35 or len(task_ids) < 2:
+            task = TaskNode(
+                id=TaskId(uuid.uuid4()),
+                external_id=f"T{step}",
+                name=f"T{step}",
+                planned_duration=timedelta(minutes=rng.randint(0, 30)),
+                earliest_starttime=_T0 + timedelta(minutes=rng.randint(0, 120)) if rng.random() < 0.2 else None,
+            )
+            graph.add_task(task)
+            task_ids.append(task.id)
+        elif action < 0.75:
+            predecessor, successor = rng.sample(task_ids, 2)
+            edge = TaskDependencyEdge(
+                id=TaskDependencyId(uuid.uuid4()), task_predecessor=predecessor, task_successor=successor
+            )
+            if graph.can_edge_be_added(edge).can_be_added:
+                graph.add_edge(edge)
+                edge_ids.append(edge.id)
+        elif action < 0.9 and edge_ids:
+            graph.remove_edge(edge_ids.pop(rng.randrange(len(edge_ids))))
+        elif rng.random() < 0.5:
+            graph.update_task(
+                rng.choice(task_ids),
+                planned_duration=timedelta(minutes=rng.randint(0, 30)),
+                earliest_starttime=_T0 + timedelta(minutes=rng.randint(0, 120)) if rng.random() < 0.3 else None,
+            )
+        else:
+            removed = task_ids.pop(rng.randrange(len(task_ids)))
+            edge_ids = [
+                e
+                for e in edge_ids
+                if not any(
+                    graph._graph.edges[u, v]["domain_model"].id == e and removed in (u, v)
+                    for u, v in graph._graph.edges
+                )
+            ]
+            graph.remove_task(removed)
+        if step % 10 == 0:
+            _assert_schedule_equals_a_freshly_built_graph(graph)
+    _assert_schedule_equals_a_freshly_built_graph(graph)
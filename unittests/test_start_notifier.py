@@ -0,0 +1,183 @@
+"""
+tests for the notifications before the planned start of tasks
+"""
+
+import asyncio
+import copy
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from taskdependencygraph.models.forecast_entry import ForecastEntry
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.start_notification import StartNotification
+from taskdependencygraph.models.task_execution_status import TaskExecutionStatus
+from taskdependencygraph.start_notifier import StartNotifier
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+from .example_tdgs import graph_anna, task_A, task_B, task_C, task_D
+
+# graph_anna: A (5min) -> B (20min) -> D (4min) and A -> C (1min)
+
+
+def _minutes(minutes: int) -> timedelta:
+    return timedelta(minutes=minutes)
+
+
+class _FakeClock:
+    def __init__(self, now: datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _create_notifier(
+    graph: TaskDependencyGraph, clock: _FakeClock, lead_times: tuple[timedelta, ...] = (_minutes(10), _minutes(2))
+) -> tuple[StartNotifier, list[StartNotification]]:
+    notifications: list[StartNotification] = []
+    return StartNotifier(graph, notifications.append, lead_times=lead_times, clock=clock), notifications
+
+
+def _fired(notifications: list[StartNotification]) -> list[tuple[str, timedelta]]:
+    result = sorted((n.task.external_id, n.lead_time) for n in notifications)
+    notifications.clear()
+    return result
+
+
+def test_timers_fire_at_the_lead_times_before_the_planned_start() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph.starting_time_of_run
+    clock = _FakeClock(t0 - _minutes(30))
+    notifier, notifications = _create_notifier(graph, clock)
+    notifier.schedule_planned_starts()
+    assert notifier.number_of_pending_timers == 8
+    assert notifier.get_next_firing_time() == t0 - _minutes(10)
+    assert notifier.fire_due(t0 - _minutes(11)) == []
+    notifier.fire_due(t0 - _minutes(10))
+    assert _fired(notifications) == [("A", _minutes(10))]
+    # B and C start at 5min, D at 25min
+    notifier.fire_due(t0 + _minutes(2))
+    assert _fired(notifications) == [("A", _minutes(2)), ("B", _minutes(10)), ("C", _minutes(10))]
+    graph.update_task(task_C.id, execution_status=TaskExecutionStatus.STARTED)
+    notifier.fire_due(t0 + _minutes(30))
+    assert _fired(notifications) == [("B", _minutes(2)), ("D", _minutes(2)), ("D", _minutes(10))]
+    assert notifier.number_of_pending_timers == 0
+    assert notifier.get_next_firing_time() is None
+    notification = StartNotification(task=task_A, planned_start=t0, lead_time=_minutes(2))
+    assert notification.task.assignee is None
+
+
+def test_rescheduling_only_moves_the_affected_timers() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph.starting_time_of_run
+    clock = _FakeClock(t0)
+    notifier, notifications = _create_notifier(graph, clock)
+    notifier.schedule_planned_starts()
+    # of the overdue timers of A (which starts right now) only the 2min one fires at once; B and C start in 5min, so
+    # their overdue 10min timers fire at once, too
+    notifier.fire_due()
+    assert _fired(notifications) == [("A", _minutes(2)), ("B", _minutes(10)), ("C", _minutes(10))]
+    clock.now = t0 + _minutes(16)
+    notifier.fire_due()
+    assert _fired(notifications) == [("B", _minutes(2)), ("C", _minutes(2)), ("D", _minutes(10))]
+    # D is delayed: its 10min timer fires again, the 2min timer moves
+    notifier.reschedule(
+        [ForecastEntry(task_id=task_D.id, forecast_start=t0 + _minutes(40), forecast_finish=t0 + _minutes(44))]
+    )
+    assert notifier.get_next_firing_time() == t0 + _minutes(30)
+    assert notifier.fire_due(t0 + _minutes(29)) == []
+    notifier.fire_due(t0 + _minutes(38))
+    assert _fired(notifications) == [("D", _minutes(2)), ("D", _minutes(10))]
+    # a task that is brought forward doesn't repeat the notifications it already got
+    clock.now = t0 + _minutes(39)
+    notifier.schedule(task_D.id, t0 + _minutes(39))
+    assert notifier.fire_due() == []
+    # tasks that start in the past are not notified at all
+    notifier.schedule(task_B.id, t0 + _minutes(1))
+    assert notifier.number_of_pending_timers == 0
+    notifier.schedule(task_B.id, t0 + _minutes(60))
+    notifier.cancel(task_B.id)
+    assert notifier.number_of_pending_timers == 0
+    assert notifier.fire_due(t0 + _minutes(60)) == []
+
+
+def test_removed_tasks_are_not_notified() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph.starting_time_of_run
+    notifier, notifications = _create_notifier(graph, _FakeClock(t0 - _minutes(30)))
+    notifier.schedule_planned_starts()
+    graph.remove_task(task_A.id)
+    notifier.fire_due(t0 - _minutes(6))
+    assert _fired(notifications) == []
+    assert notifier.number_of_pending_timers == 7
+
+
+def test_invalid_lead_times_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        StartNotifier(copy.deepcopy(graph_anna), print, lead_times=())
+    with pytest.raises(ValueError):
+        StartNotifier(copy.deepcopy(graph_anna), print, lead_times=(_minutes(-1),))
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_random_reschedules_fire_each_timer_at_its_latest_moment(seed: int) -> None:
+    rng = random.Random(seed)
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph.starting_time_of_run
+    clock = _FakeClock(t0)
+    notifications: list[StartNotification] = []
+    notifier = StartNotifier(graph, notifications.append, lead_times=[_minutes(0)], clock=clock)
+    task_ids = [TaskId(uuid.uuid4()) for _ in range(2_000)]
+    planned_start: dict[TaskId, datetime] = {}
+    for _ in range(20_000):
+        task_id = rng.choice(task_ids)
+        planned_start[task_id] = t0 + _minutes(rng.randint(1, 1_000))
+        notifier.schedule(task_id, planned_start[task_id])
+    assert notifier.number_of_pending_timers == len(planned_start)
+    # the outdated entries have been dropped along the way
+    assert len(notifier._heap) <= 2 * len(planned_start) + 64  # pylint:disable=protected-access
+    firing_times: list[datetime] = []
+    while (next_firing_time := notifier.get_next_firing_time()) is not None:
+        firing_times.append(next_firing_time)
+        notifier.fire_due(next_firing_time)
+    # the ids are not part of the graph, so nothing is notified, but every timer fired exactly once
+    assert notifications == []
+    assert sorted(set(firing_times)) == sorted(set(planned_start.values()))
+    assert notifier.number_of_pending_timers == 0
+
+
+async def test_run_fires_due_timers_and_wakes_up_on_reschedules() -> None:
+    graph = copy.deepcopy(graph_anna)
+    t0 = graph.starting_time_of_run
+    clock = _FakeClock(t0 - _minutes(10))
+    notifier, notifications = _create_notifier(graph, clock)
+    notifier.schedule_planned_starts()
+    running = asyncio.create_task(notifier.run())
+    await asyncio.sleep(0.01)
+    assert _fired(notifications) == [("A", _minutes(10))]
+    # the clock jumps (without the loop noticing) and a reschedule of C wakes the loop up
+    clock.now = t0 + _minutes(3)
+    notifier.schedule(task_C.id, t0 + _minutes(4))
+    await asyncio.sleep(0.01)
+    assert _fired(notifications) == [("A", _minutes(2)), ("B", _minutes(2)), ("B", _minutes(10)), ("C", _minutes(2))]
+    notifier.stop()
+    await asyncio.wait_for(running, 1)
+
+
+async def test_stop_before_the_loop_starts_is_not_lost() -> None:
+    graph = copy.deepcopy(graph_anna)
+    notifier, notifications = _create_notifier(graph, _FakeClock(graph.starting_time_of_run - _minutes(10)))
+    notifier.schedule_planned_starts()
+    running = asyncio.create_task(notifier.run())
+    notifier.stop()  # the task hasn't started yet
+    await asyncio.wait_for(running, 1)
+    assert notifications == []
+    # the notifier can be run again afterward
+    running = asyncio.create_task(notifier.run())
+    await asyncio.sleep(0.01)
+    assert _fired(notifications) == [("A", _minutes(10))]
+    notifier.stop()
+    await asyncio.wait_for(running, 1)
@@ -0,0 +1,161 @@
+"""
+tests for the ingestion of live task status events
+"""
+
+import asyncio
+import copy
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from taskdependencygraph.models.forecast_entry import ForecastEntry
+from taskdependencygraph.models.ids import TaskId
+from taskdependencygraph.models.task_execution_status import TaskExecutionStatus
+from taskdependencygraph.models.task_status_event import TaskStatusEvent
+from taskdependencygraph.status_event_ingestion import StatusEventIngestor
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+
+from .example_tdgs import graph_anna, task_A, task_B, task_C, task_D
+
+# graph_anna: A (5min) -> B (20min) -> D (4min) and A -> C (1min)
+
+
+class _Recorder:
+    def __init__(
+        self,
+        graph: TaskDependencyGraph,
+        coalescing_window: timedelta = timedelta(milliseconds=50),
+        max_batch_size: int = 10_000,
+    ) -> None:
+        self.published: list[list[ForecastEntry]] = []
+        self.rejected: list[tuple[TaskId, str]] = []
+        self.t0 = graph.starting_time_of_run
+        self.now = self.t0 + timedelta(minutes=10, seconds=30)
+        self.ingestor = StatusEventIngestor(
+            graph,
+            self.published.append,
+            clock=lambda: self.now,
+            on_rejected=lambda task_id, message: self.rejected.append((task_id, message)),
+            coalescing_window=coalescing_window,
+            max_batch_size=max_batch_size,
+        )
+
+    def minutes(self, minutes: int) -> datetime:
+        return self.t0 + timedelta(minutes=minutes)
+
+
+def test_bursts_are_coalesced_into_one_reforecast() -> None:
+    graph = copy.deepcopy(graph_anna)
+    recorder = _Recorder(graph, coalescing_window=timedelta(hours=1))
+    recorder.ingestor.flush()  # initial forecast at 10min (status date resolution 1min)
+    assert {entry.task_id for entry in recorder.published[0]} == {task_A.id, task_B.id, task_C.id, task_D.id}
+    events = [
+        TaskStatusEvent(task_id=task_A.id, execution_status=TaskExecutionStatus.STARTED, actual_starttime=recorder.t0),
+        TaskStatusEvent(task_id=task_A.id, execution_status=TaskExecutionStatus.COMPLETED),
+        TaskStatusEvent(task_id=task_A.id, actual_finishtime=recorder.minutes(6)),
+        TaskStatusEvent(task_id=task_B.id, actual_starttime=recorder.minutes(6)),
+    ]
+    recorder.ingestor.ingest(events)
+    assert len(recorder.published) == 2
+    # C and D are pending: they can start earlier now, but not before the status date (10min)
+    assert recorder.published[1] == [
+        ForecastEntry(task_id=task_A.id, forecast_start=recorder.t0, forecast_finish=recorder.minutes(6)),
+        ForecastEntry(task_id=task_B.id, forecast_start=recorder.minutes(6), forecast_finish=recorder.minutes(26)),
+        ForecastEntry(task_id=task_C.id, forecast_start=recorder.minutes(10), forecast_finish=recorder.minutes(11)),
+        ForecastEntry(task_id=task_D.id, forecast_start=recorder.minutes(26), forecast_finish=recorder.minutes(30)),
+    ]
+    task_a = graph.get_task_by_external_id("A")
+    assert task_a.execution_status == TaskExecutionStatus.COMPLETED
+    assert task_a.actual_finishtime == recorder.minutes(6)
+    assert recorder.rejected == []
+
+
+def test_without_coalescing_window_every_event_is_applied_on_its_own() -> None:
+    graph = copy.deepcopy(graph_anna)
+    recorder = _Recorder(graph, coalescing_window=timedelta(0))
+    recorder.ingestor.ingest(
+        [
+            TaskStatusEvent(task_id=task_C.id, actual_starttime=recorder.minutes(9)),
+            TaskStatusEvent(task_id=task_C.id, execution_status=TaskExecutionStatus.STARTED),
+            TaskStatusEvent(task_id=task_C.id, actual_finishtime=recorder.minutes(12)),
+        ]
+    )
+    # the first flush publishes the initial forecast, the status change alone doesn't change the forecast
+    assert len(recorder.published) == 2
+    assert recorder.published[1] == [
+        ForecastEntry(task_id=task_C.id, forecast_start=recorder.minutes(9), forecast_finish=recorder.minutes(12))
+    ]
+
+
+def test_a_new_status_date_only_publishes_the_tasks_it_moves() -> None:
+    graph = copy.deepcopy(graph_anna)
+    recorder = _Recorder(graph, coalescing_window=timedelta(hours=1))
+    recorder.ingestor.ingest(
+        [
+            TaskStatusEvent(task_id=task_A.id, actual_starttime=recorder.t0, actual_finishtime=recorder.minutes(5)),
+            TaskStatusEvent(task_id=task_C.id, actual_starttime=recorder.minutes(5)),
+            TaskStatusEvent(task_id=task_C.id, actual_finishtime=recorder.minutes(6)),
+            TaskStatusEvent(task_id=task_B.id, actual_starttime=recorder.minutes(5)),
+        ]
+    )
+    assert len(recorder.published) == 1
+    # B (running until 25min) and D (pending until 25min) are not affected by the status date moving to 11min
+    recorder.now = recorder.minutes(11)
+    assert recorder.ingestor.flush() == []
+    assert len(recorder.published) == 1
+    # at 30min, B is overdue: it can't finish before the status date, and D is delayed along with it
+    recorder.now = recorder.minutes(30)
+    recorder.ingestor.flush()
+    assert recorder.published[1] == [
+        ForecastEntry(task_id=task_B.id, forecast_start=recorder.minutes(5), forecast_finish=recorder.minutes(30)),
+        ForecastEntry(task_id=task_D.id, forecast_start=recorder.minutes(30), forecast_finish=recorder.minutes(34)),
+    ]
+
+
+def test_invalid_updates_are_rejected_without_affecting_the_others() -> None:
+    graph = copy.deepcopy(graph_anna)
+    recorder = _Recorder(graph, max_batch_size=100)
+    unknown_task_id = TaskId(uuid.uuid4())
+    recorder.ingestor.ingest(
+        [
+            TaskStatusEvent(task_id=unknown_task_id, execution_status=TaskExecutionStatus.STARTED),
+            TaskStatusEvent(task_id=task_B.id, actual_finishtime=recorder.minutes(5)),  # never started
+            TaskStatusEvent(task_id=task_D.id, actual_starttime=recorder.minutes(20)),
+        ]
+    )
+    assert [task_id for task_id, _ in recorder.rejected] == [unknown_task_id, task_B.id]
+    assert graph.get_task_by_external_id("D").actual_starttime == recorder.minutes(20)
+    assert graph.get_task_by_external_id("B").actual_finishtime is None
+
+
+def test_invalid_configuration_is_rejected() -> None:
+    graph = copy.deepcopy(graph_anna)
+    with pytest.raises(ValueError, match="coalescing_window"):
+        StatusEventIngestor(graph, print, coalescing_window=timedelta(seconds=-1))
+    with pytest.raises(ValueError, match="max_batch_size"):
+        StatusEventIngestor(graph, print, max_batch_size=0)
+    with pytest.raises(ValueError, match="status_date_resolution"):
+        StatusEventIngestor(graph, print, status_date_resolution=timedelta(0))
+
+
+async def test_events_from_an_asyncio_queue_are_coalesced_per_window() -> None:
+    graph = copy.deepcopy(graph_anna)
+    recorder = _Recorder(graph, coalescing_window=timedelta(milliseconds=50))
+    queue: asyncio.Queue[TaskStatusEvent | None] = asyncio.Queue()
+    consumer = asyncio.create_task(recorder.ingestor.run(queue))
+    for event in (
+        TaskStatusEvent(task_id=task_A.id, actual_starttime=recorder.t0),
+        TaskStatusEvent(task_id=task_A.id, actual_finishtime=recorder.minutes(4)),
+    ):
+        queue.put_nowait(event)
+    await asyncio.sleep(0.2)  # the first burst is applied after its window, without waiting for further events
+    assert len(recorder.published) == 1
+    queue.put_nowait(TaskStatusEvent(task_id=task_C.id, actual_starttime=recorder.minutes(9)))
+    queue.put_nowait(None)
+    await asyncio.wait_for(consumer, timeout=5)
+    assert len(recorder.published) == 2
+    assert recorder.published[1] == [
+        ForecastEntry(task_id=task_C.id, forecast_start=recorder.minutes(9), forecast_finish=recorder.minutes(10))
+    ]
+    assert graph.get_task_by_external_id("A").actual_finishtime == recorder.minutes(4)
@@ -1,4 +1,6 @@
 import copy
+import itertools
+import random
 import uuid
 from datetime import UTC, datetime, timedelta
 
@@ -17,6 +19,7 @@ from taskdependencygraph.models import (
     GraphDefinitionValidationFinding,
     GraphDefinitionValidationResult,
     MermaidGanttConfig,
+    Person,
     ScheduleEntry,
     ScheduleReport,
     TaskDependencyEdge,
@@ -24,7 +27,10 @@ from taskdependencygraph.models import (
     TaskExecutionStatus,
     TaskId,
     TaskNode,
+    TimeInterval,
+    UpdateTask,
     ValidationCode,
+    WorkingCalendar,
     task_node_as_artificial_endnode,
     task_node_as_artificial_startnode,
 )
@@ -569,6 +575,29 @@ def test_extract_subgraph() -> None:
     assert all(actual._graph.nodes[node]["domain_model"] is not None for node in actual._graph.nodes)
 
 
+def test_extract_subgraph_with_exponentially_many_paths() -> None:
+    start, end = _node("start", 0, milestone=True), _node("end", 0, milestone=True)
+    before, after, side_branch = _node("before", 5), _node("after", 5), _node("side branch", 5)
+    layers = [[_node(f"{i}-{j}", j + 1) for j in range(3)] for i in range(40)]  # 3**40 paths between start and end
+    edges = [_edge(before, start), _edge(end, after), _edge(start, side_branch)]
+    edges += [_edge(start, task) for task in layers[0]] + [_edge(task, end) for task in layers[-1]]
+    edges += [_edge(p, s) for layer, next_layer in itertools.pairwise(layers) for p in layer for s in next_layer]
+    full_graph = TaskDependencyGraph(
+        task_list=[before, start, end, after, side_branch, *(task for layer in layers for task in layer)],
+        dependency_list=edges,
+        starting_time_of_run=_T0,
+    )
+    actual = full_graph.extract_sub_graph(start.id, end.id)
+    # pylint:disable=protected-access
+    real_node_ids = set(actual._graph.nodes) - {ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE}
+    assert real_node_ids == {start.id, end.id} | {task.id for layer in layers for task in layer}
+    assert actual._graph.number_of_edges() == 3 + 39 * 9 + 3 + 2  # incl. the two artificial edges
+    assert actual.calculate_planned_starting_time_of_task(start.id) == _T0 + timedelta(minutes=5)
+    assert actual.calculate_planned_starting_time_of_task(end.id) == _T0 + timedelta(minutes=5 + 40 * 3)
+    # the frozen domain models are shared, not copied
+    assert actual._graph.nodes[start.id]["domain_model"] is full_graph._graph.nodes[start.id]["domain_model"]
+
+
 class TestIfListIsCorrectlySortedByStartingTime:
     """
     Complex graph made from unsorted task_list and with different starting time: With task_list_2b and
@@ -653,6 +682,31 @@ class TestIfListIsCorrectlySortedByStartingTime:
             assert ext_edge == int_edge
             assert ext_edge is not int_edge
 
+    def test_shallow_copy_shares_the_frozen_domain_models(self) -> None:
+        tdg = build_complex_graph(task_list_2, dependency_list_2, starting_time_of_run_1)
+        digraph = tdg.get_digraph_copy(deep=False)
+        internal = tdg._graph  # pylint:disable=protected-access
+        assert digraph is not internal
+        for node in internal.nodes:
+            assert digraph.nodes[node]["domain_model"] is internal.nodes[node]["domain_model"]
+        for u, v in internal.edges:
+            assert digraph.edges[u, v]["domain_model"] is internal.edges[u, v]["domain_model"]
+        digraph.remove_node(task_list_2[0].id)
+        digraph.edges[next(iter(digraph.edges))]["weight"] = -1
+        assert task_list_2[0].id in internal.nodes
+        assert all(internal.edges[e]["weight"] >= 0 for e in internal.edges)
+
+    def test_view_is_read_only_and_live(self) -> None:
+        tdg = build_complex_graph(task_list_2, dependency_list_2, starting_time_of_run_1)
+        view = tdg.get_digraph_view()
+        assert set(view.nodes) == set(tdg._graph.nodes)  # pylint:disable=protected-access
+        with pytest.raises(nx.NetworkXError):
+            view.remove_node(task_list_2[0].id)
+        new_task = _node("new", 5)
+        tdg.add_task(new_task)
+        assert new_task.id in view.nodes
+        assert view.edges[new_task.id, ID_OF_ARTIFICIAL_ENDNODE]["weight"] == 5
+
 
 # ---------------------------------------------------------------------------
 # Issue #84 – planned finish time APIs
@@ -766,6 +820,248 @@ class TestPlannedFinishTimeOfGraph:
         assert tdg.calculate_planned_finish_time_of_graph() == _T0 + timedelta(minutes=40)
 
 
+def _build_chain_of_diamonds(number_of_diamonds: int) -> tuple[TaskDependencyGraph, list[TaskNode]]:
+    """
+    Builds a graph in which a join node is followed by a short and a long branch which join again, n times:
+    J0 -> (S0 | L0) -> J1 -> (S1 | L1) -> ... -> Jn
+    There are 2^n paths from J0 to Jn, so anything that enumerates paths won't terminate in time.
+    """
+    joins = [_node(f"J{i}", 10) for i in range(number_of_diamonds + 1)]
+    tasks: list[TaskNode] = list(joins)
+    edges: list[TaskDependencyEdge] = []
+    for i in range(number_of_diamonds):
+        short = _node(f"S{i}", 5)
+        long_ = _node(f"L{i}", 7)
+        tasks.extend([short, long_])
+        edges.extend(
+            [_edge(joins[i], short), _edge(joins[i], long_), _edge(short, joins[i + 1]), _edge(long_, joins[i + 1])]
+        )
+    return TaskDependencyGraph(task_list=tasks, dependency_list=edges, starting_time_of_run=_T0), joins
+
+
+class TestForwardPass:
+    """The planned start times are answered from a single forward pass instead of path enumerations."""
+
+    def test_chain_of_diamonds_is_scheduled_without_path_enumeration(self) -> None:
+        tdg, joins = _build_chain_of_diamonds(60)
+        assert tdg.calculate_planned_starting_time_of_task(joins[-1].id) == _T0 + 60 * timedelta(minutes=17)
+        assert tdg.calculate_planned_finish_time_of_task(joins[-1].id) == _T0 + 60 * timedelta(minutes=17) + timedelta(
+            minutes=10
+        )
+        assert tdg.calculate_planned_finish_time_of_graph() == _T0 + 60 * timedelta(minutes=17) + timedelta(minutes=10)
+
+    def test_duration_of_predecessors_equals_offset_of_planned_start(self) -> None:
+        tdg, joins = _build_chain_of_diamonds(3)
+        for join in joins:
+            assert (
+                tdg.calculate_planned_duration_of_predecessor_tasks_on_critical_path(join.id)
+                == tdg.calculate_planned_starting_time_of_task(join.id) - _T0
+            )
+
+    def test_earliest_starttime_before_start_of_run_is_ignored(self) -> None:
+        a = _node("A", 10, earliest_start=_T0 - timedelta(days=1))
+        tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=_T0)
+        assert tdg.calculate_planned_starting_time_of_task(a.id) == _T0
+
+
+def _artificial_edge_ids(tdg: TaskDependencyGraph) -> dict[tuple[TaskId, TaskId], TaskDependencyId]:
+    graph = tdg.get_digraph_copy()
+    return {
+        (u, v): graph.edges[u, v]["domain_model"].id
+        for u, v in graph.edges
+        if u == ID_OF_ARTIFICIAL_STARTNODE or v == ID_OF_ARTIFICIAL_ENDNODE
+    }
+
+
+class TestArtificialEdges:
+    """The artificial start/end edges are re-wired incrementally, only for the endpoints of a modification."""
+
+    def test_artificial_edges_of_untouched_tasks_are_kept(self) -> None:
+        a, b, c = _node("A", 10), _node("B", 20), _node("C", 30)
+        tdg = TaskDependencyGraph(task_list=[a, b, c], dependency_list=[], starting_time_of_run=_T0)
+        before = _artificial_edge_ids(tdg)
+        tdg.add_edge(_edge(a, b))
+        after = _artificial_edge_ids(tdg)
+        assert (ID_OF_ARTIFICIAL_STARTNODE, b.id) not in after
+        assert (a.id, ID_OF_ARTIFICIAL_ENDNODE) not in after
+        assert after == {
+            key: value
+            for key, value in before.items()
+            if key not in {(ID_OF_ARTIFICIAL_STARTNODE, b.id), (a.id, ID_OF_ARTIFICIAL_ENDNODE)}
+        }
+
+    def test_artificial_edge_ids_are_stable_when_rewired(self) -> None:
+        a, b = _node("A", 10), _node("B", 20)
+        tdg = TaskDependencyGraph(task_list=[a, b], dependency_list=[], starting_time_of_run=_T0)
+        before = _artificial_edge_ids(tdg)
+        edge = _edge(a, b)
+        tdg.add_edge(edge)
+        tdg.remove_edge(edge.id)
+        assert _artificial_edge_ids(tdg) == before
+
+    def test_removing_the_last_task_connects_start_and_end(self) -> None:
+        a = _node("A", 10)
+        tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=_T0)
+        tdg.remove_task(a.id)
+        assert set(_artificial_edge_ids(tdg)) == {(ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE)}
+        assert tdg.calculate_planned_finish_time_of_graph() == _T0
+        tdg.add_task(a)
+        assert set(_artificial_edge_ids(tdg)) == {(ID_OF_ARTIFICIAL_STARTNODE, a.id), (a.id, ID_OF_ARTIFICIAL_ENDNODE)}
+        assert tdg.calculate_planned_finish_time_of_graph() == _T0 + timedelta(minutes=10)
+
+    def test_removing_a_task_connects_its_neighbours_to_start_and_end(self) -> None:
+        a, b, c = _node("A", 10), _node("B", 20), _node("C", 30)
+        tdg = TaskDependencyGraph(
+            task_list=[a, b, c], dependency_list=[_edge(a, b), _edge(b, c)], starting_time_of_run=_T0
+        )
+        tdg.remove_task(b.id)
+        assert set(_artificial_edge_ids(tdg)) == {
+            (ID_OF_ARTIFICIAL_STARTNODE, a.id),
+            (ID_OF_ARTIFICIAL_STARTNODE, c.id),
+            (a.id, ID_OF_ARTIFICIAL_ENDNODE),
+            (c.id, ID_OF_ARTIFICIAL_ENDNODE),
+        }
+        assert tdg.calculate_planned_starting_time_of_task(c.id) == _T0
+
+
+class TestUpdateTask:
+    """Tasks are updated in place; only the schedule downstream of the task is re-computed."""
+
+    def test_duration_change_is_propagated_downstream(self) -> None:
+        a, b, c = _node("A", 10), _node("B", 20), _node("C", 30)
+        ab, bc = _edge(a, b), _edge(b, c)
+        tdg = TaskDependencyGraph(task_list=[a, b, c], dependency_list=[ab, bc], starting_time_of_run=_T0)
+        assert tdg.calculate_planned_finish_time_of_graph() == _T0 + timedelta(minutes=60)
+        tdg.update_task(a.id, planned_duration=timedelta(minutes=15))
+        assert tdg.calculate_planned_starting_time_of_task(b.id) == _T0 + timedelta(minutes=15)
+        assert tdg.calculate_planned_finish_time_of_graph() == _T0 + timedelta(minutes=65)
+        assert tdg.get_edge_by_id(ab.id) == ab
+        assert tdg.get_edge_by_id(bc.id) == bc
+        assert tdg.get_digraph_view().edges[a.id, b.id]["weight"] == 15
+
+    def test_earliest_starttime_change(self) -> None:
+        a, b = _node("A", 10), _node("B", 20)
+        tdg = TaskDependencyGraph(task_list=[a, b], dependency_list=[_edge(a, b)], starting_time_of_run=_T0)
+        tdg.update_task(b.id, earliest_starttime=_T0 + timedelta(hours=1))
+        assert tdg.calculate_planned_starting_time_of_task(b.id) == _T0 + timedelta(hours=1)
+        tdg.update_task(b.id, earliest_starttime=None)
+        assert tdg.calculate_planned_starting_time_of_task(b.id) == _T0 + timedelta(minutes=10)
+
+    def test_update_of_non_schedule_fields(self) -> None:
+        a = _node("A", 10)
+        tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=_T0)
+        tdg.update_task(a.id, name="renamed", external_id="A2")
+        assert tdg.get_task_by_external_id("A2").name == "renamed"
+        assert tdg.can_task_be_added(_node("A", 1)).can_be_added is True
+
+    @pytest.mark.parametrize(
+        ("changes", "error"),
+        [
+            pytest.param({"planned_duration": timedelta(minutes=-1)}, "invalid", id="invalid value"),
+            pytest.param({"colour": "red"}, "no field", id="unknown field"),
+            pytest.param({"id": TaskId(uuid.uuid4())}, "id of a task cannot be changed", id="id"),
+            pytest.param({"external_id": "B"}, "already exists", id="duplicate external id"),
+        ],
+    )
+    def test_invalid_updates_are_rejected(self, changes: dict[str, object], error: str) -> None:
+        a, b = _node("A", 10), _node("B", 10)
+        tdg = TaskDependencyGraph(task_list=[a, b], dependency_list=[], starting_time_of_run=_T0)
+        check_result = tdg.can_task_be_updated(a.id, **changes)
+        assert check_result.can_be_updated is False
+        assert error in (check_result.error_message or "")
+        with pytest.raises(ValueError, match=error):
+            tdg.update_task(a.id, **changes)
+        assert tdg.get_task_by_external_id("A") == a
+
+    def test_artificial_and_unknown_tasks_cannot_be_updated(self) -> None:
+        tdg = TaskDependencyGraph(task_list=[], dependency_list=[], starting_time_of_run=_T0)
+        assert tdg.can_task_be_updated(ID_OF_ARTIFICIAL_STARTNODE, name="x").can_be_updated is False
+        assert tdg.can_task_be_updated(TaskId(uuid.uuid4()), name="x").can_be_updated is False
+
+    def test_update_is_rolled_back_with_its_batch(self) -> None:
+        a = _node("A", 10)
+        tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=_T0)
+        with pytest.raises(ValueError):
+            tdg.apply_changes(
+                [
+                    UpdateTask(task_id=a.id, changes={"planned_duration": timedelta(minutes=99)}),
+                    UpdateTask(task_id=a.id, changes={"planned_duration": "invalid"}),
+                ]
+            )
+        assert tdg.get_task_by_external_id("A") == a
+        assert tdg.calculate_planned_finish_time_of_graph() == _T0 + timedelta(minutes=10)
+
+
+class TestEdgeWeights:
+    """The earliest_starttime is a release time of the task; it never changes any edge weight."""
+
+    def test_weights_are_the_durations_of_the_predecessors(self) -> None:
+        a = _node("A", 10)
+        b = _node("B", 20, earliest_start=_T0 + timedelta(hours=5))
+        c = _node("C", 30, earliest_start=_T0 + timedelta(hours=1))
+        tdg = TaskDependencyGraph(
+            task_list=[a, b, c], dependency_list=[_edge(a, b), _edge(b, c)], starting_time_of_run=_T0
+        )
+        assert tdg.calculate_planned_starting_time_of_task(c.id) == _T0 + timedelta(hours=5, minutes=20)
+        view = tdg.get_digraph_view()
+        for predecessor_id, successor_id in view.edges:
+            expected = view.nodes[predecessor_id]["domain_model"].planned_duration.total_seconds() / 60
+            assert view.edges[predecessor_id, successor_id]["weight"] == expected
+        assert view.edges[ID_OF_ARTIFICIAL_STARTNODE, a.id]["weight"] == 0
+        tdg.update_task(a.id, earliest_starttime=_T0 + timedelta(hours=9))
+        assert tdg.calculate_planned_starting_time_of_task(c.id) == _T0 + timedelta(hours=9, minutes=30)
+        assert view.edges[ID_OF_ARTIFICIAL_STARTNODE, a.id]["weight"] == 0
+        assert view.edges[a.id, b.id]["weight"] == 10
+
+
+class TestIndexes:
+    """Edges and tasks are looked up by their ids in maintained indexes instead of scanning the whole graph."""
+
+    def test_get_task_by_external_id(self) -> None:
+        a, b = _node("A", 10), _node("B", 20)
+        tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=_T0)
+        assert tdg.get_task_by_external_id("A") == a
+        tdg.add_task(b)
+        assert tdg.get_task_by_external_id("B") == b
+        tdg.remove_task(a.id)
+        with pytest.raises(ValueError, match="external id A does not exist"):
+            tdg.get_task_by_external_id("A")
+        with pytest.raises(ValueError):
+            tdg.get_task_by_external_id(task_node_as_artificial_startnode.external_id)
+
+    def test_external_id_of_removed_task_can_be_reused(self) -> None:
+        a = _node("A", 10)
+        tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=_T0)
+        assert tdg.can_task_be_added(_node("A", 5)).can_be_added is False
+        tdg.remove_task(a.id)
+        assert tdg.can_task_be_added(_node("A", 5)).can_be_added is True
+
+    def test_get_edge_by_id(self) -> None:
+        a, b, c = _node("A", 10), _node("B", 20), _node("C", 30)
+        ab, bc = _edge(a, b), _edge(b, c)
+        tdg = TaskDependencyGraph(task_list=[a, b, c], dependency_list=[ab], starting_time_of_run=_T0)
+        assert tdg.get_edge_by_id(ab.id) == ab
+        tdg.add_edge(bc)
+        assert tdg.get_edge_by_id(bc.id) == bc
+        tdg.remove_edge(ab.id)
+        with pytest.raises(ValueError, match="does not exist"):
+            tdg.get_edge_by_id(ab.id)
+        tdg.remove_task(c.id)
+        with pytest.raises(ValueError, match="does not exist"):
+            tdg.get_edge_by_id(bc.id)
+        assert tdg.can_edge_be_added(bc).can_be_added is False  # C is gone
+
+    def test_artificial_edges_are_not_returned(self) -> None:
+        a = _node("A", 10)
+        tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=_T0)
+        artificial_edge_id = _artificial_edge_ids(tdg)[(ID_OF_ARTIFICIAL_STARTNODE, a.id)]
+        with pytest.raises(ValueError):
+            tdg.get_edge_by_id(artificial_edge_id)
+        check_result = tdg.can_edge_be_removed(artificial_edge_id)
+        assert check_result.can_be_removed is False
+        assert "artificial" in (check_result.error_message or "")
+
+
 # ---------------------------------------------------------------------------
 # Issue #85 – ordered critical path data
 # ---------------------------------------------------------------------------
@@ -853,16 +1149,160 @@ class TestGetCriticalPathTaskIds:
         assert tdg.get_critical_path_task_ids() == []
 
     def test_earliest_starttime_stretches_onto_critical_path(self) -> None:
-        """A task delayed by earliest_starttime gets a stretched edge weight, pushing it onto the path."""
-        a = _node("A", 10)  # finishes at T0+10min, path weight 10
+        """A task delayed by its earliest_starttime (release time) is pushed onto the path."""
+        a = _node("A", 10)  # finishes at T0+10min
         early = datetime(2024, 6, 1, 9, 0, 0, tzinfo=UTC)  # T0 + 60min
-        b = _node("B", 10, earliest_start=early)  # edge stretched to 60min, path weight 70
+        b = _node("B", 10, earliest_start=early)  # released at T0+60min, finishes at T0+70min
         tdg = TaskDependencyGraph(task_list=[a, b], dependency_list=[], starting_time_of_run=_T0)
         ids = tdg.get_critical_path_task_ids()
         assert b.id in ids
         assert a.id not in ids
 
 
+def _build_chain_of_tied_diamonds(number_of_diamonds: int) -> tuple[TaskDependencyGraph, list[TaskNode]]:
+    """
+    J0 -> (A0 | B0) -> J1 -> ... -> Jn, where both branches of each diamond take equally long: 2^n critical paths
+    """
+    joins = [_node(f"J{i}", 10) for i in range(number_of_diamonds + 1)]
+    tasks: list[TaskNode] = list(joins)
+    edges: list[TaskDependencyEdge] = []
+    for i in range(number_of_diamonds):
+        branches = [_node(f"A{i}", 5), _node(f"B{i}", 5)]
+        tasks.extend(branches)
+        for branch in branches:
+            edges.extend([_edge(joins[i], branch), _edge(branch, joins[i + 1])])
+    return TaskDependencyGraph(task_list=tasks, dependency_list=edges, starting_time_of_run=_T0), joins
+
+
+class TestGetCriticalPathTaskIdPaths:
+    """Tests for get_critical_path_task_id_paths and count_critical_paths."""
+
+    def test_single_critical_path(self) -> None:
+        tdg = copy.deepcopy(graph_emily)
+        assert list(tdg.get_critical_path_task_id_paths()) == [tdg.get_critical_path_task_ids()]
+        assert tdg.count_critical_paths() == 1
+
+    def test_empty_graph_has_one_empty_path(self) -> None:
+        tdg = TaskDependencyGraph(task_list=[], dependency_list=[], starting_time_of_run=_T0)
+        assert list(tdg.get_critical_path_task_id_paths()) == [[]]
+        assert list(tdg.get_critical_path_task_id_paths(include_artificial_nodes=True)) == [
+            [ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE]
+        ]
+
+    def test_tied_branches(self) -> None:
+        a, b, c, d, e = _node("A", 5), _node("B", 10), _node("C", 10), _node("D", 1), _node("E", 3)
+        tdg = TaskDependencyGraph(
+            task_list=[a, b, c, d, e],
+            dependency_list=[_edge(a, b), _edge(a, c), _edge(b, d), _edge(c, d), _edge(a, e)],
+            starting_time_of_run=_T0,
+        )
+        paths = list(tdg.get_critical_path_task_id_paths())
+        assert paths == [[a.id, b.id, d.id], [a.id, c.id, d.id]]
+        assert paths[0] == tdg.get_critical_path_task_ids()
+        assert tdg.count_critical_paths() == 2
+        tdg.update_task(c.id, planned_duration=timedelta(minutes=11))
+        assert list(tdg.get_critical_path_task_id_paths()) == [[a.id, c.id, d.id]]
+        assert tdg.count_critical_paths() == 1
+
+    def test_exponentially_many_paths_are_counted_and_enumerated_lazily(self) -> None:
+        tdg, joins = _build_chain_of_tied_diamonds(60)
+        assert tdg.count_critical_paths() == 2**60
+        first_paths = list(itertools.islice(tdg.get_critical_path_task_id_paths(), 3))
+        assert len({tuple(path) for path in first_paths}) == 3
+        for path in first_paths:
+            assert path[0] == joins[0].id
+            assert path[-1] == joins[-1].id
+            assert len(path) == 121
+
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4])
+    def test_paths_are_the_longest_simple_paths(self, seed: int) -> None:
+        rng = random.Random(seed)
+        tasks = [_node(f"T{i}", rng.choice([1, 2])) for i in range(12)]
+        edges = [_edge(tasks[i], tasks[j]) for i in range(12) for j in range(i + 1, 12) if rng.random() < 0.3]
+        tdg = TaskDependencyGraph(task_list=tasks, dependency_list=edges, starting_time_of_run=_T0)
+        digraph = tdg.get_digraph_view()
+        all_paths = [
+            path[1:-1] for path in nx.all_simple_paths(digraph, ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE)
+        ]
+        length = {
+            tuple(path): sum((digraph.nodes[tid]["domain_model"].planned_duration for tid in path), timedelta(0))
+            for path in all_paths
+        }
+        longest = max(length.values())
+        expected = sorted(path for path, path_length in length.items() if path_length == longest)
+        assert sorted(tuple(path) for path in tdg.get_critical_path_task_id_paths()) == expected
+        assert tdg.count_critical_paths() == len(expected)
+
+    def test_modification_during_iteration_raises(self) -> None:
+        tdg, _ = _build_chain_of_tied_diamonds(3)
+        paths = tdg.get_critical_path_task_id_paths()
+        next(paths)
+        tdg.add_task(_node("new", 1))
+        with pytest.raises(RuntimeError):
+            next(paths)
+
+
+class TestGetTopKPaths:
+    """Tests for get_top_k_paths"""
+
+    def test_paths_of_a_small_graph(self) -> None:
+        a, b, c, d = _node("A", 5), _node("B", 10), _node("C", 7), _node("D", 1)
+        tdg = TaskDependencyGraph(
+            task_list=[a, b, c, d],
+            dependency_list=[_edge(a, b), _edge(a, c), _edge(b, d), _edge(c, d)],
+            starting_time_of_run=_T0,
+        )
+        paths = tdg.get_top_k_paths(5)
+        assert [path.task_ids for path in paths] == [[a.id, b.id, d.id], [a.id, c.id, d.id]]
+        assert [path.rank for path in paths] == [1, 2]
+        assert [path.total_duration for path in paths] == [timedelta(minutes=16), timedelta(minutes=13)]
+        assert [path.slack for path in paths] == [timedelta(0), timedelta(minutes=3)]
+        assert paths[0].task_ids == tdg.get_critical_path_task_ids()
+        with_artificial_nodes = tdg.get_top_k_paths(1, include_artificial_nodes=True)[0].task_ids
+        assert with_artificial_nodes == [ID_OF_ARTIFICIAL_STARTNODE, a.id, b.id, d.id, ID_OF_ARTIFICIAL_ENDNODE]
+
+    def test_waiting_time_is_slack(self) -> None:
+        a = _node("A", 10, earliest_start=_T0 + timedelta(minutes=30))
+        tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=_T0)
+        (path,) = tdg.get_top_k_paths(3)
+        assert path.total_duration == timedelta(minutes=10)
+        assert path.slack == timedelta(minutes=30)
+
+    def test_k_must_be_positive(self) -> None:
+        tdg = TaskDependencyGraph(task_list=[], dependency_list=[], starting_time_of_run=_T0)
+        with pytest.raises(ValueError):
+            tdg.get_top_k_paths(0)
+        assert [path.task_ids for path in tdg.get_top_k_paths(2)] == [[]]
+
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+    def test_paths_match_the_brute_force_ranking(self, seed: int) -> None:
+        rng = random.Random(seed)
+        tasks = [_node(f"T{i}", rng.randint(0, 9)) for i in range(12)]
+        edges = [_edge(tasks[i], tasks[j]) for i in range(12) for j in range(i + 1, 12) if rng.random() < 0.3]
+        tdg = TaskDependencyGraph(task_list=tasks, dependency_list=edges, starting_time_of_run=_T0)
+        digraph = tdg.get_digraph_view()
+        length = {
+            tuple(path[1:-1]): sum((digraph.nodes[tid]["domain_model"].planned_duration for tid in path), timedelta(0))
+            for path in nx.all_simple_paths(digraph, ID_OF_ARTIFICIAL_STARTNODE, ID_OF_ARTIFICIAL_ENDNODE)
+        }
+        paths = tdg.get_top_k_paths(len(length) + 10)
+        assert len(paths) == len(length)
+        assert {tuple(path.task_ids) for path in paths} == set(length)
+        assert all(path.total_duration == length[tuple(path.task_ids)] for path in paths)
+        assert [path.total_duration for path in paths] == sorted(length.values(), reverse=True)
+
+    def test_top_paths_of_a_large_graph(self) -> None:
+        tdg, joins = _build_chain_of_diamonds(1_000)
+        paths = tdg.get_top_k_paths(300)
+        assert len(paths) == 300
+        assert paths[0].total_duration == 1_000 * timedelta(minutes=17) + timedelta(minutes=10)
+        # every other path takes the short branch (2 minutes less) in at least one diamond
+        assert paths[1].slack == timedelta(minutes=2)
+        assert all(path.slack == timedelta(minutes=2) for path in paths[1:])
+        assert len({tuple(path.task_ids) for path in paths}) == 300
+        assert all(path.task_ids[-1] == joins[-1].id for path in paths)
+
+
 class TestGetCriticalPathTasks:
     """Tests for get_critical_path_tasks (issue #85)."""
 
@@ -1073,6 +1513,248 @@ class TestScheduleReport:
         assert entry.planned_finish == early + timedelta(minutes=30)
 
 
+def _assigned(task: TaskNode, person: Person) -> TaskNode:
+    return task.model_copy(update={"assignee": person})
+
+
+class TestResourceLeveledScheduleReport:
+    """Tests for create_resource_leveled_schedule_report."""
+
+    alice = Person(name="Alice", email="alice@example.com")
+    bob = Person(name="Bob", email="bob@example.com")
+
+    @staticmethod
+    def _assert_is_feasible(tdg: TaskDependencyGraph, report: ScheduleReport) -> None:
+        by_id = {e.task_id: e for e in report.entries}
+        for entry in report.entries:
+            task = tdg.get_digraph_view().nodes[entry.task_id]["domain_model"]
+            assert entry.planned_finish == entry.planned_start + entry.planned_duration
+            assert entry.planned_start >= max(_T0, task.earliest_starttime or _T0)
+            for predecessor_id in entry.predecessor_task_ids:
+                assert by_id[predecessor_id].planned_finish <= entry.planned_start
+            assert entry.total_slack >= entry.free_slack >= timedelta(0)
+            assert entry.late_start == entry.planned_start + entry.total_slack
+            assert entry.planned_finish <= report.graph_finish
+        intervals_by_person: dict[uuid.UUID, list[tuple[datetime, datetime]]] = {}
+        for entry in report.entries:
+            assignee = tdg.get_digraph_view().nodes[entry.task_id]["domain_model"].assignee
+            if assignee is not None and entry.planned_duration > timedelta(0):
+                intervals_by_person.setdefault(assignee.id, []).append((entry.planned_start, entry.planned_finish))
+        for intervals in intervals_by_person.values():
+            intervals.sort()
+            for (_, finish), (next_start, _) in itertools.pairwise(intervals):
+                assert finish <= next_start
+
+    def test_without_assignees_the_leveled_schedule_equals_the_plan(self) -> None:
+        tdg = copy.deepcopy(graph_bernd)
+        assert tdg.create_resource_leveled_schedule_report() == tdg.create_schedule_report()
+        assert tdg.create_resource_leveled_schedule_report(include_artificial_nodes=True) == tdg.create_schedule_report(
+            include_artificial_nodes=True
+        )
+
+    def test_parallel_tasks_of_one_person_are_serialised_by_total_slack(self) -> None:
+        """A (slack 20min) and B (on the critical path) can run in parallel but are both done by Alice: B goes first."""
+        a = _assigned(_node("A", 10), self.alice)
+        b = _assigned(_node("B", 30), self.alice)
+        c = _node("C", 20)
+        tdg = TaskDependencyGraph(task_list=[a, b, c], dependency_list=[_edge(b, c)], starting_time_of_run=_T0)
+        report = tdg.create_resource_leveled_schedule_report()
+        by_id = {e.task_id: e for e in report.entries}
+        assert by_id[b.id].planned_start == _T0
+        assert by_id[a.id].planned_start == _T0 + timedelta(minutes=30)
+        assert by_id[c.id].planned_start == _T0 + timedelta(minutes=30)
+        assert report.graph_finish == _T0 + timedelta(minutes=50) == tdg.calculate_planned_finish_time_of_graph()
+        assert by_id[a.id].total_slack == by_id[a.id].free_slack == timedelta(minutes=10)
+        assert report.critical_path_task_ids == [b.id, c.id]
+        self._assert_is_feasible(tdg, report)
+        # the graph itself is not modified
+        assert tdg.calculate_planned_starting_time_of_task(a.id) == _T0
+
+    def test_leveling_can_extend_the_graph_finish(self) -> None:
+        a = _assigned(_node("A", 30), self.alice)
+        b = _assigned(_node("B", 30), self.alice)
+        c = _assigned(_node("C", 30), self.bob)
+        tdg = TaskDependencyGraph(task_list=[a, b, c], dependency_list=[], starting_time_of_run=_T0)
+        report = tdg.create_resource_leveled_schedule_report()
+        by_id = {e.task_id: e for e in report.entries}
+        assert report.graph_finish == _T0 + timedelta(minutes=60)
+        assert report.total_duration == timedelta(minutes=60)
+        assert by_id[c.id].planned_start == _T0
+        assert by_id[c.id].total_slack == timedelta(minutes=30)
+        first, second = sorted((a, b), key=lambda task: by_id[task.id].planned_start)
+        # the person's next task acts as successor: the first task of Alice can't be delayed
+        assert by_id[first.id].total_slack == timedelta(0)
+        assert report.critical_path_task_ids == [first.id, second.id]
+        assert [e.is_on_critical_path for e in (by_id[first.id], by_id[second.id], by_id[c.id])] == [True, True, False]
+        self._assert_is_feasible(tdg, report)
+
+    def test_earliest_starttime_and_dependencies_are_respected(self) -> None:
+        release = _T0 + timedelta(minutes=15)
+        a = _assigned(_node("A", 10), self.alice)
+        b = _assigned(_node("B", 10, earliest_start=release), self.alice)
+        c = _assigned(_node("C", 20), self.alice)
+        d = _assigned(_node("D", 5), self.bob)
+        tdg = TaskDependencyGraph(
+            task_list=[a, b, c, d], dependency_list=[_edge(a, b), _edge(d, c)], starting_time_of_run=_T0
+        )
+        report = tdg.create_resource_leveled_schedule_report(include_artificial_nodes=True)
+        by_id = {e.task_id: e for e in report.entries}
+        # Alice is idle when C becomes ready (at 5min, after D) only if she already finished A
+        assert by_id[a.id].planned_start == _T0
+        assert by_id[c.id].planned_start == _T0 + timedelta(minutes=10)
+        assert by_id[b.id].planned_start == _T0 + timedelta(minutes=30)
+        assert report.critical_path_task_ids[0] == ID_OF_ARTIFICIAL_STARTNODE
+        assert report.critical_path_task_ids[-1] == ID_OF_ARTIFICIAL_ENDNODE
+        assert report.critical_path_task_ids[1:-1] == [a.id, c.id, b.id]
+        self._assert_is_feasible(tdg, report)
+
+    def test_random_graphs(self) -> None:
+        rng = random.Random(42)
+        persons = [Person(name=f"P{i}", email=f"p{i}@example.com") for i in range(4)]
+        for _ in range(20):
+            tasks = [
+                _node(
+                    f"T{i}",
+                    rng.randint(0, 30),
+                    earliest_start=_T0 + timedelta(minutes=rng.randint(0, 60)) if rng.random() < 0.2 else None,
+                )
+                for i in range(30)
+            ]
+            tasks = [_assigned(task, rng.choice(persons)) if rng.random() < 0.8 else task for task in tasks]
+            edges = [
+                _edge(tasks[i], tasks[j])
+                for i in range(len(tasks))
+                for j in range(i + 1, len(tasks))
+                if rng.random() < 0.1
+            ]
+            tdg = TaskDependencyGraph(task_list=tasks, dependency_list=edges, starting_time_of_run=_T0)
+            report = tdg.create_resource_leveled_schedule_report()
+            assert len(report.entries) == len(tasks)
+            assert report.graph_finish >= tdg.calculate_planned_finish_time_of_graph()
+            assert report.critical_path_task_ids
+            assert all(
+                entry.is_on_critical_path == (entry.task_id in report.critical_path_task_ids)
+                for entry in report.entries
+            )
+            by_id = {e.task_id: e for e in report.entries}
+            assert by_id[report.critical_path_task_ids[-1]].planned_finish == report.graph_finish
+            for x, y in itertools.pairwise(report.critical_path_task_ids):
+                assignee_of_x = tdg.get_digraph_view().nodes[x]["domain_model"].assignee
+                assignee_of_y = tdg.get_digraph_view().nodes[y]["domain_model"].assignee
+                assert y in by_id[x].successor_task_ids or (
+                    assignee_of_x is not None and assignee_of_y is not None and assignee_of_x.id == assignee_of_y.id
+                )
+                assert by_id[x].planned_finish <= by_id[y].planned_start
+            self._assert_is_feasible(tdg, report)
+
+
+class TestCalendarAwareScheduleReport:
+    """Tests for create_calendar_aware_schedule_report."""
+
+    alice = Person(name="Alice", email="alice@example.com")
+
+    @staticmethod
+    def _daily_shifts(first_hour: int, last_hour: int, days: int = 10) -> WorkingCalendar:
+        return WorkingCalendar(
+            working_intervals=[
+                TimeInterval(
+                    start=datetime(2024, 6, 1 + day, tzinfo=UTC) + timedelta(hours=first_hour),
+                    end=datetime(2024, 6, 1 + day, tzinfo=UTC) + timedelta(hours=last_hour),
+                )
+                for day in range(days)
+            ]
+        )
+
+    def test_without_calendars_the_schedule_equals_the_plan(self) -> None:
+        tdg = copy.deepcopy(graph_bernd)
+        assert tdg.create_calendar_aware_schedule_report() == tdg.create_schedule_report()
+
+    def test_work_pauses_outside_the_working_intervals(self) -> None:
+        """The shifts are 8:00-12:00 every day; _T0 is 8:00."""
+        a = _node("A", 3 * 60)
+        b = _node("B", 2 * 60)
+        c = _node("C", 30)
+        tdg = TaskDependencyGraph(task_list=[a, b, c], dependency_list=[_edge(a, b)], starting_time_of_run=_T0)
+        report = tdg.create_calendar_aware_schedule_report(self._daily_shifts(8, 12))
+        by_id = {e.task_id: e for e in report.entries}
+        assert by_id[a.id].planned_finish == datetime(2024, 6, 1, 11, tzinfo=UTC)
+        assert by_id[b.id].planned_start == datetime(2024, 6, 1, 11, tzinfo=UTC)
+        # B works from 11:00 to 12:00 on the first day and from 8:00 to 9:00 on the next day
+        assert by_id[b.id].planned_finish == datetime(2024, 6, 2, 9, tzinfo=UTC)
+        assert by_id[b.id].planned_duration == timedelta(hours=2)
+        assert report.graph_finish == datetime(2024, 6, 2, 9, tzinfo=UTC)
+        assert report.critical_path_task_ids == [a.id, b.id]
+        # C can start as late as 8:30 on the next day
+        assert by_id[c.id].late_start == datetime(2024, 6, 2, 8, 30, tzinfo=UTC)
+        assert by_id[c.id].late_finish == report.graph_finish
+        assert by_id[c.id].total_slack == by_id[c.id].late_start - _T0
+        assert by_id[a.id].total_slack == by_id[b.id].total_slack == timedelta(0)
+        # the graph itself is not modified
+        assert tdg.calculate_planned_finish_time_of_graph() == _T0 + timedelta(hours=5)
+
+    def test_calendars_of_assignees_and_earliest_starttime(self) -> None:
+        a = _assigned(_node("A", 60), self.alice)
+        b = _node("B", 60, earliest_start=datetime(2024, 6, 1, 15, tzinfo=UTC))
+        tdg = TaskDependencyGraph(task_list=[a, b], dependency_list=[_edge(a, b)], starting_time_of_run=_T0)
+        blackout = TimeInterval(start=datetime(2024, 6, 1, 0, tzinfo=UTC), end=datetime(2024, 6, 1, 14, tzinfo=UTC))
+        alice_calendar = WorkingCalendar(
+            working_intervals=self._daily_shifts(0, 24).working_intervals, blackout_periods=[blackout]
+        )
+        report = tdg.create_calendar_aware_schedule_report(
+            self._daily_shifts(16, 20), calendars_of_assignees={self.alice.id: alice_calendar}
+        )
+        by_id = {e.task_id: e for e in report.entries}
+        assert by_id[a.id].planned_start == datetime(2024, 6, 1, 14, tzinfo=UTC)
+        assert by_id[b.id].planned_start == datetime(2024, 6, 1, 16, tzinfo=UTC)
+        assert by_id[a.id].free_slack == timedelta(hours=1)
+
+    def test_a_task_that_waits_for_its_calendar_ends_the_critical_path(self) -> None:
+        """A is worked on around the clock and finishes at 12:30; B waits for the next shift at 8:00."""
+        a = _assigned(_node("A", 4 * 60 + 30), self.alice)
+        b = _node("B", 60)
+        tdg = TaskDependencyGraph(task_list=[a, b], dependency_list=[_edge(a, b)], starting_time_of_run=_T0)
+        report = tdg.create_calendar_aware_schedule_report(
+            self._daily_shifts(8, 12), calendars_of_assignees={self.alice.id: self._daily_shifts(0, 24)}
+        )
+        by_id = {e.task_id: e for e in report.entries}
+        assert by_id[b.id].planned_start == datetime(2024, 6, 2, 8, tzinfo=UTC)
+        assert by_id[a.id].total_slack > timedelta(0)
+        assert report.critical_path_task_ids == [b.id]
+        assert not by_id[a.id].is_on_critical_path
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_tasks_on_the_critical_path_have_no_slack(self, seed: int) -> None:
+        rng = random.Random(seed)
+        tasks = [
+            _node(f"T{index}", rng.randint(0, 6) * 10)
+            if rng.random() < 0.5
+            else _assigned(_node(f"T{index}", rng.randint(0, 6) * 10), self.alice)
+            for index in range(25)
+        ]
+        edges = [
+            _edge(tasks[first], tasks[second])
+            for first, second in itertools.combinations(range(len(tasks)), 2)
+            if rng.random() < 0.1
+        ]
+        tdg = TaskDependencyGraph(task_list=tasks, dependency_list=edges, starting_time_of_run=_T0)
+        report = tdg.create_calendar_aware_schedule_report(
+            self._daily_shifts(8, 12, days=30), calendars_of_assignees={self.alice.id: self._daily_shifts(10, 11, 30)}
+        )
+        by_id = {e.task_id: e for e in report.entries}
+        assert report.critical_path_task_ids
+        assert by_id[report.critical_path_task_ids[-1]].planned_finish == report.graph_finish
+        for task_id in report.critical_path_task_ids:
+            assert by_id[task_id].total_slack == timedelta(0)
+        for entry in report.entries:
+            assert entry.is_on_critical_path == (entry.task_id in report.critical_path_task_ids)
+
+    def test_too_short_calendar(self) -> None:
+        a = _node("A", 24 * 60)
+        tdg = TaskDependencyGraph(task_list=[a], dependency_list=[], starting_time_of_run=_T0)
+        with pytest.raises(ValueError, match="enough working time"):
+            tdg.create_calendar_aware_schedule_report(self._daily_shifts(8, 12, days=3))
+
+
 # ---------------------------------------------------------------------------
 # Issue #87 – pre-construction graph definition validation
 # ---------------------------------------------------------------------------
@@ -2121,3 +2803,30 @@ class TestToDot:
         # edge must be rendered predecessor → successor, not the other way around
         assert f'"{task_M.id}" -> "{task_N.id}"' in dot
         assert f'"{task_N.id}" -> "{task_M.id}"' not in dot
+
+    def test_incrementally_built_graph_is_exported_like_a_freshly_built_one(self) -> None:
+        a, b, c = _node("A", 10), _node("B", 20), _node("C", 30)
+        ab, bc = _edge(a, b), _edge(b, c)
+        fresh = TaskDependencyGraph(task_list=[a, b, c], dependency_list=[ab, bc], starting_time_of_run=_T0)
+        incremental = TaskDependencyGraph(task_list=[], dependency_list=[], starting_time_of_run=_T0)
+        incremental.to_dot()
+        for task in (a, b, c):
+            incremental.add_task(task)
+        incremental.add_edge(ab)
+        incremental.add_edge(bc)
+        assert incremental.to_dot() == fresh.to_dot()
+        assert incremental.to_mermaid_gantt() == fresh.to_mermaid_gantt()
+        assert incremental.labels() == fresh.labels()
+
+    def test_schedule_is_looked_up_once_per_export(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        tdg, _ = _build_chain_of_diamonds(50)
+        expected_dot = tdg.to_dot()
+
+        def _fail(*_: object, **__: object) -> None:
+            raise AssertionError("the exporters must use the render snapshot")
+
+        monkeypatch.setattr(tdg, "is_on_critical_path", _fail)
+        monkeypatch.setattr(tdg, "calculate_planned_starting_time_of_task", _fail)
+        assert tdg.to_dot() == expected_dot
+        tdg.to_mermaid_gantt()
+        tdg.labels()
@@ -199,7 +199,7 @@ class TestRemoveEdge:
         assert b_entry.planned_start >= task_B_with_fixed_start_2024_01_02.earliest_starttime  # type: ignore[operator]
 
     def test_remove_stretched_edge_preserves_earliest_starttime(self) -> None:
-        # Removing A→B_fixed (the edge whose weight is stretched by B_fixed's earliest_starttime)
+        # Removing A→B_fixed (the only incoming edge of the task with an earliest_starttime)
         # should not break scheduling: B_fixed becomes a root node but still respects its earliest_starttime.
         graph = copy.deepcopy(graph_bernd)
         edge_id = _get_edge_id(graph, task_A.id, task_B_with_fixed_start_2024_01_02.id)
@@ -0,0 +1,107 @@
+"""
+tests for the dynamic topological order that is maintained by the TDG
+"""
+
+# pylint:disable=protected-access
+import random
+
+import networkx as nx  # type: ignore[import-untyped]
+import pytest
+
+from taskdependencygraph.models.graph_change import AddEdge
+from taskdependencygraph.task_dependency_graph import TaskDependencyGraph
+from taskdependencygraph.topological_order import TopologicalOrder
+
+from .example_data_for_test_task_dependency_graph import build_edge, build_task, starting_time_of_run_3
+
+
+def _assert_is_topological_order(graph: nx.DiGraph, order: TopologicalOrder) -> None:
+    assert set(order.rank) == set(graph.nodes)
+    assert len(set(order.rank.values())) == len(order.rank)
+    for u, v in graph.edges:
+        assert order.rank[u] < order.rank[v]
+    assert order.ordered_node_ids == sorted(graph.nodes, key=order.rank.__getitem__)
+
+
+def test_edge_that_respects_the_order_does_not_change_it() -> None:
+    a, b = build_task("A"), build_task("B")
+    tdg = TaskDependencyGraph(task_list=[a, b], dependency_list=[], starting_time_of_run=starting_time_of_run_3)
+    order = tdg._get_topological_order()
+    first, second = sorted((a, b), key=lambda t: order.rank[t.id])
+    ranks_before = dict(order.rank)
+    tdg.add_edge(build_edge(first, second))
+    assert order.rank == ranks_before
+    _assert_is_topological_order(tdg._graph, order)
+
+
+def test_edge_against_the_order_only_moves_the_affected_region() -> None:
+    tasks = [build_task(f"T{i}") for i in range(6)]
+    tdg = TaskDependencyGraph(task_list=tasks, dependency_list=[], starting_time_of_run=starting_time_of_run_3)
+    order = tdg._get_topological_order()
+    first, *middle, last = sorted(tasks, key=lambda t: order.rank[t.id])
+    untouched = {t.id: order.rank[t.id] for t in middle}
+    tdg.add_edge(build_edge(last, first))
+    assert order.rank[last.id] < order.rank[first.id]
+    assert {t.id: order.rank[t.id] for t in middle} == untouched
+    _assert_is_topological_order(tdg._graph, order)
+
+
+def test_cycle_is_rejected() -> None:
+    a, b, c = build_task("A"), build_task("B"), build_task("C")
+    tdg = TaskDependencyGraph(
+        task_list=[a, b, c],
+        dependency_list=[build_edge(a, b), build_edge(b, c)],
+        starting_time_of_run=starting_time_of_run_3,
+    )
+    check_result = tdg.can_edge_be_added(build_edge(c, a))
+    assert check_result.can_be_added is False
+    assert "cycle" in (check_result.error_message or "")
+    with pytest.raises(ValueError):
+        tdg._get_topological_order().add_edge(tdg._graph, c.id, a.id)
+
+
+def test_self_loop_is_rejected_and_leaves_the_graph_unchanged() -> None:
+    a, b = build_task("A"), build_task("B")
+    tdg = TaskDependencyGraph(
+        task_list=[a, b], dependency_list=[build_edge(a, b)], starting_time_of_run=starting_time_of_run_3
+    )
+    report_before = tdg.create_schedule_report(include_artificial_nodes=True)
+    edges_before = list(tdg._graph.edges)
+    check_result = tdg.can_edge_be_added(build_edge(a, a))
+    assert check_result.can_be_added is False
+    assert "cycle" in (check_result.error_message or "")
+    with pytest.raises(ValueError):
+        tdg.add_edge(build_edge(a, a))
+    with pytest.raises(ValueError):
+        tdg.apply_changes([AddEdge(edge=build_edge(b, b))])
+    with pytest.raises(ValueError):
+        tdg._get_topological_order().add_edge(tdg._graph, a.id, a.id)
+    assert list(tdg._graph.edges) == edges_before
+    assert tdg.create_schedule_report(include_artificial_nodes=True) == report_before
+    _assert_is_topological_order(tdg._graph, tdg._get_topological_order())
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_order_stays_valid_under_random_modifications(seed: int) -> None:
+    rng = random.Random(seed)
+    tasks = [build_task(f"T{i}") for i in range(30)]
+    tdg = TaskDependencyGraph(task_list=tasks, dependency_list=[], starting_time_of_run=starting_time_of_run_3)
+    tdg._get_topological_order()
+    for step in range(300):
+        if step % 50 == 49:
+            removed = tasks.pop(rng.randrange(len(tasks)))
+            tdg.remove_task(removed.id)
+            new_task = build_task(f"N{step}")
+            tdg.add_task(new_task)
+            tasks.append(new_task)
+        predecessor, successor = rng.sample(tasks, 2)
+        edge = build_edge(predecessor, successor)
+        creates_cycle = nx.has_path(tdg._graph, successor.id, predecessor.id)
+        check_result = tdg.can_edge_be_added(edge)
+        if tdg._graph.has_edge(predecessor.id, successor.id) or tdg._graph.has_edge(successor.id, predecessor.id):
+            assert check_result.can_be_added is False
+            continue
+        assert check_result.can_be_added is not creates_cycle
+        if check_result.can_be_added:
+            tdg.add_edge(edge)
+        _assert_is_topological_order(tdg._graph, tdg._get_topological_order())